@@ -0,0 +1,390 @@
+import argparse
+import csv
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Set, Tuple, TextIO
+
+import numpy as np
+from basyx.aas import model
+from numpy.lib import format as npy_format
+
+from am_machine import ElementSpec, highest_exposure_unit, machine_specification, property_specs
+from am_json import SubmodelJSONLoader, xsd_lexical
+
+
+# ============================================================================
+# COLUMNAR EXPORT OF FLEET PROPERTY VALUES
+# ============================================================================
+
+# One machine: its ID and dotted-path property values
+MachineRecord = Tuple[str, Dict[str, Any]]
+
+# Column holding the machine ID (the AAS ID, or the submodel ID for files)
+ID_COLUMN = "id"
+
+
+@dataclass
+class ExportColumn:
+    """One exported column: a leaf property of the specification."""
+    path: str
+    value_type: type
+    unit: Optional[str] = None
+
+    @property
+    def xsd_type(self) -> str:
+        return model.datatypes.XSD_TYPE_NAMES[self.value_type]
+
+    def metadata(self) -> Dict[str, Any]:
+        return {"name": self.path, "valueType": self.xsd_type, "unit": self.unit}
+
+
+def export_columns(specification: Optional[Dict[str, ElementSpec]] = None) -> List[ExportColumn]:
+    """One column per leaf property of the specification, in specification order."""
+    return [ExportColumn(path, spec.value_type, spec.unit) for path, spec in property_specs(specification).items()]
+
+
+class _FleetColumns:
+    """Export columns that grow with the machines, like the columns of :class:`am_query.FleetIndex`.
+
+    Starts with the columns of a single-laser machine and adds those of further
+    exposure units as soon as a machine has values for them, so the records are
+    read once however many units the largest machine has.
+    """
+
+    def __init__(self):
+        self.units = 1
+        self._columns: Dict[int, List[ExportColumn]] = {}
+
+    def columns(self, units: Optional[int] = None) -> List[ExportColumn]:
+        """Columns of a machine with ``units`` exposure units, by default of the largest machine so far."""
+        units = units or self.units
+        columns = self._columns.get(units)
+        if columns is None:
+            columns = self._columns[units] = export_columns(machine_specification(units))
+        return columns
+
+    def add(self, values: Dict[str, Any]) -> int:
+        """Highest exposure unit addressed in ``values``; grows the columns if no machine so far had more."""
+        units = highest_exposure_unit(values)
+        self.units = max(self.units, units)
+        return units
+
+
+def _check_columns(machine_id: str, values: Dict[str, Any], paths: Set[str]) -> None:
+    """Refuse a machine with values outside the columns instead of dropping them."""
+    if paths.issuperset(values):
+        return
+    extra = sorted(path for path, value in values.items() if value is not None and path not in paths)
+    if extra:
+        raise ValueError(f"{machine_id} has values outside the export columns ({', '.join(extra[:3])}"
+                         f"{', ...' if len(extra) > 3 else ''}); export without explicit columns")
+
+
+def _columns_metadata(columns: List[ExportColumn]) -> Dict[str, Any]:
+    return {"columns": [{"name": ID_COLUMN, "valueType": "xs:string", "unit": None}]
+            + [column.metadata() for column in columns]}
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+def inventory_records(rows: List[Dict[str, Any]]) -> Iterator[MachineRecord]:
+    """Values of coerced inventory rows (see :func:`am_fleet.coerce_inventory`), keyed by AAS ID."""
+    from am_fleet import machine_ids
+    for values in rows:
+        yield machine_ids(values["Info.serial_number"])[0], values
+
+
+def store_records(store) -> Iterator[MachineRecord]:
+    """Stream the values of every machine in a :class:`am_store.FleetStore`, keyed by AAS ID."""
+    return store.iter_values()
+
+
+def file_records(paths: Iterable[str], loader: Optional[SubmodelJSONLoader] = None) -> Iterator[MachineRecord]:
+    """Stream the values of submodel JSON files, keyed by submodel ID."""
+    loader = loader or SubmodelJSONLoader()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            yield loader.read(json.load(f))
+
+
+# ---------------------------------------------------------------------------
+# CSV
+# ---------------------------------------------------------------------------
+
+def _csv_row(machine_id: str, values: Dict[str, Any], columns: List[ExportColumn]) -> List[str]:
+    row = [machine_id]
+    for column in columns:
+        value = values.get(column.path)
+        row.append("" if value is None else xsd_lexical(value))
+    return row
+
+
+def write_csv(records: Iterable[MachineRecord], stream: TextIO,
+              columns: Optional[List[ExportColumn]] = None) -> int:
+    """Write one CSV row per machine; returns the number of rows.
+
+    Values use their XSD lexical form (as in the JSON documents), missing values
+    are empty cells. Units and value types are not part of CSV; see
+    :func:`write_csv_metadata`. Given ``columns``, rows are written as the
+    records arrive and a machine with values outside them raises ``ValueError``.
+    Otherwise the columns cover every exposure unit of the fleet: rows are
+    spooled to a temporary file until the largest machine is known, and
+    machines with fewer units get empty cells for the others.
+    """
+    if columns is not None:
+        paths = {column.path for column in columns}
+        writer = csv.writer(stream)
+        writer.writerow([ID_COLUMN] + [column.path for column in columns])
+        count = 0
+        for machine_id, values in records:
+            _check_columns(machine_id, values, paths)
+            writer.writerow(_csv_row(machine_id, values, columns))
+            count += 1
+        return count
+
+    fleet = _FleetColumns()
+    with tempfile.TemporaryFile("w+", newline="", encoding="utf-8") as spool:
+        # Every spooled row starts with the number of units its cells are for
+        writer = csv.writer(spool)
+        count = 0
+        for machine_id, values in records:
+            units = fleet.add(values)
+            writer.writerow([units] + _csv_row(machine_id, values, fleet.columns(units)))
+            count += 1
+
+        columns = fleet.columns()
+        position = {column.path: n for n, column in enumerate(columns, 1)}
+        positions: Dict[int, List[int]] = {}
+        writer = csv.writer(stream)
+        writer.writerow([ID_COLUMN] + [column.path for column in columns])
+        spool.seek(0)
+        for units, machine_id, *cells in csv.reader(spool):
+            units = int(units)
+            if units not in positions:
+                positions[units] = [position[column.path] for column in fleet.columns(units)]
+            row = [machine_id] + [""] * len(columns)
+            for n, cell in zip(positions[units], cells):
+                row[n] = cell
+            writer.writerow(row)
+    return count
+
+
+def csv_columns(csv_path: str) -> List[ExportColumn]:
+    """The columns of a CSV file written by :func:`write_csv`, read from its header."""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))[1:]
+    columns = {column.path: column for column in export_columns(machine_specification(highest_exposure_unit(header)))}
+    return [columns[path] for path in header]
+
+
+def write_csv_metadata(csv_path: str, columns: Optional[List[ExportColumn]] = None) -> str:
+    """Write the column value types and units next to a CSV file (``<name>-metadata.json``).
+
+    Without ``columns`` they are read from the CSV header (:func:`csv_columns`).
+    """
+    columns = columns if columns is not None else csv_columns(csv_path)
+    path = os.path.splitext(csv_path)[0] + "-metadata.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"url": os.path.basename(csv_path), **_columns_metadata(columns)}, f, indent=2, ensure_ascii=False)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# NumPy .npz
+# ---------------------------------------------------------------------------
+
+# Array dtype and fill for missing values per value type; strings become fixed-width '<U{n}'
+_NPY_DTYPES = {
+    model.datatypes.Double: ("<f8", float("nan")),
+    model.datatypes.Integer: ("<i8", 0),
+    model.datatypes.Boolean: ("|b1", False),
+}
+
+
+def _write_npy_header(target, descr: str, shape: Tuple[int, ...]) -> None:
+    """Write the header of a version 1.0 .npy file; the data follows in C order."""
+    npy_format.write_array_header_1_0(target, {"descr": descr, "fortran_order": False, "shape": shape})
+
+
+class _ColumnSpool:
+    """Collects the values of one column in a temporary file, chunk by chunk."""
+
+    def __init__(self, name: str, value_type: type, chunk_rows: int):
+        self.name = name
+        self.value_type = value_type
+        self.chunk_rows = chunk_rows
+        self.data = tempfile.TemporaryFile()
+        self.missing = tempfile.TemporaryFile()
+        self.any_missing = False
+        self.width = 1  # widest string, in code points
+        self.rows = 0
+        self._chunk: List[Any] = []
+        self._missing_chunk: List[bool] = []
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self.any_missing = True
+        self._missing_chunk.append(value is None)
+        self._chunk.append(value)
+        if len(self._chunk) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._chunk:
+            return
+        if self.value_type in _NPY_DTYPES:
+            dtype, fill = _NPY_DTYPES[self.value_type]
+            try:
+                data = np.array([fill if value is None else value for value in self._chunk], dtype=dtype)
+            except OverflowError:
+                # xs:integer is unbounded, the int64 array is not
+                value = next(value for value in self._chunk if value is not None and not -2 ** 63 <= value < 2 ** 63)
+                raise ValueError(f"Column {self.name}: {value} does not fit in an int64 array") from None
+            self.data.write(data.tobytes())
+        else:
+            for value in self._chunk:
+                value = "" if value is None else value
+                self.width = max(self.width, len(value))
+                encoded = value.encode("utf-8")
+                self.data.write(struct.pack("<I", len(encoded)) + encoded)
+        self.missing.write(np.array(self._missing_chunk, dtype=bool).tobytes())
+        self.rows += len(self._chunk)
+        self._chunk = []
+        self._missing_chunk = []
+
+    def write_data(self, target) -> None:
+        self.data.seek(0)
+        if self.value_type in _NPY_DTYPES:
+            _write_npy_header(target, _NPY_DTYPES[self.value_type][0], (self.rows,))
+            shutil.copyfileobj(self.data, target)
+            return
+        _write_npy_header(target, f"<U{self.width}", (self.rows,))
+        for _ in range(self.rows):
+            length = struct.unpack("<I", self.data.read(4))[0]
+            text = self.data.read(length).decode("utf-8")
+            target.write(text.ljust(self.width, "\0").encode("utf-32-le"))
+
+    def write_missing(self, target) -> None:
+        self.missing.seek(0)
+        _write_npy_header(target, "|b1", (self.rows,))
+        shutil.copyfileobj(self.missing, target)
+
+    def close(self) -> None:
+        self.data.close()
+        self.missing.close()
+
+
+def write_npz(records: Iterable[MachineRecord], path: str,
+              columns: Optional[List[ExportColumn]] = None,
+              compress: bool = False, chunk_rows: int = 4096) -> int:
+    """Write the records as a NumPy ``.npz`` archive; returns the number of rows.
+
+    Every column becomes a 1-d array named by its dotted path (``id`` holds
+    the machine IDs): ``float64``, ``int64``, ``bool`` or fixed-width unicode by
+    value type. Missing values are ``NaN`` for doubles and ``0``/``False``/``""``
+    otherwise; columns with missing values get an extra boolean array
+    ``"<path>:missing"``. The array ``__metadata__`` holds a JSON string with
+    the value type and unit of every column. Integers outside the ``int64``
+    range raise ``ValueError``.
+
+    Rows are spooled per column to temporary files in chunks of ``chunk_rows``,
+    so memory use does not depend on the number of machines; the ``.npy``
+    headers are written with :mod:`numpy.lib.format`. As with
+    :func:`write_csv`, values outside given ``columns`` raise ``ValueError``;
+    without ``columns`` every exposure unit of the fleet gets its arrays.
+    """
+    fleet, units = _FleetColumns() if columns is None else None, 1
+    columns = columns if columns is not None else fleet.columns()
+    paths = {column.path for column in columns}
+    spools = {ID_COLUMN: _ColumnSpool(ID_COLUMN, model.datatypes.String, chunk_rows)}
+    spools.update((column.path, _ColumnSpool(column.path, column.value_type, chunk_rows)) for column in columns)
+    try:
+        rows = 0
+        for machine_id, values in records:
+            if fleet is not None and fleet.add(values) > units:
+                # More units than any machine so far: add their arrays, missing for the earlier rows
+                units, columns = fleet.units, fleet.columns()
+                paths = {column.path for column in columns}
+                for column in columns:
+                    if column.path not in spools:
+                        spool = spools[column.path] = _ColumnSpool(column.path, column.value_type, chunk_rows)
+                        for _ in range(rows):
+                            spool.append(None)
+            _check_columns(machine_id, values, paths)
+            spools[ID_COLUMN].append(machine_id)
+            for column in columns:
+                spools[column.path].append(values.get(column.path))
+            rows += 1
+
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED) as archive:
+            for name in [ID_COLUMN] + [column.path for column in columns]:
+                spool = spools[name]
+                spool.flush()
+                with archive.open(name + ".npy", "w", force_zip64=True) as target:
+                    spool.write_data(target)
+                if spool.any_missing:
+                    with archive.open(name + ":missing.npy", "w", force_zip64=True) as target:
+                        spool.write_missing(target)
+            metadata = json.dumps(_columns_metadata(columns), ensure_ascii=False)
+            with archive.open("__metadata__.npy", "w") as target:
+                _write_npy_header(target, f"<U{len(metadata)}", ())
+                target.write(metadata.encode("utf-32-le"))
+        return rows
+    finally:
+        for spool in spools.values():
+            spool.close()
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export fleet property values as columns (one row per machine) to CSV or NumPy .npz"
+    )
+    parser.add_argument("files", nargs="*", help="Submodel JSON files to export")
+    parser.add_argument("--store", help="Export every machine of this fleet store")
+    parser.add_argument("--inventory", help="Export the values of a machine inventory (CSV or JSONL)")
+    parser.add_argument("-o", "--output", required=True, help="Output file; the format follows the extension")
+    parser.add_argument("--compress", action="store_true", help="Deflate the arrays of an .npz archive")
+    args = parser.parse_args()
+
+    store = None
+    if args.store:
+        from am_store import FleetStore
+        store = FleetStore(args.store)
+        records = store_records(store)
+    elif args.inventory:
+        import am_fleet
+        records = inventory_records(am_fleet.coerce_inventory(am_fleet.read_inventory(args.inventory)))
+    else:
+        records = file_records(args.files)
+
+    try:
+        extension = os.path.splitext(args.output)[1].lower()
+        if extension == ".npz":
+            count = write_npz(records, args.output, compress=args.compress)
+        elif extension == ".csv":
+            with open(args.output, "w", newline="", encoding="utf-8") as f:
+                count = write_csv(records, f)
+            write_csv_metadata(args.output)
+        else:
+            print(f"✗ Unsupported output format (expected .csv or .npz): {args.output}", file=sys.stderr)
+            sys.exit(2)
+    finally:
+        if store is not None:
+            store.close()
+    print(f"✓ {count} machines exported to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
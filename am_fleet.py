@@ -0,0 +1,195 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional, Callable, Iterator, Tuple, TextIO
+from urllib.parse import quote
+
+from basyx.aas import model
+from basyx.aas.adapter.json import AASToJsonEncoder
+
+from am_machine import exposure_units, machine_specification
+from am_model import PBFLBMSubmodelBuilder
+from am_json import SubmodelJSONEmitter, EnvironmentJSONWriter, environment_json
+from am_validate import FleetValidator, ValidationError
+
+
+DEFAULT_AAS_ID_PREFIX = "https://acplt.org/PBF-LB-M_AAS"
+DEFAULT_SUBMODEL_ID_PREFIX = "https://acplt.org/PBF-LB-M_Submodel"
+
+# Inventory columns that may carry the machine serial number
+SERIAL_NUMBER_FIELDS = ("serial_number", "Info.serial_number")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def read_inventory(path: str) -> List[Dict[str, Any]]:
+    """Read a machine inventory from a CSV or JSONL file.
+
+    Every row describes one machine: a serial number plus property values
+    keyed by dotted idShort paths (e.g. ``Info.build_volume.x_dimension``).
+    Empty CSV cells are treated as "no value".
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".csv", ".jsonl", ".ndjson"):
+        raise ValueError(f"Unsupported inventory format (expected .csv or .jsonl): {path}")
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if extension == ".csv":
+            return [
+                {key: value for key, value in row.items() if value not in ("", None)}
+                for row in csv.DictReader(f)
+            ]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def machine_ids(serial_number: str,
+                aas_id_prefix: str = DEFAULT_AAS_ID_PREFIX,
+                submodel_id_prefix: str = DEFAULT_SUBMODEL_ID_PREFIX) -> Tuple[str, str]:
+    """Derive deterministic AAS and Submodel IDs from a machine serial number."""
+    suffix = quote(str(serial_number), safe="")
+    return f"{aas_id_prefix}/{suffix}", f"{submodel_id_prefix}/{suffix}"
+
+
+def split_inventory_row(row: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Split an inventory row into its serial number and dotted-path property values."""
+    values = dict(row)
+    serial_number = None
+    for field in SERIAL_NUMBER_FIELDS:
+        if values.get(field) is not None:
+            serial_number = values.pop(field)
+    if serial_number is None:
+        raise ValueError(f"Inventory row has no serial number: {row}")
+    values["Info.serial_number"] = str(serial_number)
+    return str(serial_number), values
+
+
+def coerce_inventory(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Coerce and validate all inventory rows column by column before building anything.
+
+    Every row is checked against the specification for its number of exposure
+    units (see :func:`am_machine.exposure_units`), so a row with
+    ``Info.exposure_unit_count`` of 4 may set ``Exposure_unit_4.*`` values.
+    Besides value types, the ranges, cross-field rules and unique serial
+    numbers of :class:`am_validate.FleetValidator` apply. Raises a single
+    :class:`am_validate.ValidationError` (a :class:`ValueCoercionError`) listing
+    every violation of every machine.
+    """
+    report = FleetValidator().validate([split_inventory_row(row)[1] for row in rows])
+    if not report.valid:
+        raise ValidationError(report)
+    return report.rows
+
+
+# One builder and emitter per worker process and number of exposure units, created on first use
+_worker_builders: Dict[int, PBFLBMSubmodelBuilder] = {}
+_worker_emitters: Dict[Tuple[bool, int], SubmodelJSONEmitter] = {}
+
+
+def _get_worker_builder(units: int = 1) -> PBFLBMSubmodelBuilder:
+    if units not in _worker_builders:
+        _worker_builders[units] = PBFLBMSubmodelBuilder(specification=machine_specification(units))
+    return _worker_builders[units]
+
+
+def _get_worker_emitter(ensure_ascii: bool, units: int = 1) -> SubmodelJSONEmitter:
+    if (ensure_ascii, units) not in _worker_emitters:
+        _worker_emitters[ensure_ascii, units] = SubmodelJSONEmitter(
+            specification=machine_specification(units), ensure_ascii=ensure_ascii)
+    return _worker_emitters[ensure_ascii, units]
+
+
+def build_machine(row: Dict[str, Any],
+                  builder: Optional[PBFLBMSubmodelBuilder] = None,
+                  aas_id_prefix: str = DEFAULT_AAS_ID_PREFIX,
+                  submodel_id_prefix: str = DEFAULT_SUBMODEL_ID_PREFIX
+                  ) -> Tuple[model.AssetAdministrationShell, model.Submodel]:
+    """Build the populated AAS and Submodel for one inventory row, with its number of exposure units."""
+    serial_number, values = split_inventory_row(row)
+    builder = builder or _get_worker_builder(exposure_units(values))
+    aas_id, submodel_id = machine_ids(serial_number, aas_id_prefix, submodel_id_prefix)
+    aas, submodel = builder.build_aas_and_submodel(aas_id=aas_id, submodel_id=submodel_id)
+    builder.set_values(submodel, values)
+    return aas, submodel
+
+
+def build_machine_pair(row: Dict[str, Any],
+                       aas_id_prefix: str = DEFAULT_AAS_ID_PREFIX,
+                       submodel_id_prefix: str = DEFAULT_SUBMODEL_ID_PREFIX,
+                       ensure_ascii: bool = False) -> Tuple[str, str]:
+    """Build one machine and serialize its AAS and Submodel as single-line JSON objects."""
+    aas, submodel = build_machine(row, aas_id_prefix=aas_id_prefix, submodel_id_prefix=submodel_id_prefix)
+    return (json.dumps(aas, cls=AASToJsonEncoder, ensure_ascii=ensure_ascii),
+            json.dumps(submodel, cls=AASToJsonEncoder, ensure_ascii=ensure_ascii))
+
+
+def emit_machine_pair(row: Dict[str, Any],
+                      aas_id_prefix: str = DEFAULT_AAS_ID_PREFIX,
+                      submodel_id_prefix: str = DEFAULT_SUBMODEL_ID_PREFIX,
+                      ensure_ascii: bool = False) -> Tuple[str, str]:
+    """Same objects as :func:`build_machine_pair`, emitted straight from the specification."""
+    serial_number, values = split_inventory_row(row)
+    aas_id, submodel_id = machine_ids(serial_number, aas_id_prefix, submodel_id_prefix)
+    emitter = _get_worker_emitter(ensure_ascii, exposure_units(values))
+    return emitter.emit_pair(values, aas_id=aas_id, submodel_id=submodel_id)
+
+
+def build_fleet(rows: List[Dict[str, Any]],
+                workers: Optional[int] = None,
+                chunksize: int = 16,
+                aas_id_prefix: str = DEFAULT_AAS_ID_PREFIX,
+                submodel_id_prefix: str = DEFAULT_SUBMODEL_ID_PREFIX,
+                direct: bool = False,
+                ensure_ascii: bool = False,
+                progress: Optional[ProgressCallback] = None) -> Iterator[Tuple[str, str]]:
+    """Build and serialize every machine of an inventory, yielding (AAS, Submodel) JSON in inventory order.
+
+    With ``workers=1`` everything runs in the calling process; otherwise the rows
+    are distributed in chunks over a process pool (``None`` uses all cores).
+    ``direct=True`` emits the documents from the specification without building
+    basyx objects.
+    """
+    total = len(rows)
+    worker = partial(emit_machine_pair if direct else build_machine_pair,
+                     aas_id_prefix=aas_id_prefix, submodel_id_prefix=submodel_id_prefix,
+                     ensure_ascii=ensure_ascii)
+
+    if workers == 1:
+        for done, pair in enumerate(map(worker, rows), start=1):
+            if progress:
+                progress(done, total)
+            yield pair
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for done, pair in enumerate(executor.map(worker, rows, chunksize=chunksize), start=1):
+            if progress:
+                progress(done, total)
+            yield pair
+
+
+def write_fleet(rows: List[Dict[str, Any]], stream: TextIO, format: str = "jsonl",
+                as_string_literal: bool = False, **kwargs) -> int:
+    """Stream the fleet to ``stream`` and return the number of machines written.
+
+    ``format="jsonl"`` writes one AAS environment document per machine and line;
+    ``format="json"`` writes a single environment holding all machines through
+    :class:`EnvironmentJSONWriter` (see there for ``as_string_literal``).
+    """
+    if format == "jsonl":
+        count = 0
+        for aas_json, submodel_json in build_fleet(rows, **kwargs):
+            stream.write(environment_json(aas_json, submodel_json))
+            stream.write("\n")
+            count += 1
+        return count
+
+    if format == "json":
+        with EnvironmentJSONWriter(stream, ensure_ascii=kwargs.get("ensure_ascii", False),
+                                   as_string_literal=as_string_literal) as writer:
+            for aas_json, submodel_json in build_fleet(rows, **kwargs):
+                writer.write_pair(aas_json, submodel_json)
+        return writer.count
+
+    raise ValueError(f"Unknown fleet output format: {format}")
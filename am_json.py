@@ -0,0 +1,527 @@
+import hashlib
+import json
+import re
+import shutil
+import tempfile
+from collections.abc import Collection, Mapping
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, TextIO
+
+from am_machine import (
+    ElementSpec, ValueCoercionError, ValueIssue, MACHINE_SPECIFICATION, PROPERTY_CODE,
+    coerce_values, compile_specification, highest_exposure_unit, machine_specification, xsd_type_name, _COERCERS
+)
+
+# Emitting, writing and loading JSON work on plain values; basyx is only imported
+# by the methods that take or return basyx objects
+if TYPE_CHECKING:
+    from basyx.aas import model
+    from am_model import PBFLBMSubmodelBuilder, SubmodelChangeTracker
+
+
+# Placeholders used while compiling the document skeleton. json.dumps escapes
+# the NUL character as \u0000, so they can never collide with real content.
+_ID_SLOTS = {"aas": "\x00aas\x00", "submodel": "\x00submodel\x00"}
+_VALUE_SLOT_KEY = "\x00value:{}\x00"
+_SLOT_PATTERN = re.compile(r'"\\u0000(aas|submodel)\\u0000"|, "\\u0000value:(\d+)\\u0000": 0')
+
+
+def xsd_lexical(value: Any) -> str:
+    """Lexical representation of a coerced property value, as written by basyx."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float):
+        return repr(value).translate({0x65: "E", 0x66: "F", 0x69: "I", 0x6E: "N"})
+    return str(value)
+
+
+def environment_json(aas_json: str, submodel_json: str) -> str:
+    """Combine serialized AAS and Submodel objects into the document ``object_store_to_json`` writes."""
+    return '{"assetAdministrationShells": [' + aas_json + '], "submodels": [' + submodel_json + ']}'
+
+
+class SubmodelJSONEmitter:
+    """Write AAS JSON straight from the element specification and a value dict.
+
+    The specification is compiled once into static JSON fragments with slots for
+    the AAS/Submodel IDs and the property values, so emitting a machine is plain
+    string concatenation. The output is byte-for-byte identical to serializing
+    the objects of :class:`PBFLBMSubmodelBuilder` with
+    ``aas_json.object_store_to_json``.
+    """
+
+    def __init__(self, base_semantic_uri: str = "https://admin-shell.io/IDTA/PBF-LB-M/1/0",
+                 specification: Optional[Dict[str, ElementSpec]] = None,
+                 ensure_ascii: bool = True):
+        self.base_semantic_uri = base_semantic_uri
+        self.property_base_uri = "https://acplt.org/Properties"
+        self.specification = specification if specification is not None else MACHINE_SPECIFICATION
+        self.ensure_ascii = ensure_ascii
+        self._slots: Dict[str, Tuple[int, type]] = {}
+        self._aas_template, self._submodel_template = self._compile()
+
+    @staticmethod
+    def _reference_to_json(uri: str) -> Dict[str, Any]:
+        return {"type": "ExternalReference", "keys": [{"type": "GlobalReference", "value": uri}]}
+
+    def _elements_to_json(self) -> List[Dict[str, Any]]:
+        """Build the skeletons of the top-level elements, mirroring the basyx JSON encoder."""
+        compiled = compile_specification(self.specification)
+        skeletons: List[Dict[str, Any]] = []
+        for node in compiled.nodes:
+            data: Dict[str, Any] = {"idShort": node.id_short}
+            if node.description:
+                data["description"] = [{"language": "en", "text": node.description}]
+
+            if node.type_code == PROPERTY_CODE:
+                data["modelType"] = "Property"
+                data["semanticId"] = self._reference_to_json(f"{self.property_base_uri}/{node.id_short}")
+                if node.unit:
+                    data["qualifiers"] = [{"value": node.unit, "kind": "ConceptQualifier",
+                                           "valueType": "xs:string", "type": "unit"}]
+                index = len(self._slots)
+                self._slots[node.path] = (index, node.value_type)
+                data[_VALUE_SLOT_KEY.format(index)] = 0
+                data["valueType"] = xsd_type_name(node.value_type)
+            else:
+                data["modelType"] = "SubmodelElementCollection"
+                if node.semantic_id_suffix:
+                    data["semanticId"] = self._reference_to_json(f"{self.base_semantic_uri}/{node.semantic_id_suffix}")
+
+            skeletons.append(data)
+            # Children follow their collection, so "value" stays its last member
+            if node.parent >= 0:
+                skeletons[node.parent].setdefault("value", []).append(data)
+        return [skeletons[node.index] for node in compiled.children()]
+
+    @staticmethod
+    def _split_skeleton(skeleton: str) -> Tuple[List[str], List[Any]]:
+        """Split a serialized skeleton into static fragments and the slots between them."""
+        fragments: List[str] = []
+        slot_order: List[Any] = []
+        position = 0
+        for match in _SLOT_PATTERN.finditer(skeleton):
+            fragments.append(skeleton[position:match.start()])
+            slot_order.append(match.group(1) or int(match.group(2)))
+            position = match.end()
+        fragments.append(skeleton[position:])
+        return fragments, slot_order
+
+    def _compile(self) -> Tuple[Tuple[List[str], List[Any]], Tuple[List[str], List[Any]]]:
+        """Serialize the AAS and Submodel skeletons once and split them into fragments and slots."""
+        aas = {
+            "modelType": "AssetAdministrationShell",
+            "id": _ID_SLOTS["aas"],
+            "assetInformation": {"assetKind": "Instance", "globalAssetId": _ID_SLOTS["aas"]},
+            "submodels": [{"type": "ModelReference",
+                           "keys": [{"type": "Submodel", "value": _ID_SLOTS["submodel"]}]}],
+        }
+        submodel: Dict[str, Any] = {
+            "modelType": "Submodel",
+            "id": _ID_SLOTS["submodel"],
+            "semanticId": self._reference_to_json(f"{self.base_semantic_uri}/Submodel"),
+        }
+        elements = self._elements_to_json()
+        if elements:
+            submodel["submodelElements"] = elements
+
+        return (self._split_skeleton(json.dumps(aas, ensure_ascii=self.ensure_ascii)),
+                self._split_skeleton(json.dumps(submodel, ensure_ascii=self.ensure_ascii)))
+
+    def _encode_values(self, values: Dict[str, Any]) -> List[str]:
+        """Coerce and encode the given values into the ``, "value": ...`` member of each slot."""
+        coerced, issues = coerce_values(values, self.specification)
+        if issues:
+            raise ValueCoercionError(issues)
+        encoded = [""] * len(self._slots)
+        for path, value in coerced.items():
+            if value is not None:
+                encoded[self._slots[path][0]] = ', "value": ' + json.dumps(xsd_lexical(value),
+                                                                            ensure_ascii=self.ensure_ascii)
+        return encoded
+
+    @staticmethod
+    def _fill(template: Tuple[List[str], List[Any]], ids: Dict[str, str], encoded: List[str]) -> str:
+        fragments, slot_order = template
+        parts = [fragments[0]]
+        for slot, fragment in zip(slot_order, fragments[1:]):
+            parts.append(ids[slot] if isinstance(slot, str) else encoded[slot])
+            parts.append(fragment)
+        return "".join(parts)
+
+    def emit_pair(self, values: Optional[Dict[str, Any]] = None,
+                  aas_id: str = "https://acplt.org/PBF-LB-M_AAS",
+                  submodel_id: str = "https://acplt.org/PBF-LB-M_Submodel") -> Tuple[str, str]:
+        """Emit the JSON objects of the AAS and of the Submodel with the given dotted-path values."""
+        encoded = self._encode_values(values or {})
+        ids = {
+            "aas": json.dumps(aas_id, ensure_ascii=self.ensure_ascii),
+            "submodel": json.dumps(submodel_id, ensure_ascii=self.ensure_ascii),
+        }
+        return self._fill(self._aas_template, ids, encoded), self._fill(self._submodel_template, ids, encoded)
+
+    def emit(self, values: Optional[Dict[str, Any]] = None,
+             aas_id: str = "https://acplt.org/PBF-LB-M_AAS",
+             submodel_id: str = "https://acplt.org/PBF-LB-M_Submodel") -> str:
+        """Emit the JSON document of one AAS/Submodel pair with the given dotted-path values."""
+        return environment_json(*self.emit_pair(values, aas_id=aas_id, submodel_id=submodel_id))
+
+
+class EnvironmentJSONWriter:
+    """Incrementally write an AAS environment document, one AAS/Submodel pair at a time.
+
+    The result is identical to ``json.dumps`` of the whole environment (as built by
+    ``object_store_to_json``) with the same ``indent``, but only one machine is held
+    in memory: AAS objects go straight to ``stream`` while submodels are spooled to
+    a temporary file (in memory up to ``spool_size`` characters) and appended on
+    :meth:`close`.
+
+    With ``as_string_literal=True`` the document is written as a JSON string
+    literal, i.e. like ``json.dumps(document_string, ensure_ascii=False)``; this is
+    the file format ``am_machine.py`` has always produced. ``indent`` has no effect
+    on a string literal, just as with ``json.dumps``.
+    """
+
+    def __init__(self, stream: TextIO, indent: Optional[int] = None, ensure_ascii: bool = True,
+                 as_string_literal: bool = False, spool_size: int = 8 * 1024 * 1024):
+        self.stream = stream
+        self.indent = None if as_string_literal else indent
+        self.ensure_ascii = ensure_ascii
+        self.as_string_literal = as_string_literal
+        self.count = 0
+        self._spool = tempfile.SpooledTemporaryFile(max_size=spool_size, mode="w+", encoding="utf-8")
+        self._closed = False
+        if as_string_literal:
+            self.stream.write('"')
+
+    def __enter__(self) -> "EnvironmentJSONWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._spool.close()
+
+    def _write(self, stream: TextIO, text: str) -> None:
+        if self.as_string_literal:
+            # JSON string escaping works per character, so escaping chunk by chunk
+            # yields exactly the same output as escaping the whole document.
+            text = json.dumps(text, ensure_ascii=False)[1:-1]
+        stream.write(text)
+
+    def _format(self, obj_json: str) -> str:
+        if self.indent is None:
+            return obj_json
+        pretty = json.dumps(json.loads(obj_json), indent=self.indent, ensure_ascii=self.ensure_ascii)
+        return pretty.replace("\n", "\n" + " " * (2 * self.indent))
+
+    def _separator(self) -> str:
+        if self.indent is None:
+            return ", "
+        return ",\n" + " " * (2 * self.indent)
+
+    def _open_list(self, key: str, first: bool) -> str:
+        if self.indent is None:
+            return ("{" if first else "], ") + json.dumps(key) + ": ["
+        pad = " " * self.indent
+        return ("{\n" if first else "\n" + pad + "],\n") + pad + json.dumps(key) + ": [\n" + pad * 2
+
+    def write_pair(self, aas_json: str, submodel_json: str) -> None:
+        """Append one serialized AAS and its serialized Submodel."""
+        if self.count == 0:
+            self._write(self.stream, self._open_list("assetAdministrationShells", first=True))
+        else:
+            self._write(self.stream, self._separator())
+            self._write(self._spool, self._separator())
+        self._write(self.stream, self._format(aas_json))
+        self._write(self._spool, self._format(submodel_json))
+        self.count += 1
+
+    def write_objects(self, aas: "model.AssetAdministrationShell", submodel: "model.Submodel") -> None:
+        """Serialize and append one basyx AAS/Submodel pair."""
+        from basyx.aas.adapter.json import AASToJsonEncoder
+        self.write_pair(json.dumps(aas, cls=AASToJsonEncoder, ensure_ascii=self.ensure_ascii),
+                        json.dumps(submodel, cls=AASToJsonEncoder, ensure_ascii=self.ensure_ascii))
+
+    def close(self) -> None:
+        """Append the spooled submodels and finish the document."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.count == 0:
+            self._write(self.stream, "{}")
+        else:
+            self._write(self.stream, self._open_list("submodels", first=False))
+            self._spool.seek(0)
+            # The spool already holds escaped text, copy it verbatim
+            shutil.copyfileobj(self._spool, self.stream)
+            pad = " " * self.indent if self.indent is not None else ""
+            self._write(self.stream, "]}" if self.indent is None else "\n" + pad + "]\n}")
+        if self.as_string_literal:
+            self.stream.write('"')
+        self._spool.close()
+
+
+class IncrementalSubmodelSerializer:
+    """Re-serialize a submodel after live updates, re-encoding only what changed.
+
+    The JSON of every element is cached. A :class:`SubmodelChangeTracker` reports
+    property writes and added/removed children; the changed element and all of its
+    ancestors (collections up to the submodel) are marked dirty by dropping their
+    cached encodings. :meth:`to_json` then re-encodes only dirty elements and
+    splices the cached JSON of everything else, producing exactly what
+    ``json.dumps(submodel, cls=AASToJsonEncoder)`` would.
+    """
+
+    def __init__(self, submodel: "model.Submodel", tracker: Optional["SubmodelChangeTracker"] = None,
+                 ensure_ascii: bool = True):
+        from am_model import SubmodelChangeTracker
+        self.submodel = submodel
+        self.tracker = tracker if tracker is not None else SubmodelChangeTracker(submodel)
+        self.ensure_ascii = ensure_ascii
+        self.encoded_elements = 0
+        # id(element) -> (element, json); holding the element keeps its id unique
+        self._cache: Dict[int, Tuple[Any, str]] = {}
+        self.tracker.subscribe(self._mark_dirty)
+
+    def _mark_dirty(self, element: Any) -> None:
+        while element is not None:
+            self._cache.pop(id(element), None)
+            element = getattr(element, "parent", None)
+
+    def is_dirty(self, element: Any) -> bool:
+        """Whether ``element`` has to be re-encoded on the next :meth:`to_json`."""
+        entry = self._cache.get(id(element))
+        return entry is None or entry[0] is not element
+
+    def _dumps(self, obj: Any) -> str:
+        from basyx.aas.adapter.json import AASToJsonEncoder
+        return json.dumps(obj, cls=AASToJsonEncoder, ensure_ascii=self.ensure_ascii)
+
+    def _with_children(self, header: Dict[str, Any], key: str, children: Any) -> str:
+        encoded = [self._encode(child) for child in children]
+        head = self._dumps(header)
+        if not encoded:
+            return head
+        return head[:-1] + ", " + json.dumps(key) + ": [" + ", ".join(encoded) + "]}"
+
+    def _encode(self, element: Any) -> str:
+        entry = self._cache.get(id(element))
+        if entry is not None and entry[0] is element:
+            return entry[1]
+
+        from basyx.aas import model
+        from basyx.aas.adapter.json import AASToJsonEncoder
+
+        if isinstance(element, model.SubmodelElementCollection):
+            # "value" is the last member basyx writes for a collection
+            encoded = self._with_children(AASToJsonEncoder._abstract_classes_to_json(element), "value", element.value)
+        elif isinstance(element, model.Submodel):
+            encoded = self._with_children(AASToJsonEncoder._abstract_classes_to_json(element),
+                                          "submodelElements", element.submodel_element)
+        else:
+            encoded = self._dumps(element)
+        self.encoded_elements += 1
+        self._cache[id(element)] = (element, encoded)
+        return encoded
+
+    def to_json(self) -> str:
+        """Serialize the submodel, reusing the cached JSON of unchanged elements."""
+        return self._encode(self.submodel)
+
+    def element_json(self, element: "model.SubmodelElement") -> str:
+        """Serialize one element of the submodel, cached the same way as :meth:`to_json`."""
+        return self._encode(element)
+
+
+# Reference to a shared collection in a deduplicated submodel document. Quotes
+# inside JSON strings are escaped, so the pattern never matches real content.
+_COLLECTION_REFERENCE = '{{"$collection": "{}"}}'
+_COLLECTION_REFERENCE_PATTERN = re.compile(r'\{"\$collection": "([0-9a-f]{32})"\}')
+_ELEMENTS_KEY = re.compile(r'"submodelElements":\s*\[\s*')
+_ELEMENT_SEPARATOR = re.compile(r'\s*([,\]])\s*')
+_UNIT_SUFFIX = re.compile(r"_\d+$")
+_DECODER = json.JSONDecoder()
+
+
+def collection_digest(collection_json: str) -> str:
+    """Content address of a serialized collection: the hex BLAKE2b digest of its JSON text."""
+    return hashlib.blake2b(collection_json.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def collection_reference(digest: str) -> str:
+    """The JSON that stands in for a shared collection in a deduplicated document."""
+    return _COLLECTION_REFERENCE.format(digest)
+
+
+def collection_references(document: str) -> List[str]:
+    """Digests of the shared collections referenced by a deduplicated document, in order."""
+    return _COLLECTION_REFERENCE_PATTERN.findall(document)
+
+
+def split_collections(submodel_json: str, shared: Collection[str]) -> Tuple[str, Dict[str, str]]:
+    """Cut the top-level collections named in ``shared`` out of a serialized submodel.
+
+    Returns the rest of the document, with a ``{"$collection": "<digest>"}``
+    reference (:func:`collection_reference`) in place of every cut collection,
+    and the cut collections by :func:`collection_digest`. Collections are cut
+    from the text as they are, so :func:`join_collections` restores the
+    document byte for byte. Names match idShorts with or without a ``_<n>``
+    suffix: ``Exposure_unit`` also covers ``Exposure_unit_2``.
+    """
+    match = _ELEMENTS_KEY.search(submodel_json)
+    if match is None:
+        return submodel_json, {}
+    parts: List[str] = []
+    collections: Dict[str, str] = {}
+    copied, position = 0, match.end()
+    while position < len(submodel_json) and submodel_json[position] != "]":
+        element, end = _DECODER.raw_decode(submodel_json, position)
+        if element.get("modelType") == "SubmodelElementCollection" and \
+                _UNIT_SUFFIX.sub("", element.get("idShort", "")) in shared:
+            collection = submodel_json[position:end]
+            digest = collection_digest(collection)
+            collections[digest] = collection
+            parts.append(submodel_json[copied:position])
+            parts.append(collection_reference(digest))
+            copied = end
+        separator = _ELEMENT_SEPARATOR.match(submodel_json, end)
+        if separator is None:
+            raise ValueError(f"Malformed submodelElements at offset {end}")
+        position = separator.end() if separator.group(1) == "," else separator.start(1)
+    parts.append(submodel_json[copied:])
+    return "".join(parts), collections
+
+
+def join_collections(document: str, collections: Mapping[str, str]) -> str:
+    """Put the serialized ``collections`` (by digest) back in place of their references."""
+    return _COLLECTION_REFERENCE_PATTERN.sub(lambda match: collections[match.group(1)], document)
+
+
+class SubmodelJSONLoader:
+    """Read PBF-LB/M submodel JSON straight into dotted-path values, checked against the specification.
+
+    Accepts the documents ``am_machine.py`` writes (an environment, possibly as
+    a JSON string literal) as well as a bare submodel object. Elements are only
+    matched against the compiled specification tree, so no basyx objects are
+    built and nothing but the values is kept. Elements that are not in the
+    specification, have the wrong ``modelType`` or ``valueType``, or hold values
+    of the wrong type are all reported together in one :class:`ValueCoercionError`.
+
+    Without an explicit specification, machines with any number of exposure
+    units are read against :func:`am_machine.machine_specification` for the
+    units present in the document.
+    """
+
+    def __init__(self, specification: Optional[Dict[str, ElementSpec]] = None):
+        self.specification = specification if specification is not None else MACHINE_SPECIFICATION
+        self._any_exposure_units = specification is None
+        self._trees = {id(self.specification): self._compile(self.specification)}
+        self._tree = self._trees[id(self.specification)]
+
+    @staticmethod
+    def _compile(specs: Dict[str, ElementSpec]) -> Dict[str, Tuple[str, Any, Optional[Dict]]]:
+        """idShort -> (modelType, valueType and coercer, child tree) for the top level of the specification."""
+        trees: Dict[int, Dict[str, Tuple[str, Any, Optional[Dict]]]] = {-1: {}}
+        for node in compile_specification(specs):
+            if node.type_code == PROPERTY_CODE:
+                value_type = (xsd_type_name(node.value_type), _COERCERS[node.value_type])
+                trees[node.parent][node.id_short] = ("Property", value_type, None)
+            else:
+                trees[node.index] = {}
+                trees[node.parent][node.id_short] = ("SubmodelElementCollection", None, trees[node.index])
+        return trees[-1]
+
+    def specification_for(self, paths: Any) -> Dict[str, ElementSpec]:
+        """The specification of a machine with the given dotted-path values (or top-level idShorts)."""
+        if not self._any_exposure_units:
+            return self.specification
+        return machine_specification(highest_exposure_unit(paths))
+
+    def _tree_for(self, elements: Any) -> Dict[str, Tuple[str, Any, Optional[Dict]]]:
+        if not self._any_exposure_units or not isinstance(elements, list):
+            return self._tree
+        specification = self.specification_for(
+            element.get("idShort") for element in elements if isinstance(element, dict)
+            and isinstance(element.get("idShort"), str))
+        tree = self._trees.get(id(specification))
+        if tree is None:
+            tree = self._trees[id(specification)] = self._compile(specification)
+        return tree
+
+    @staticmethod
+    def _submodel_document(document: Any) -> Dict[str, Any]:
+        if isinstance(document, str):
+            document = json.loads(document)
+        if isinstance(document, dict) and "submodels" in document:
+            if len(document["submodels"]) != 1:
+                raise ValueError(f"Expected exactly one submodel, found {len(document['submodels'])}")
+            document = document["submodels"][0]
+        if not isinstance(document, dict) or document.get("modelType") != "Submodel":
+            raise ValueError("Document is neither an AAS environment nor a Submodel")
+        return document
+
+    def _walk(self, elements: Any, tree: Dict[str, Any], prefix: str,
+              values: Dict[str, Any], issues: List[ValueIssue]) -> None:
+        if not isinstance(elements, list):
+            issues.append(ValueIssue(prefix.rstrip(".") or "submodelElements", elements, "expected a list of elements"))
+            return
+        for element in elements:
+            id_short = element.get("idShort") if isinstance(element, dict) else None
+            path = prefix + str(id_short)
+            node = tree.get(id_short)
+            if node is None:
+                issues.append(ValueIssue(path, None, "element is not part of the specification"))
+                continue
+            model_type, value_type, children = node
+            if element.get("modelType") != model_type:
+                issues.append(ValueIssue(path, None, f"expected {model_type}, got {element.get('modelType')}"))
+            elif children is not None:
+                self._walk(element.get("value", []), children, path + ".", values, issues)
+            elif element.get("valueType") != value_type[0]:
+                issues.append(ValueIssue(path, element.get("value"),
+                                         f"expected valueType {value_type[0]}, got {element.get('valueType')}"))
+            else:
+                value = element.get("value")
+                try:
+                    values[path] = None if value is None else value_type[1](value)
+                except (TypeError, ValueError) as e:
+                    issues.append(ValueIssue(path, value, str(e) or type(e).__name__))
+
+    def read(self, document: Any) -> Tuple[str, Dict[str, Any]]:
+        """Return the submodel ID and the coerced value of every property in a parsed document."""
+        submodel = self._submodel_document(document)
+        values: Dict[str, Any] = {}
+        issues: List[ValueIssue] = []
+        elements = submodel.get("submodelElements", [])
+        self._walk(elements, self._tree_for(elements), "", values, issues)
+        if issues:
+            raise ValueCoercionError(issues)
+        return submodel.get("id"), values
+
+    def load_values(self, path: str) -> Dict[str, Any]:
+        """Read a submodel file into a flat ``{dotted path: value}`` mapping.
+
+        Properties without a value map to ``None``; properties missing from the
+        file are missing from the mapping.
+        """
+        with open(path, encoding="utf-8") as f:
+            return self.read(json.load(f))[1]
+
+    def load_submodel(self, path: str, builder: Optional["PBFLBMSubmodelBuilder"] = None) -> "model.Submodel":
+        """Read a submodel file into a populated submodel built from the specification."""
+        with open(path, encoding="utf-8") as f:
+            submodel_id, values = self.read(json.load(f))
+        return self.build_submodel(submodel_id, values, builder)
+
+    def build_submodel(self, submodel_id: str, values: Dict[str, Any],
+                       builder: Optional["PBFLBMSubmodelBuilder"] = None) -> "model.Submodel":
+        """Build a submodel from the specification and populate it with values returned by :meth:`read`."""
+        if builder is None:
+            from am_model import PBFLBMSubmodelBuilder
+            builder = PBFLBMSubmodelBuilder(specification=self.specification_for(values))
+        _, submodel = builder.build_aas_and_submodel(submodel_id=submodel_id)
+        builder.set_values(submodel, values)
+        return submodel
@@ -1,11 +1,38 @@
 import argparse
+import contextlib
 import json
-from typing import Dict, Any, Union, List, Optional, Type
+import sys
+from collections import Counter
+from array import array
+from types import MappingProxyType, SimpleNamespace
+from typing import Dict, Any, List, Optional, Tuple, Type, Iterable, Iterator, Callable, NamedTuple
 from dataclasses import dataclass
 from enum import Enum
 
-from basyx.aas import model, adapter
-from basyx.aas.adapter import json as aas_json
+# basyx is only imported by am_model (the object model layer, loaded on first use;
+# see __getattr__ below), so the specification, value coercion, statistics and
+# --direct emission run without it.
+
+# The value types of basyx's model.datatypes used by the specification. basyx
+# defines them as the builtin types, so they compare equal to model.datatypes.*.
+datatypes = SimpleNamespace(String=str, Double=float, Integer=int, Boolean=bool)
+
+# XSD names of these value types (basyx: model.datatypes.XSD_TYPE_NAMES)
+_XSD_TYPE_NAMES = {
+    datatypes.String: "xs:string",
+    datatypes.Double: "xs:double",
+    datatypes.Integer: "xs:integer",
+    datatypes.Boolean: "xs:boolean",
+}
+
+
+def xsd_type_name(value_type: Type) -> str:
+    """XSD name of a value type, e.g. ``xs:double``; other basyx datatypes are looked up in basyx."""
+    name = _XSD_TYPE_NAMES.get(value_type)
+    if name is None:
+        from basyx.aas import model
+        name = model.datatypes.XSD_TYPE_NAMES[value_type]
+    return name
 
 
 class ElementType(Enum):
@@ -24,6 +51,8 @@ class ElementSpec:
     description: Optional[str] = None
     children: Optional[Dict[str, 'ElementSpec']] = None
     semantic_id_suffix: Optional[str] = None
+    minimum: Optional[float] = None  # inclusive range of valid values, in ``unit``
+    maximum: Optional[float] = None
 
 
 # ============================================================================
@@ -34,111 +63,117 @@ class ElementSpec:
 MANUFACTURER_BRAND = ElementSpec(
     id_short="manufacturer_brand",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Name of the AM machine manufacturer (e.g., SLM, TRUMPF, EOS)"
 )
 
 MODEL_TYPE = ElementSpec(
     id_short="model_type",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Type of machine, specifying whether it's for metal or polymer"
 )
 
 MODEL_NUMBER = ElementSpec(
     id_short="model_number",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Product model number of the machine"
 )
 
 MODEL_NUMBER_TECHNICAL = ElementSpec(
     id_short="model_number_technical",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Technical designation of the machine model"
 )
 
 SERIAL_NUMBER = ElementSpec(
     id_short="serial_number",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Unique serial number assigned to the machine"
 )
 
 HOST_NAME = ElementSpec(
     id_short="host_name",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Network hostname for machine connectivity"
 )
 
 FEED_MODEL = ElementSpec(
     id_short="feed_model",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Variant of the material feed system"
 )
 
 FEEDSTOCK_EQUIPPED = ElementSpec(
     id_short="feedstock_equipped",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Type of material currently loaded into the machine"
 )
 
 REMOTE_CONTROL = ElementSpec(
     id_short="remote_control",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Boolean,
+    value_type=datatypes.Boolean,
     description="Boolean flag indicating if remote operation is enabled"
 )
 
 EXPOSURE_UNIT_COUNT = ElementSpec(
     id_short="exposure_unit_count",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Integer,
-    description="Number of exposure units (e.g., laser sources)"
+    value_type=datatypes.Integer,
+    description="Number of exposure units (e.g., laser sources)",
+    minimum=1,
+    maximum=64
 )
 
 # Build Volume Elements
 BUILD_VOLUME_TYPE = ElementSpec(
     id_short="type",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Specifies whether the build volume is rectangular or cylindrical"
 )
 
 BUILD_VOLUME_X = ElementSpec(
     id_short="x_dimension",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Double,
+    value_type=datatypes.Double,
     unit="mm",
-    description="Build plate width (X-axis)"
+    description="Build plate width (X-axis)",
+    minimum=0
 )
 
 BUILD_VOLUME_Y = ElementSpec(
     id_short="y_dimension",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Double,
+    value_type=datatypes.Double,
     unit="mm",
-    description="Build plate depth (Y-axis)"
+    description="Build plate depth (Y-axis)",
+    minimum=0
 )
 
 BUILD_VOLUME_Z = ElementSpec(
     id_short="z_dimension",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Double,
+    value_type=datatypes.Double,
     unit="mm",
-    description="Maximum build height (Z-axis)"
+    description="Maximum build height (Z-axis)",
+    minimum=0
 )
 
 BUILD_VOLUME_DIAMETER = ElementSpec(
     id_short="diameter",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Double,
+    value_type=datatypes.Double,
     unit="mm",
-    description="Diameter of the build volume (if cylindrical)"
+    description="Diameter of the build volume (if cylindrical)",
+    minimum=0
 )
 
 BUILD_VOLUME = ElementSpec(
@@ -159,124 +194,128 @@ BUILD_VOLUME = ElementSpec(
 GALVO_SCAN_HEAD_MODEL = ElementSpec(
     id_short="galvo_scan_head_model",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Model of the galvanometer-based scanning head"
 )
 
 GALVO_SCAN_HEAD_INTERFACE = ElementSpec(
     id_short="galvo_scan_head_interface",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Type of interface for scan head control"
 )
 
 GALVO_SCAN_HEAD_SOFTWARE = ElementSpec(
     id_short="galvo_scan_head_software",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Software/firmware version for scan head control"
 )
 
 LASER_SOURCE_MODEL = ElementSpec(
     id_short="laser_source_model",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Model identifier of the laser source"
 )
 
 LASER_SOURCE_SERIAL_NUMBER = ElementSpec(
     id_short="laser_source_serial_number",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Serial number of the laser source"
 )
 
 LASER_SOURCE_SOFTWARE = ElementSpec(
     id_short="laser_source_software",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Firmware/software version of the laser source"
 )
 
 LASER_SOURCE_RATED_POWER = ElementSpec(
     id_short="laser_source_rated_power",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Double,
+    value_type=datatypes.Double,
     unit="W",
-    description="Maximum rated power output of the laser source"
+    description="Maximum rated power output of the laser source",
+    minimum=0
 )
 
 LASER_POWERS = ElementSpec(
     id_short="laser_powers",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Double,
+    value_type=datatypes.Double,
     unit="W",
-    description="Available laser power settings"
+    description="Available laser power settings",
+    minimum=0
 )
 
 LASER_MODE = ElementSpec(
     id_short="laser_mode",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Operating mode of the laser (e.g., continuous, pulsed, multimode)"
 )
 
 LASER_CONFIGURATION = ElementSpec(
     id_short="laser_configuration",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Configurable laser power settings"
 )
 
 BEAM_FOCUS_DIAMETER_MIN = ElementSpec(
     id_short="beam_focus_diameter_min",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Double,
+    value_type=datatypes.Double,
     unit="µm",
-    description="Minimum focusable laser beam diameter"
+    description="Minimum focusable laser beam diameter",
+    minimum=0
 )
 
 BEAM_FOCUS_DIAMETER_MAX = ElementSpec(
     id_short="beam_focus_diameter_max",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.Double,
+    value_type=datatypes.Double,
     unit="µm",
-    description="Maximum focusable laser beam diameter"
+    description="Maximum focusable laser beam diameter",
+    minimum=0
 )
 
 # Atmosphere Elements
 FILTRATION_MODEL = ElementSpec(
     id_short="filtration_model",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Type/model of the filtration system used for gas handling"
 )
 
 FILTRATION_SERIAL_NUMBER = ElementSpec(
     id_short="filtration_serial_number",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Serial number of the filtration unit"
 )
 
 FILTRATION_SAFETY_SOFTWARE = ElementSpec(
     id_short="filtration_safety_software",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Safety software version controlling filtration"
 )
 
 FILTRATION_SOFTWARE = ElementSpec(
     id_short="filtration_software",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Filtration unit software version"
 )
 
 INERT_GAS_EQUIPPED = ElementSpec(
     id_short="inert_gas_equipped",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Type of shielding gas used in the build chamber"
 )
 
@@ -284,21 +323,21 @@ INERT_GAS_EQUIPPED = ElementSpec(
 PLC_MODEL = ElementSpec(
     id_short="model",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Model/type of the programmable logic controller (PLC)"
 )
 
 PLC_SERIAL_NUMBER = ElementSpec(
     id_short="serial_number",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Serial number of the PLC unit"
 )
 
 PLC_SOFTWARE_VERSION = ElementSpec(
     id_short="software_version",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Version of the PLC software"
 )
 
@@ -306,42 +345,42 @@ PLC_SOFTWARE_VERSION = ElementSpec(
 MCSW_PRINT_DOMAIN = ElementSpec(
     id_short="print_domain",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Domain configuration for the printing process"
 )
 
 MCSW_CONTROL_SYSTEM = ElementSpec(
     id_short="control_system",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Supervisory control system of the machine"
 )
 
 MCSW_SCADA_SYSTEM = ElementSpec(
     id_short="scada_system",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Version of SCADA software used"
 )
 
 MCSW_DB_SCHEME = ElementSpec(
     id_short="db_scheme",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Database schema version"
 )
 
 MCSW_DB_SERVICE = ElementSpec(
     id_short="db_service",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Database service version used by the machine"
 )
 
 MCSW_HCS_SERVICE = ElementSpec(
     id_short="hcs_service",
     element_type=ElementType.PROPERTY,
-    value_type=model.datatypes.String,
+    value_type=datatypes.String,
     description="Hardware control system service version"
 )
 
@@ -444,150 +483,464 @@ MACHINE_SPECIFICATION = {
 }
 
 
-class PBFLBMSubmodelBuilder:
-    """Robust builder for PBF-LB/M machine submodels."""
-    
-    def __init__(self, base_semantic_uri: str = "https://admin-shell.io/IDTA/PBF-LB-M/1/0"):
-        self.base_semantic_uri = base_semantic_uri
-        self.property_base_uri = "https://acplt.org/Properties"
-        
-    def _create_semantic_reference(self, suffix: str) -> model.ExternalReference:
-        """Create a semantic reference for an element."""
-        return model.ExternalReference(
-            (
-                model.Key(
-                    type_=model.KeyTypes.GLOBAL_REFERENCE,
-                    value=f"{self.base_semantic_uri}/{suffix}",
-                ),
-            )
-        )
-
-    def _create_property_semantic_reference(self, property_name: str) -> model.ExternalReference:
-        """Create a semantic reference for a property."""
-        return model.ExternalReference(
-            (
-                model.Key(
-                    type_=model.KeyTypes.GLOBAL_REFERENCE,
-                    value=f"{self.property_base_uri}/{property_name}",
-                ),
-            )
-        )
-
-    def _create_property(self, spec: ElementSpec) -> model.Property:
-        """Create a property from specification."""
-        prop = model.Property(
-            id_short=spec.id_short,
-            value_type=spec.value_type,
-            value=None,
-            semantic_id=self._create_property_semantic_reference(spec.id_short)
-        )
-        
-        if spec.description:
-            prop.description = model.MultiLanguageTextType({"en": spec.description})
-        
-        if spec.unit:
-            prop.qualifier = {
-                model.Qualifier(
-                    type_="unit",
-                    value=spec.unit,
-                    value_type=model.datatypes.String
-                )
-            }
-        
-        return prop
+# ============================================================================
+# MULTI-LASER MACHINES
+# ============================================================================
 
-    def _create_collection(self, spec: ElementSpec) -> model.SubmodelElementCollection:
-        """Create a collection from specification."""
-        collection = model.SubmodelElementCollection(id_short=spec.id_short)
-        
-        if spec.description:
-            collection.description = model.MultiLanguageTextType({"en": spec.description})
-        
-        if spec.semantic_id_suffix:
-            collection.semantic_id = self._create_semantic_reference(spec.semantic_id_suffix)
-        
-        return collection
+# idShort of exposure unit n > 1; unit 1 keeps the idShort "Exposure_unit"
+EXPOSURE_UNIT_ID_SHORT = "Exposure_unit_{}"
+
+# Machine specifications per number of exposure units, built once each
+_machine_specifications: Dict[int, Dict[str, ElementSpec]] = {1: MACHINE_SPECIFICATION}
+
+
+def machine_specification(exposure_units: int = 1) -> Dict[str, ElementSpec]:
+    """The machine specification with ``exposure_units`` exposure unit collections.
+
+    Unit 1 is ``Exposure_unit`` as in :data:`MACHINE_SPECIFICATION` (returned for
+    one unit), units 2 to n follow it as ``Exposure_unit_2`` ... ``Exposure_unit_<n>``,
+    e.g. ``Exposure_unit_3.laser_source_serial_number``. All units share the
+    property specs of ``Exposure_unit``, so builders, emitters and loaders
+    compile one set of interned semantics for every unit. The specification is
+    built once per number of units and must not be modified. The number of
+    units is bounded by the range of ``Info.exposure_unit_count``.
+    """
+    if exposure_units < 1:
+        raise ValueError(f"A machine has at least one exposure unit, got {exposure_units}")
+    if exposure_units > EXPOSURE_UNIT_COUNT.maximum:
+        raise ValueError(f"A machine has at most {EXPOSURE_UNIT_COUNT.maximum} exposure units, got {exposure_units}")
+    specification = _machine_specifications.get(exposure_units)
+    if specification is None:
+        specification = {}
+        for id_short, spec in MACHINE_SPECIFICATION.items():
+            specification[id_short] = spec
+            if spec is EXPOSURE_UNIT_COLLECTION:
+                for unit in range(2, exposure_units + 1):
+                    unit_id_short = EXPOSURE_UNIT_ID_SHORT.format(unit)
+                    specification[unit_id_short] = ElementSpec(
+                        id_short=unit_id_short, element_type=spec.element_type, description=spec.description,
+                        children=spec.children, semantic_id_suffix=spec.semantic_id_suffix)
+        _machine_specifications[exposure_units] = specification
+    return specification
+
+
+def exposure_units(values: Dict[str, Any]) -> int:
+    """Number of exposure units of a machine given as dotted-path values.
+
+    ``Info.exposure_unit_count`` if set, otherwise the highest unit that has a value.
+    """
+    count = values.get("Info.exposure_unit_count")
+    if count is not None:
+        return _coerce_integer(count)
+    return highest_exposure_unit(values)
+
+
+def highest_exposure_unit(paths: Iterable[str]) -> int:
+    """Highest exposure unit addressed by any of the dotted paths or idShorts, at least 1."""
+    prefix = EXPOSURE_UNIT_ID_SHORT.format("")
+    units = 1
+    for path in paths:
+        if path.startswith(prefix):
+            unit = path[len(prefix):].partition(".")[0]
+            if unit.isdigit():
+                units = max(units, int(unit))
+    return units
 
-    def _build_submodel_element(self, spec: ElementSpec) -> model.SubmodelElement:
-        """Recursively build submodel elements from specification."""
-        if spec.element_type == ElementType.PROPERTY:
-            return self._create_property(spec)
-        
-        elif spec.element_type == ElementType.COLLECTION:
-            collection = self._create_collection(spec)
-            
-            if spec.children:
-                for child_spec in spec.children.values():
-                    child_element = self._build_submodel_element(child_spec)
-                    collection.value.add(child_element)
-            
-            return collection
-        
-        else:
-            raise ValueError(f"Unknown element type: {spec.element_type}")
 
-    def build_aas_and_submodel(self, 
-                              aas_id: str = "https://acplt.org/PBF-LB-M_AAS",
-                              submodel_id: str = "https://acplt.org/PBF-LB-M_Submodel") -> tuple[model.AssetAdministrationShell, model.Submodel]:
-        """Build complete AAS and Submodel from specification."""
-        
-        # Create Asset Information
-        asset_information = model.AssetInformation(
-            asset_kind=model.AssetKind.INSTANCE,
-            global_asset_id=aas_id,
-        )
-
-        # Create AAS
-        aas = model.AssetAdministrationShell(
-            id_=aas_id,
-            asset_information=asset_information,
-        )
-
-        # Create Submodel
-        submodel = model.Submodel(
-            id_=submodel_id,
-            semantic_id=self._create_semantic_reference("Submodel")
-        )
-        
-        # Add submodel reference to AAS
-        aas.submodel.add(model.ModelReference.from_referable(submodel))
-
-        # Build all submodel elements from specification
-        for element_spec in MACHINE_SPECIFICATION.values():
-            element = self._build_submodel_element(element_spec)
-            submodel.submodel_element.add(element)
-
-        return aas, submodel
-
-    def get_statistics(self, submodel: model.Submodel) -> Dict[str, int]:
-        """Get statistics about the generated submodel."""
-        stats = {
-            "total_collections": 0,
-            "total_properties": 0,
-            "max_depth": 0
-        }
-        
-        def count_elements(elements, depth=0):
-            stats["max_depth"] = max(stats["max_depth"], depth)
-            
-            for element in elements:
-                if isinstance(element, model.SubmodelElementCollection):
-                    stats["total_collections"] += 1
-                    count_elements(element.value, depth + 1)
-                elif isinstance(element, model.Property):
-                    stats["total_properties"] += 1
-        
-        count_elements(submodel.submodel_element)
-        return stats
+# ============================================================================
+# VALUE COERCION
+# ============================================================================
+
+@dataclass
+class ValueIssue:
+    """A raw value that cannot be assigned to the property at ``path``."""
+    path: str
+    value: Any
+    message: str
+    row: Optional[int] = None
+
+    def __str__(self) -> str:
+        location = self.path if self.row is None else f"row {self.row}: {self.path}"
+        return f"{location} = {self.value!r}: {self.message}"
+
+
+class ValueCoercionError(ValueError):
+    """Raised with every :class:`ValueIssue` found while coercing a batch of values."""
+
+    def __init__(self, issues: List[ValueIssue]):
+        self.issues = issues
+        super().__init__(f"{len(issues)} invalid value(s):\n" + "\n".join(f"  - {issue}" for issue in issues))
+
+
+# Values derived from a specification, keyed by (kind, id()); the specification is kept alive alongside
+_spec_derived_cache: Dict[Tuple[str, int], Tuple[Dict[str, ElementSpec], Any]] = {}
+
+
+def _derive_from_spec(kind: str, specification: Optional[Dict[str, ElementSpec]], compute) -> Any:
+    """Compute ``compute(specification)`` once per specification object and cache the result."""
+    specification = specification if specification is not None else MACHINE_SPECIFICATION
+    cached = _spec_derived_cache.get((kind, id(specification)))
+    if cached is not None and cached[0] is specification:
+        return cached[1]
+    result = compute(specification)
+    _spec_derived_cache[(kind, id(specification))] = (specification, result)
+    return result
+
+
+def property_specs(specification: Optional[Dict[str, ElementSpec]] = None) -> Dict[str, ElementSpec]:
+    """Map the dotted idShort path of every property in the specification to its spec.
+
+    The result is cached per specification object and must not be modified.
+    """
+    return _derive_from_spec("property_specs", specification, _collect_property_specs)
+
+
+def _collect_property_specs(specification: Dict[str, ElementSpec]) -> Dict[str, ElementSpec]:
+    compiled = compile_specification(specification)
+    return {node.path: compiled.sources[node.index] for node in compiled.nodes if node.type_code == PROPERTY_CODE}
+
+
+def _coerce_string(value: Any) -> str:
+    if isinstance(value, (dict, list, tuple, set)):
+        raise TypeError(f"expected a scalar, got {type(value).__name__}")
+    return value if isinstance(value, str) else str(value)
+
+
+def _coerce_double(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError(f"expected a number, got {type(value).__name__}")
+    return float(value)
+
+
+def _coerce_integer(value: Any) -> int:
+    if isinstance(value, bool):
+        raise TypeError("expected an integer, got bool")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError("expected an integer, got a fractional number")
+        value = int(value)
+    elif isinstance(value, str):
+        value = int(value.strip())
+    elif not isinstance(value, int):
+        raise TypeError(f"expected an integer, got {type(value).__name__}")
+    return datatypes.Integer(value)
+
+
+_BOOLEAN_LEXICAL = {"true": True, "1": True, "false": False, "0": False}
+
+
+def _coerce_boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip() in _BOOLEAN_LEXICAL:
+        return _BOOLEAN_LEXICAL[value.strip()]
+    raise ValueError("expected true/false/1/0")
+
+
+_COERCERS = {
+    datatypes.String: _coerce_string,
+    datatypes.Double: _coerce_double,
+    datatypes.Integer: _coerce_integer,
+    datatypes.Boolean: _coerce_boolean,
+}
+
+
+def coerce_column(raw_values: List[Any], value_type: Type) -> Tuple[List[Any], List[Tuple[int, str]]]:
+    """Coerce a whole column of raw values to ``value_type``.
+
+    Returns the coerced values (``None`` stays ``None``, invalid entries become
+    ``None``) and a list of ``(index, message)`` pairs for the invalid entries.
+    The common all-valid case runs as a single comprehension.
+    """
+    coercer = _COERCERS[value_type]
+    try:
+        return [None if value is None else coercer(value) for value in raw_values], []
+    except (TypeError, ValueError):
+        pass
+
+    coerced: List[Any] = []
+    errors: List[Tuple[int, str]] = []
+    for index, value in enumerate(raw_values):
+        try:
+            coerced.append(None if value is None else coercer(value))
+        except (TypeError, ValueError) as e:
+            coerced.append(None)
+            errors.append((index, str(e) or type(e).__name__))
+    return coerced, errors
+
+
+def coerce_table(rows: List[Dict[str, Any]],
+                 specification: Optional[Dict[str, ElementSpec]] = None
+                 ) -> Tuple[List[Dict[str, Any]], List[ValueIssue]]:
+    """Coerce a table of machines (one dict of dotted-path values per row) column by column.
+
+    Returns the coerced rows and every issue found, each tagged with its row index.
+    Paths that do not address a property of the specification are reported as well.
+    """
+    specs = property_specs(specification)
+    columns: Dict[str, List[Any]] = {}
+    for row in rows:
+        for path in row:
+            columns.setdefault(path, [])
+
+    issues: List[ValueIssue] = []
+    coerced_rows: List[Dict[str, Any]] = [{} for _ in rows]
+    for path in columns:
+        present = [i for i, row in enumerate(rows) if path in row]
+        raw_values = [rows[i][path] for i in present]
+        spec = specs.get(path)
+        if spec is None:
+            issues.extend(ValueIssue(path, rows[i][path], "no property at this path", i) for i in present)
+            continue
+        coerced, errors = coerce_column(raw_values, spec.value_type)
+        for position, message in errors:
+            issues.append(ValueIssue(path, raw_values[position], message, present[position]))
+        for i, value in zip(present, coerced):
+            coerced_rows[i][path] = value
+
+    issues.sort(key=lambda issue: (issue.row, issue.path))
+    return coerced_rows, issues
+
+
+def coerce_values(values: Dict[str, Any],
+                  specification: Optional[Dict[str, ElementSpec]] = None
+                  ) -> Tuple[Dict[str, Any], List[ValueIssue]]:
+    """Coerce one machine's dotted-path values; returns the coerced values and all issues."""
+    coerced_rows, issues = coerce_table([values], specification)
+    for issue in issues:
+        issue.row = None
+    return coerced_rows[0], issues
+
+
+# ============================================================================
+# COMPILED SPECIFICATION
+# ============================================================================
+
+# Element type codes of compiled nodes
+ELEMENT_TYPES: Tuple[ElementType, ...] = (ElementType.PROPERTY, ElementType.COLLECTION)
+PROPERTY_CODE, COLLECTION_CODE = range(len(ELEMENT_TYPES))
+
+
+class SpecNode(NamedTuple):
+    """One element of a :class:`CompiledSpecification`, immutable."""
+    index: int
+    parent: int  # index of the parent collection, -1 for top-level elements
+    depth: int  # 0 for top-level elements
+    end: int  # index after the last descendant; the subtree is ``nodes[index:end]``
+    type_code: int  # position in ELEMENT_TYPES
+    value_type_code: int  # position in ``CompiledSpecification.value_types``, 0 for collections
+    path: str  # dotted idShort path
+    id_short: str
+    value_type: Optional[Type]
+    unit: Optional[str]
+    description: Optional[str]
+    semantic_id_suffix: Optional[str]
+    minimum: Optional[float]
+    maximum: Optional[float]
+
+    @property
+    def element_type(self) -> ElementType:
+        return ELEMENT_TYPES[self.type_code]
+
+
+class CompiledSpecification:
+    """Immutable, flat form of a specification: every element once, in pre-order.
+
+    Besides the :class:`SpecNode` tuples, parent indexes, depths, type codes,
+    value type codes and paths are kept as flat columns, so builders, validators
+    and exporters iterate the specification in one loop instead of recursing
+    through nested ``children`` dicts. A parent always precedes its children,
+    and the descendants of node ``i`` are exactly ``nodes[i + 1:nodes[i].end]``.
+    Columns are tuples, bytes or read-only mappings, so neither the attributes
+    nor their contents can be changed.
+    """
+
+    __slots__ = ("nodes", "sources", "value_types", "parents", "depths", "type_codes", "value_type_codes",
+                 "paths", "_indexes")
+
+    def __init__(self, specification: Dict[str, ElementSpec]):
+        sources: List[ElementSpec] = []
+        parents = array("i")
+        depths = array("B")
+        paths: List[str] = []
+        # Explicit stack in reverse order, so elements pop off in pre-order
+        stack = [(spec, -1, 0, spec.id_short) for spec in reversed(list(specification.values()))]
+        while stack:
+            spec, parent, depth, path = stack.pop()
+            index = len(sources)
+            sources.append(spec)
+            parents.append(parent)
+            depths.append(depth)
+            paths.append(path)
+            if spec.element_type == ElementType.COLLECTION:
+                stack.extend((child, index, depth + 1, f"{path}.{child.id_short}")
+                             for child in reversed(list((spec.children or {}).values())))
+
+        ends = [index + 1 for index in range(len(sources))]
+        for index in range(len(sources) - 1, -1, -1):
+            if parents[index] >= 0:
+                ends[parents[index]] = max(ends[parents[index]], ends[index])
+
+        value_types: List[Optional[Type]] = [None]
+        nodes = []
+        for index, spec in enumerate(sources):
+            if spec.element_type not in ELEMENT_TYPES:
+                raise ValueError(f"Unknown element type: {spec.element_type}")
+            value_type_code = 0
+            if spec.element_type == ElementType.PROPERTY:
+                if spec.value_type not in value_types:
+                    value_types.append(spec.value_type)
+                value_type_code = value_types.index(spec.value_type)
+            nodes.append(SpecNode(index, parents[index], depths[index], ends[index],
+                                  ELEMENT_TYPES.index(spec.element_type), value_type_code, paths[index],
+                                  spec.id_short, spec.value_type, spec.unit, spec.description,
+                                  spec.semantic_id_suffix, spec.minimum, spec.maximum))
+
+        set_attribute = super().__setattr__
+        set_attribute("nodes", tuple(nodes))
+        set_attribute("sources", tuple(sources))
+        set_attribute("value_types", tuple(value_types))
+        set_attribute("parents", tuple(parents))
+        set_attribute("depths", tuple(depths))
+        set_attribute("type_codes", bytes(node.type_code for node in nodes))
+        set_attribute("value_type_codes", bytes(node.value_type_code for node in nodes))
+        set_attribute("paths", tuple(paths))
+        set_attribute("_indexes", MappingProxyType({path: index for index, path in enumerate(paths)}))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self) -> Iterator[SpecNode]:
+        return iter(self.nodes)
+
+    def __getitem__(self, path: str) -> SpecNode:
+        """The node at a dotted idShort path."""
+        return self.nodes[self._indexes[path]]
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._indexes
+
+    def children(self, index: int = -1) -> Iterator[SpecNode]:
+        """Direct children of node ``index``; the top-level elements for ``-1``."""
+        position, end = (0, len(self.nodes)) if index < 0 else (index + 1, self.nodes[index].end)
+        while position < end:
+            yield self.nodes[position]
+            position = self.nodes[position].end
+
+    def to_specification(self) -> Dict[str, ElementSpec]:
+        """Rebuild the nested ``ElementSpec`` tree from the table."""
+        specs: List[ElementSpec] = []
+        roots: Dict[str, ElementSpec] = {}
+        for node in self.nodes:
+            spec = ElementSpec(node.id_short, node.element_type, node.value_type, node.unit, node.description,
+                               None, node.semantic_id_suffix, node.minimum, node.maximum)
+            specs.append(spec)
+            if node.parent < 0:
+                roots[node.id_short] = spec
+            else:
+                parent = specs[node.parent]
+                if parent.children is None:
+                    parent.children = {}
+                parent.children[node.id_short] = spec
+        return roots
+
+
+def compile_specification(specification: Optional[Dict[str, ElementSpec]] = None) -> CompiledSpecification:
+    """The compiled form of a specification, built once per specification object."""
+    return _derive_from_spec("compiled", specification, CompiledSpecification)
+
+
+# ============================================================================
+# STATISTICS
+# ============================================================================
+
+# Element type names as used by basyx/AAS modelType
+_SPEC_TYPE_NAMES = {
+    ElementType.PROPERTY: "Property",
+    ElementType.COLLECTION: "SubmodelElementCollection",
+}
+
+
+def _make_statistics(type_counts: Dict[str, int], unit_counts: Dict[str, int], max_depth: int) -> Dict[str, Any]:
+    return {
+        "total_collections": type_counts.get("SubmodelElementCollection", 0),
+        "total_properties": type_counts.get("Property", 0),
+        "max_depth": max_depth,
+        "by_type": {name: count for name, count in sorted(type_counts.items()) if count},
+        "by_unit": {unit: count for unit, count in sorted(unit_counts.items()) if count},
+    }
+
+
+def _compute_specification_statistics(specification: Dict[str, ElementSpec]) -> Dict[str, Any]:
+    type_counts: Counter = Counter()
+    unit_counts: Counter = Counter()
+    max_depth = 0
+    for node in compile_specification(specification):
+        type_counts[_SPEC_TYPE_NAMES[node.element_type]] += 1
+        if node.unit:
+            unit_counts[node.unit] += 1
+        # The elements of a collection are one level further down, even if it has none
+        max_depth = max(max_depth, node.depth + (node.type_code == COLLECTION_CODE))
+    return _make_statistics(type_counts, unit_counts, max_depth)
+
+
+def specification_statistics(specification: Optional[Dict[str, ElementSpec]] = None) -> Dict[str, Any]:
+    """Statistics of the submodel a specification produces, computed once per specification.
+
+    Same keys as :meth:`PBFLBMSubmodelBuilder.get_statistics`. The result is cached and
+    must not be modified.
+    """
+    return _derive_from_spec("statistics", specification, _compute_specification_statistics)
+
+
+# ============================================================================
+# OBJECT MODEL (am_model.py)
+# ============================================================================
+
+# Names served from am_model, importing it (and basyx) on first access
+_MODEL_NAMES = frozenset({
+    "SemanticCache", "SEMANTIC_CACHE", "SubmodelPathIndex", "TrackedProperty", "ChangeListener",
+    "SubmodelChangeTracker", "SubmodelHasher", "PBFLBMSubmodelBuilder",
+})
+
+
+def __getattr__(name: str) -> Any:
+    if name in _MODEL_NAMES:
+        import am_model
+        return getattr(am_model, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _open_output(path: str):
+    """Open the output file for writing; ``-`` writes to stdout."""
+    if path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    return open(path, "w", encoding="utf-8")
 
 
 def main() -> None:
+    # "am_machine.py query ..." searches a fleet; see am_query.py
+    if sys.argv[1:2] == ["query"]:
+        from am_query import main as query_main
+        query_main(sys.argv[2:])
+        return
+    # "am_machine.py validate ..." checks an inventory; see am_validate.py
+    if sys.argv[1:2] == ["validate"]:
+        from am_validate import main as validate_main
+        validate_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Generate the PBF-LB/M Machine Submodel as JSON using maintainable variable definitions"
     )
     parser.add_argument(
         "-o", "--output",
-        help="Write JSON output to this file",
+        help="Write JSON output to this file ('-' for stdout)",
         default="pbf_lbm_submodel.json"
     )
     parser.add_argument(
@@ -600,43 +953,233 @@ def main() -> None:
         action="store_true",
         help="Show statistics about the generated submodel"
     )
+    parser.add_argument(
+        "--exposure-units",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of exposure units (lasers) of the machine; --inventory takes it from Info.exposure_unit_count"
+    )
+    parser.add_argument(
+        "--inventory",
+        help="Machine inventory (CSV or JSONL); builds one AAS/Submodel per machine"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes for --inventory (default: all cores)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["jsonl", "json"],
+        default="jsonl",
+        help="Output format for --inventory: JSON Lines per machine or one streamed JSON document"
+    )
+    parser.add_argument(
+        "--direct",
+        action="store_true",
+        help="Emit JSON straight from the specification, bypassing the basyx object model"
+    )
+    parser.add_argument(
+        "--upload",
+        metavar="URL",
+        help="Upload (upsert) the AAS and submodels to the AAS repository at URL instead of writing a file"
+    )
+    parser.add_argument(
+        "--store",
+        metavar="PATH",
+        help="Write the AAS and submodels into this fleet store (SQLite) instead of a file"
+    )
+    parser.add_argument(
+        "--deduplicate",
+        action="store_true",
+        help="With --store, keep identical PLC, MCSW and exposure unit collections once and report the savings"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of concurrent uploads for --upload"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Record per-phase timings and counters into PATH (JSON for .json, otherwise Prometheus text)"
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also record the peak memory of every phase (tracemalloc, slow)"
+    )
     args = parser.parse_args()
 
+    instrumentation = None
+    if args.profile:
+        from am_profile import Instrumentation
+        instrumentation = Instrumentation(trace_memory=args.profile_memory)
+
+    if args.inventory:
+        run_fleet(args, instrumentation)
+    else:
+        run_machine(args, instrumentation)
+
+    if instrumentation is not None:
+        instrumentation.close()
+        instrumentation.write(args.profile)
+        log = sys.stderr if args.output == "-" else sys.stdout
+        print(f"✓ Profile written to: {args.profile}", file=log)
+
+
+def _phases(instrumentation) -> Callable[[str], Any]:
+    """``phase(name)`` of the instrumentation, or a no-op context when not profiling."""
+    if instrumentation is None:
+        return lambda name: contextlib.nullcontext()
+    return instrumentation.phase
+
+
+def _counted(stream: Any, instrumentation) -> Any:
+    """Count the bytes written to ``stream`` when profiling."""
+    if instrumentation is None:
+        return stream
+    from am_profile import CountingStream
+    return CountingStream(stream, instrumentation)
+
+
+def run_machine(args: argparse.Namespace, instrumentation=None) -> None:
+    """Single machine: build the AAS and Submodel and write, store or upload them."""
+    phase = _phases(instrumentation)
+
+    # Keep stdout clean for the document when streaming to it
+    log = sys.stderr if args.output == "-" else sys.stdout
+
     try:
-        # Build submodel using maintainable variable definitions
-        builder = PBFLBMSubmodelBuilder()
-        aas, submodel = builder.build_aas_and_submodel()
-        
-        print("✓ PBF-LB/M Machine Submodel created successfully using maintainable definitions!")
+        from am_json import EnvironmentJSONWriter
+        # The specification must come from the imported module, whose ElementType the other modules use
+        # (run as a script, this file is __main__)
+        from am_machine import machine_specification, specification_statistics
+        specification = machine_specification(args.exposure_units)
+
+        # Build submodel using maintainable variable definitions (--direct never imports basyx)
+        if args.direct:
+            from am_json import SubmodelJSONEmitter
+            with phase("emit"):
+                pair = SubmodelJSONEmitter(specification=specification).emit_pair()
+            print("✓ PBF-LB/M Machine Submodel emitted directly from the specification!", file=log)
+        else:
+            from am_model import PBFLBMSubmodelBuilder
+            with phase("build"):
+                builder = PBFLBMSubmodelBuilder(specification=specification, instrumentation=instrumentation)
+                aas, submodel = builder.build_aas_and_submodel()
+            print("✓ PBF-LB/M Machine Submodel created successfully using maintainable definitions!", file=log)
         
-        # Show statistics if requested
+        # Show statistics if requested (taken from the specification, no walk needed)
         if args.stats:
-            stats = builder.get_statistics(submodel)
-            print(f"✓ Statistics:")
-            print(f"  - Total Collections: {stats['total_collections']}")
-            print(f"  - Total Properties: {stats['total_properties']}")
-            print(f"  - Maximum Depth: {stats['max_depth']}")
-        
-        # Create object store for proper serialization
-        object_store = model.DictObjectStore()
-        object_store.add(aas)
-        object_store.add(submodel)
-        
-        # Serialize to JSON
-        json_data = aas_json.object_store_to_json(object_store)
-        
-        if args.pretty:
-            json_string = json.dumps(json_data, indent=2, ensure_ascii=False)
-        else:
-            json_string = json.dumps(json_data, ensure_ascii=False)
-
-        # Write output
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(json_string)
-        print(f"✓ JSON output written to: {args.output}")
+            stats = specification_statistics(specification)
+            print(f"✓ Statistics:", file=log)
+            print(f"  - Total Collections: {stats['total_collections']}", file=log)
+            print(f"  - Total Properties: {stats['total_properties']}", file=log)
+            print(f"  - Maximum Depth: {stats['max_depth']}", file=log)
+            units = ", ".join(f"{unit}: {count}" for unit, count in stats["by_unit"].items())
+            print(f"  - Properties per Unit: {units}", file=log)
+
+        if args.store:
+            from am_store import FleetStore
+            with phase("store"), FleetStore(args.store, deduplicate=args.deduplicate) as store:
+                if args.direct:
+                    store.put(*pair)
+                else:
+                    store.put_objects(aas, submodel)
+            print(f"✓ Machine written to fleet store: {args.store}", file=log)
+            return
+
+        if not args.direct:
+            from basyx.aas.adapter import json as aas_json
+            with phase("json"):
+                pair = (json.dumps(aas, cls=aas_json.AASToJsonEncoder),
+                        json.dumps(submodel, cls=aas_json.AASToJsonEncoder))
+
+        if args.upload:
+            import asyncio
+            from am_upload import upload_machine
+            with phase("upload"):
+                created = asyncio.run(upload_machine(args.upload, *pair, concurrency=args.concurrency))
+            print(f"✓ Machine {'created' if created else 'updated'} in: {args.upload}", file=log)
+            return
+
+        # Stream the document as JSON string, one AAS/Submodel pair at a time
+        with phase("write"), _open_output(args.output) as f:
+            with EnvironmentJSONWriter(_counted(f, instrumentation), indent=2 if args.pretty else None,
+                                       as_string_literal=True) as writer:
+                writer.write_pair(*pair)
+        print(f"✓ JSON output written to: {args.output}", file=log)
             
     except Exception as e:
-        print(f"✗ Error creating submodel: {e}")
+        print(f"✗ Error creating submodel: {e}", file=log)
+        raise
+
+
+def _print_progress(done: int, total: int) -> None:
+    if done == total or done % 100 == 0:
+        print(f"  - Built {done}/{total} machines", file=sys.stderr)
+
+
+def run_fleet(args: argparse.Namespace, instrumentation=None) -> None:
+    """Batch mode: build every machine of an inventory in parallel and stream the results.
+
+    Machines are built in worker processes, so a profile only has the phases
+    of the whole run (``inventory``, ``fleet``) and the bytes written.
+    """
+    import am_fleet
+    phase = _phases(instrumentation)
+
+    log = sys.stderr if args.output == "-" else sys.stdout
+
+    try:
+        with phase("inventory"):
+            rows = am_fleet.coerce_inventory(am_fleet.read_inventory(args.inventory))
+        print(f"✓ Loaded and validated {len(rows)} machines from: {args.inventory}", file=log)
+
+        if args.upload:
+            import asyncio
+            from am_upload import upload_fleet
+            with phase("fleet"):
+                counts = asyncio.run(upload_fleet(rows, args.upload, concurrency=args.concurrency,
+                                                  workers=args.workers, direct=args.direct,
+                                                  progress=_print_progress))
+            print(f"✓ {counts['created']} machines created, {counts['updated']} updated in: {args.upload}", file=log)
+            return
+
+        if args.store:
+            from am_store import FleetStore, store_fleet
+            with phase("fleet"), FleetStore(args.store, deduplicate=args.deduplicate) as store:
+                count = store_fleet(rows, store, workers=args.workers, direct=args.direct, progress=_print_progress)
+                savings = store.deduplication() if args.deduplicate else None
+            if instrumentation is not None:
+                instrumentation.count("machines_built", count)
+            print(f"✓ {count} machines written to fleet store: {args.store}", file=log)
+            if savings is not None:
+                print(f"  - Shared collections: {savings['distinct_collections']} distinct for "
+                      f"{savings['collection_references']} references", file=log)
+                print(f"  - Dedup ratio: {savings['dedup_ratio']:.2f}x, {savings['bytes_saved']:,} of "
+                      f"{savings['document_bytes']:,} bytes saved", file=log)
+            return
+
+        with phase("fleet"), _open_output(args.output) as output:
+            f = _counted(output, instrumentation)
+            if args.format == "json":
+                # Same file format as a single machine: the environment as JSON string
+                count = am_fleet.write_fleet(rows, f, format="json", as_string_literal=True, ensure_ascii=True,
+                                             workers=args.workers, direct=args.direct, progress=_print_progress)
+            else:
+                count = am_fleet.write_fleet(rows, f, workers=args.workers, direct=args.direct,
+                                             progress=_print_progress)
+        if instrumentation is not None:
+            instrumentation.count("machines_built", count)
+        print(f"✓ {count} machine submodels written to: {args.output}", file=log)
+
+    except Exception as e:
+        print(f"✗ Error creating fleet submodels: {e}", file=log)
         raise
 
 
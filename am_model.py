@@ -0,0 +1,710 @@
+import copy
+import hashlib
+import json
+import sys
+from collections import Counter
+from collections.abc import Mapping
+from enum import Enum
+from typing import Dict, Any, Union, List, Optional, Tuple, Iterator, Callable
+
+from basyx.aas import model
+from basyx.aas.adapter.json import AASToJsonEncoder
+
+from am_profile import Instrumentation, NO_PHASE
+from am_machine import (
+    ElementSpec, CompiledSpecification, MACHINE_SPECIFICATION, PROPERTY_CODE, ValueCoercionError,
+    coerce_values, compile_specification, specification_statistics, xsd_type_name, _make_statistics, _COERCERS
+)
+
+
+# ============================================================================
+# INTERNED SEMANTIC OBJECTS
+# ============================================================================
+
+class _FrozenMultiLanguageTextType(model.MultiLanguageTextType):
+    """Read-only description shared by every submodel element that uses it."""
+
+    def __setitem__(self, key, value):
+        raise TypeError("Interned descriptions are read-only; assign a new MultiLanguageTextType instead")
+
+    def __delitem__(self, key):
+        raise TypeError("Interned descriptions are read-only; assign a new MultiLanguageTextType instead")
+
+
+class _FrozenQualifier(model.Qualifier):
+    """Read-only qualifier shared by every property that uses it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("Interned qualifiers are read-only")
+        super().__setattr__(name, value)
+
+
+def _deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate the memory held by an object graph in bytes (types and classes excluded)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, (type, Enum)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
+
+
+class SemanticCache:
+    """Shared, interned semantic references, descriptions and unit qualifiers.
+
+    Entries are immutable and keyed by URI, description text and unit, so any
+    number of submodels can point to a single copy. ``lookups``/``hits`` and the
+    byte counters report how much memory the sharing saves.
+    """
+
+    def __init__(self):
+        self._references: Dict[str, model.ExternalReference] = {}
+        self._descriptions: Dict[tuple, model.MultiLanguageTextType] = {}
+        self._qualifiers: Dict[str, model.Qualifier] = {}
+        self._sizes: Dict[int, int] = {}
+        self.lookups = 0
+        self.hits = 0
+        self.interned_bytes = 0
+        self.saved_bytes = 0
+
+    def _intern(self, entries: Dict[Any, Any], key: Any, factory) -> Any:
+        self.lookups += 1
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = factory()
+            size = self._sizes[id(entry)] = _deep_sizeof(entry)
+            self.interned_bytes += size
+        else:
+            self.hits += 1
+            self.saved_bytes += self._sizes[id(entry)]
+        return entry
+
+    def reference(self, uri: str) -> model.ExternalReference:
+        """Get the global semantic reference for ``uri``."""
+        return self._intern(self._references, uri, lambda: model.ExternalReference(
+            (model.Key(type_=model.KeyTypes.GLOBAL_REFERENCE, value=uri),)
+        ))
+
+    def description(self, text: str, language: str = "en") -> model.MultiLanguageTextType:
+        """Get the read-only description ``text`` in ``language``."""
+        return self._intern(self._descriptions, (language, text),
+                            lambda: _FrozenMultiLanguageTextType({language: text}))
+
+    def unit_qualifier(self, unit: str) -> model.Qualifier:
+        """Get the read-only ``unit`` qualifier for ``unit``."""
+        return self._intern(self._qualifiers, unit, lambda: _FrozenQualifier(
+            type_="unit", value=unit, value_type=model.datatypes.String
+        ))
+
+    def record_hits(self, count: int, nbytes: int) -> None:
+        """Account for ``count`` reuses of interned entries totalling ``nbytes`` (e.g. by template clones)."""
+        self.lookups += count
+        self.hits += count
+        self.saved_bytes += nbytes
+
+    def statistics(self) -> Dict[str, int]:
+        """Get entry counts and memory counters of the cache."""
+        return {
+            "references": len(self._references),
+            "descriptions": len(self._descriptions),
+            "qualifiers": len(self._qualifiers),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "interned_bytes": self.interned_bytes,
+            "saved_bytes": self.saved_bytes,
+        }
+
+
+# Default cache shared by all builders of a process
+SEMANTIC_CACHE = SemanticCache()
+
+
+# ============================================================================
+# PATH INDEX
+# ============================================================================
+
+def _model_type_name(element: model.SubmodelElement) -> str:
+    """AAS model type of ``element`` (``Property`` for a :class:`TrackedProperty` too)."""
+    for cls in type(element).__mro__:
+        if cls.__module__.startswith("basyx.aas.model"):
+            return cls.__name__
+    return type(element).__name__
+
+
+def _element_unit(element: model.SubmodelElement) -> Optional[str]:
+    for qualifier in element.qualifier:
+        if qualifier.type == "unit":
+            return qualifier.value
+    return None
+
+
+class SubmodelPathIndex(Mapping):
+    """Constant-time lookup of submodel elements by dotted idShort path.
+
+    Maps paths such as ``Info.build_volume.x_dimension`` to the element objects of
+    one submodel. The index hooks into the namespace sets of the submodel and of
+    every collection, so elements added to or removed from the submodel (including
+    whole subtrees) are reflected immediately. Renaming an element in place is not
+    tracked.
+
+    The same hooks keep element counts per type, per unit and per nesting depth up
+    to date, so :meth:`statistics` never walks the submodel.
+    """
+
+    def __init__(self, submodel: model.Submodel):
+        self.submodel = submodel
+        self._elements: Dict[str, model.SubmodelElement] = {}
+        self._type_counts: Counter = Counter()
+        self._unit_counts: Counter = Counter()
+        self._depth_counts: Counter = Counter()  # number of element lists per nesting depth
+        self._attach(submodel.submodel_element, "", 0)
+
+    def _attach(self, namespace: model.NamespaceSet, prefix: str, depth: int) -> None:
+        add_hook, del_hook = namespace._item_add_hook, namespace._item_id_del_hook
+
+        def on_add(element, existing):
+            if add_hook is not None:
+                add_hook(element, existing)
+            self._index(element, prefix, depth)
+
+        def on_remove(element):
+            if del_hook is not None:
+                del_hook(element)
+            self._unindex(element, prefix, depth)
+
+        namespace._item_add_hook = on_add
+        namespace._item_id_del_hook = on_remove
+        self._depth_counts[depth] += 1
+        for element in namespace:
+            self._index(element, prefix, depth)
+
+    def _count(self, element: model.SubmodelElement, delta: int) -> None:
+        self._type_counts[_model_type_name(element)] += delta
+        unit = _element_unit(element)
+        if unit is not None:
+            self._unit_counts[unit] += delta
+
+    def _index(self, element: model.SubmodelElement, prefix: str, depth: int) -> None:
+        path = prefix + element.id_short
+        self._elements[path] = element
+        self._count(element, 1)
+        if isinstance(element, model.SubmodelElementCollection):
+            self._attach(element.value, path + ".", depth + 1)
+
+    def _unindex(self, element: model.SubmodelElement, prefix: str, depth: int) -> None:
+        path = prefix + element.id_short
+        if self._elements.get(path) is not element:
+            return
+        del self._elements[path]
+        self._count(element, -1)
+        if isinstance(element, model.SubmodelElementCollection):
+            self._depth_counts[depth + 1] -= 1
+            for child in element.value:
+                self._unindex(child, path + ".", depth + 1)
+
+    def __getitem__(self, path: str) -> model.SubmodelElement:
+        return self._elements[path]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._elements)
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def statistics(self) -> Dict[str, Any]:
+        """Current statistics of the indexed submodel (same keys as ``get_statistics``)."""
+        max_depth = max((depth for depth, lists in self._depth_counts.items() if lists > 0), default=0)
+        return _make_statistics(self._type_counts, self._unit_counts, max_depth)
+
+    def get_value(self, path: str) -> Any:
+        """Read the value of the property at ``path``."""
+        return self._elements[path].value
+
+    def set_value(self, path: str, value: Any) -> None:
+        """Coerce ``value`` to the property's value type and assign it."""
+        element = self._elements[path]
+        if not isinstance(element, model.Property):
+            raise ValueError(f"Path does not address a property: {path}")
+        element.value = None if value is None else _COERCERS[element.value_type](value)
+
+
+# ============================================================================
+# CHANGE TRACKING
+# ============================================================================
+
+class TrackedProperty(model.Property):
+    """Property that reports every value write to its :class:`SubmodelChangeTracker`."""
+
+    _tracker: Optional["SubmodelChangeTracker"] = None
+
+    def _set_value(self, value) -> None:
+        model.Property.value.fset(self, value)
+        if self._tracker is not None:
+            self._tracker.notify(self)
+
+    value = property(model.Property.value.fget, _set_value)
+
+
+ChangeListener = Callable[[Any], None]
+
+
+class SubmodelChangeTracker:
+    """Report value writes and structural changes of a submodel to listeners.
+
+    Properties of the submodel are switched to :class:`TrackedProperty` (which
+    serializes exactly like a plain ``Property``), and the namespace sets of the
+    submodel and its collections get add/remove hooks. Listeners are called with
+    the element that changed: the property on value writes, the owning
+    collection or submodel when children are added or removed. Callers
+    propagate from there through ``element.parent``.
+    """
+
+    def __init__(self, submodel: model.Submodel):
+        self.submodel = submodel
+        self.version = 0
+        self._listeners: List[ChangeListener] = []
+        self._attach(submodel.submodel_element)
+
+    def _attach(self, namespace: model.NamespaceSet) -> None:
+        add_hook, del_hook = namespace._item_add_hook, namespace._item_id_del_hook
+        owner = namespace.parent
+
+        def on_add(element, existing):
+            if add_hook is not None:
+                add_hook(element, existing)
+            self._track(element)
+            self.notify(owner)
+
+        def on_remove(element):
+            if del_hook is not None:
+                del_hook(element)
+            self._untrack(element)
+            self.notify(owner)
+
+        namespace._item_add_hook = on_add
+        namespace._item_id_del_hook = on_remove
+        for element in namespace:
+            self._track(element)
+
+    def _track(self, element: model.SubmodelElement) -> None:
+        if type(element) is model.Property:
+            element.__class__ = TrackedProperty
+        if isinstance(element, TrackedProperty):
+            element._tracker = self
+        elif isinstance(element, model.SubmodelElementCollection):
+            self._attach(element.value)
+
+    def _untrack(self, element: model.SubmodelElement) -> None:
+        if isinstance(element, TrackedProperty) and element._tracker is self:
+            element._tracker = None
+        elif isinstance(element, model.SubmodelElementCollection):
+            for child in element.value:
+                self._untrack(child)
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Call ``listener(element)`` for every change."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: ChangeListener) -> None:
+        self._listeners.remove(listener)
+
+    def notify(self, element: Any) -> None:
+        """Report a change of ``element`` (a property, collection or the submodel)."""
+        self.version += 1
+        for listener in self._listeners:
+            listener(element)
+
+
+# ============================================================================
+# CONTENT HASHING
+# ============================================================================
+
+# Length prefix standing for "no value", which no real length can take
+_NO_VALUE = b"\xff\xff\xff\xff"
+
+
+def _feed(digest: Any, text: Optional[str]) -> None:
+    """Add one length-prefixed field to a hash, so field boundaries are unambiguous."""
+    if text is None:
+        digest.update(_NO_VALUE)
+        return
+    data = text.encode("utf-8")
+    digest.update(len(data).to_bytes(4, "big"))
+    digest.update(data)
+
+
+def _element_children(element: Any) -> Optional[model.NamespaceSet]:
+    if isinstance(element, model.Submodel):
+        return element.submodel_element
+    if isinstance(element, model.SubmodelElementCollection):
+        return element.value
+    return None
+
+
+class SubmodelHasher:
+    """Merkle content digests of a submodel and of every element in it.
+
+    A property hashes its idShort, semantic ID, unit, value type and value; a
+    collection its idShort and semantic ID plus the digests of its children
+    (ordered by idShort); the submodel the digests of its top-level elements.
+    IDs are left out, so two machines with the same content have the same
+    digest. Other element types hash their JSON.
+
+    Digests are computed on demand and cached. The hasher subscribes to a
+    :class:`SubmodelChangeTracker`, and a change drops only the cached digests
+    of the changed element and its ancestors, so after updating one property
+    the next :meth:`digest` rehashes just that path. :meth:`differences`
+    compares two hashers and descends only into subtrees whose digests differ.
+    """
+
+    DIGEST_SIZE = 16
+
+    def __init__(self, submodel: model.Submodel, tracker: Optional[SubmodelChangeTracker] = None):
+        self.submodel = submodel
+        self.tracker = tracker if tracker is not None else SubmodelChangeTracker(submodel)
+        self.tracker.subscribe(self._invalidate)
+        # Keyed by id(element) and holding the element, so an id is never reused while cached
+        self._digests: Dict[int, Tuple[Any, bytes]] = {}
+        self._prune = False
+        self.rehashed = 0  # elements hashed so far, for checking how much a change costs
+
+    def _invalidate(self, element: Any) -> None:
+        if not isinstance(element, model.Property):
+            self._prune = True  # elements were added or removed; drop their entries on the next digest
+        while element is not None:
+            self._digests.pop(id(element), None)
+            element = element.parent if isinstance(element, model.SubmodelElement) else None
+        self._digests.pop(id(self.submodel), None)
+
+    def digest(self, element: Any = None) -> bytes:
+        """Digest of ``element`` (a submodel element of the submodel), or of the whole submodel."""
+        if self._prune:
+            self._prune = False
+            live: Dict[int, Any] = {}
+            pending = [self.submodel]
+            while pending:
+                current = pending.pop()
+                live[id(current)] = current
+                pending.extend(_element_children(current) or ())
+            self._digests = {key: entry for key, entry in self._digests.items() if live.get(key) is entry[0]}
+        return self._digest(self.submodel if element is None else element)
+
+    def hexdigest(self, element: Any = None) -> str:
+        return self.digest(element).hex()
+
+    def _digest(self, element: Any) -> bytes:
+        cached = self._digests.get(id(element))
+        if cached is not None and cached[0] is element:
+            return cached[1]
+        digest = hashlib.blake2b(digest_size=self.DIGEST_SIZE)
+        children = _element_children(element)
+        if isinstance(element, model.Submodel):
+            digest.update(b"S")
+        else:
+            digest.update(b"P" if isinstance(element, model.Property) else b"C" if children is not None else b"E")
+            _feed(digest, element.id_short)
+            _feed(digest, None if element.semantic_id is None else
+                  "/".join(key.value for key in element.semantic_id.key))
+        if isinstance(element, model.Property):
+            _feed(digest, _element_unit(element))
+            _feed(digest, xsd_type_name(element.value_type))
+            _feed(digest, None if element.value is None else model.datatypes.xsd_repr(element.value))
+        elif children is not None:
+            for child in sorted(children, key=lambda child: child.id_short):
+                digest.update(self._digest(child))
+        else:
+            _feed(digest, json.dumps(element, cls=AASToJsonEncoder, sort_keys=True))
+        result = digest.digest()
+        self._digests[id(element)] = (element, result)
+        self.rehashed += 1
+        return result
+
+    def differences(self, other: "SubmodelHasher") -> List[str]:
+        """Dotted idShort paths that differ from ``other``'s submodel, in pre-order.
+
+        A path is listed if the element is missing on either side or if it is a
+        property (or another non-collection element) with a different digest;
+        collections with equal digests are skipped without looking inside.
+        """
+        paths: List[str] = []
+        # (own namespace, other namespace, path prefix)
+        pending = [(self.submodel.submodel_element, other.submodel.submodel_element, "")]
+        while pending:
+            mine, theirs, prefix = pending.pop()
+            names = sorted({element.id_short for element in mine} | {element.id_short for element in theirs},
+                           reverse=True)
+            for name in names:
+                path = prefix + name
+                try:
+                    element = mine.get_object_by_attribute("id_short", name)
+                    counterpart = theirs.get_object_by_attribute("id_short", name)
+                except KeyError:
+                    paths.append(path)
+                    continue
+                if self.digest(element) == other.digest(counterpart):
+                    continue
+                if isinstance(element, model.SubmodelElementCollection) and \
+                        isinstance(counterpart, model.SubmodelElementCollection):
+                    pending.append((element.value, counterpart.value, path + "."))
+                else:
+                    paths.append(path)
+        return paths
+
+
+# ============================================================================
+# SUBMODEL BUILDER
+# ============================================================================
+
+class PBFLBMSubmodelBuilder:
+    """Robust builder for PBF-LB/M machine submodels."""
+    
+    def __init__(self, base_semantic_uri: str = "https://admin-shell.io/IDTA/PBF-LB-M/1/0",
+                 specification: Optional[Dict[str, ElementSpec]] = None,
+                 cache: Optional[SemanticCache] = None,
+                 instrumentation: Optional[Instrumentation] = None):
+        self.base_semantic_uri = base_semantic_uri
+        self.property_base_uri = "https://acplt.org/Properties"
+        self.specification = specification if specification is not None else MACHINE_SPECIFICATION
+        self.cache = cache if cache is not None else SEMANTIC_CACHE
+        # Opt-in profiling: phase timers and counters per build, see am_profile
+        self.instrumentation = instrumentation
+        self._template: Optional[List[model.SubmodelElement]] = None
+        self._template_shared_count = 0
+        self._template_shared_bytes = 0
+        
+    def _phase(self, name: str):
+        """Timer for a build phase, or a no-op while instrumentation is disabled."""
+        return NO_PHASE if self.instrumentation is None else self.instrumentation.phase(name)
+
+    def _create_semantic_reference(self, suffix: str) -> model.ExternalReference:
+        """Create a semantic reference for an element."""
+        return self.cache.reference(f"{self.base_semantic_uri}/{suffix}")
+
+    def _create_property_semantic_reference(self, property_name: str) -> model.ExternalReference:
+        """Create a semantic reference for a property."""
+        return self.cache.reference(f"{self.property_base_uri}/{property_name}")
+
+    def _create_property(self, spec: ElementSpec) -> model.Property:
+        """Create a property from specification."""
+        prop = model.Property(
+            id_short=spec.id_short,
+            value_type=spec.value_type,
+            value=None,
+            semantic_id=self._create_property_semantic_reference(spec.id_short)
+        )
+        
+        if spec.description:
+            prop.description = self.cache.description(spec.description)
+        
+        if spec.unit:
+            prop.qualifier = {self.cache.unit_qualifier(spec.unit)}
+        
+        return prop
+
+    def _create_collection(self, spec: ElementSpec) -> model.SubmodelElementCollection:
+        """Create a collection from specification."""
+        collection = model.SubmodelElementCollection(id_short=spec.id_short)
+        
+        if spec.description:
+            collection.description = self.cache.description(spec.description)
+        
+        if spec.semantic_id_suffix:
+            collection.semantic_id = self._create_semantic_reference(spec.semantic_id_suffix)
+        
+        return collection
+
+    def _build_elements(self, compiled: CompiledSpecification) -> List[model.SubmodelElement]:
+        """Build the top-level submodel elements of a compiled specification in one pass."""
+        elements: List[model.SubmodelElement] = []
+        for node in compiled.nodes:
+            spec = compiled.sources[node.index]
+            element = self._create_property(spec) if node.type_code == PROPERTY_CODE else self._create_collection(spec)
+            elements.append(element)
+            if node.parent >= 0:
+                elements[node.parent].value.add(element)
+        return [elements[node.index] for node in compiled.children()]
+
+    def _build_submodel_element(self, spec: ElementSpec) -> model.SubmodelElement:
+        """Build one submodel element, with all of its children, from specification."""
+        return self._build_elements(CompiledSpecification({spec.id_short: spec}))[0]
+
+    def compile_template(self) -> List[model.SubmodelElement]:
+        """Build the submodel element tree for the specification once and keep it as template."""
+        if self._template is None:
+            lookups, requested = self.cache.lookups, self.cache.saved_bytes + self.cache.interned_bytes
+            with self._phase("template"):
+                self._template = self._build_elements(compile_specification(self.specification))
+            # Every clone shares the same interned entries the template looked up
+            self._template_shared_count = self.cache.lookups - lookups
+            self._template_shared_bytes = self.cache.saved_bytes + self.cache.interned_bytes - requested
+        return self._template
+
+    # The clone helpers below copy basyx objects without running their constructors.
+    # Templates are validated once when compiled, so per-machine copies only need
+    # fresh containers; the internal attribute layout is that of basyx-python-sdk.
+
+    @staticmethod
+    def _clone_constrained_list(template: model.ConstrainedList) -> model.ConstrainedList:
+        """Copy a constrained list, keeping its hooks."""
+        clone = object.__new__(template.__class__)
+        clone.__dict__.update(template.__dict__)
+        clone._list = list(template._list)
+        return clone
+
+    @staticmethod
+    def _clone_namespace_set(template: model.NamespaceSet, parent: Any,
+                             clones: Dict[int, Any]) -> model.NamespaceSet:
+        """Copy a namespace set for ``parent``, mapping template items to their clones by ``id()``."""
+        clone = object.__new__(model.NamespaceSet)
+        clone.__dict__.update(template.__dict__)
+        clone.parent = parent
+        parent.namespace_element_sets.append(clone)
+        clone._backend = {
+            name: ({key: clones[id(item)] for key, item in backend.items()}, case_sensitive)
+            for name, (backend, case_sensitive) in template._backend.items()
+        }
+        for item in clones.values():
+            item.parent = parent
+        return clone
+
+    def _clone_element(self, template: model.SubmodelElement) -> model.SubmodelElement:
+        """Clone a template element produced by :meth:`_build_submodel_element`.
+
+        Only the mutable containers (namespaces, children) are copied; semantic references,
+        descriptions and unit qualifiers are interned in :class:`SemanticCache` and shared.
+        """
+        clone = object.__new__(template.__class__)
+        clone.__dict__.update(template.__dict__)
+        clone.parent = None
+        clone.namespace_element_sets = []
+
+        if isinstance(template.qualifier, model.NamespaceSet):
+            clone.qualifier = self._clone_namespace_set(
+                template.qualifier, clone, {id(q): copy.copy(q) for q in template.qualifier})
+        else:
+            clone.qualifier = set(template.qualifier)
+        clone.extension = self._clone_namespace_set(
+            template.extension, clone, {id(e): copy.copy(e) for e in template.extension})
+        clone._supplemental_semantic_id = self._clone_constrained_list(template.supplemental_semantic_id)
+        clone.embedded_data_specifications = list(template.embedded_data_specifications)
+
+        if isinstance(template, model.SubmodelElementCollection):
+            clone.value = self._clone_namespace_set(
+                template.value, clone, {id(child): self._clone_element(child) for child in template.value})
+
+        return clone
+
+    def build_aas_and_submodel(self, 
+                              aas_id: str = "https://acplt.org/PBF-LB-M_AAS",
+                              submodel_id: str = "https://acplt.org/PBF-LB-M_Submodel",
+                              with_index: bool = False
+                              ) -> Union[Tuple[model.AssetAdministrationShell, model.Submodel],
+                                         Tuple[model.AssetAdministrationShell, model.Submodel, SubmodelPathIndex]]:
+        """Build complete AAS and Submodel from specification.
+
+        Returns ``(aas, submodel)``, or ``(aas, submodel, index)`` with a
+        :class:`SubmodelPathIndex` over the submodel if ``with_index`` is set.
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            references = len(self.cache._references)
+
+        with self._phase("references"):
+            semantic_id = self._create_semantic_reference("Submodel")
+
+        with self._phase("shell"):
+            # Create Asset Information
+            asset_information = model.AssetInformation(
+                asset_kind=model.AssetKind.INSTANCE,
+                global_asset_id=aas_id,
+            )
+
+            # Create AAS
+            aas = model.AssetAdministrationShell(
+                id_=aas_id,
+                asset_information=asset_information,
+            )
+
+            # Create Submodel
+            submodel = model.Submodel(
+                id_=submodel_id,
+                semantic_id=semantic_id
+            )
+
+        with self._phase("references"):
+            # Add submodel reference to AAS
+            aas.submodel.add(model.ModelReference.from_referable(submodel))
+
+        # Stamp out the submodel elements from the compiled specification template
+        template = self.compile_template()
+        with self._phase("elements"):
+            for element in template:
+                submodel.submodel_element.add(self._clone_element(element))
+        self.cache.record_hits(self._template_shared_count, self._template_shared_bytes)
+
+        if instrumentation is not None:
+            instrumentation.count("machines_built")
+            instrumentation.count("elements_built", len(compile_specification(self.specification)))
+            # The model reference to the submodel plus semantic references interned by this build
+            instrumentation.count("references_allocated", 1 + len(self.cache._references) - references)
+
+        if with_index:
+            with self._phase("index"):
+                index = SubmodelPathIndex(submodel)
+            return aas, submodel, index
+        return aas, submodel
+
+    def set_values(self, submodel: model.Submodel, values: Dict[str, Any]) -> None:
+        """Assign property values addressed by dotted idShort paths (e.g. ``Info.build_volume.x_dimension``).
+
+        All values are coerced first; if any of them is invalid nothing is assigned and a
+        single :class:`ValueCoercionError` lists every problem.
+        """
+        coerced, issues = coerce_values(values, self.specification)
+        if issues:
+            raise ValueCoercionError(issues)
+        for path, value in coerced.items():
+            submodel.get_referable(path.split(".")).value = value
+
+    def get_statistics(self, submodel: Union[model.Submodel, SubmodelPathIndex, None] = None) -> Dict[str, Any]:
+        """Get statistics about the generated submodel.
+
+        Without an argument the statistics are taken from the specification (computed
+        once); for a :class:`SubmodelPathIndex` they are its incrementally maintained
+        counts. Only a plain submodel is walked. Besides the totals, ``by_type`` counts
+        every element type and ``by_unit`` the properties per unit.
+        """
+        if submodel is None:
+            return specification_statistics(self.specification)
+        if isinstance(submodel, SubmodelPathIndex):
+            return submodel.statistics()
+
+        type_counts: Counter = Counter()
+        unit_counts: Counter = Counter()
+        max_depth = 0
+        
+        def count_elements(elements, depth=0):
+            nonlocal max_depth
+            max_depth = max(max_depth, depth)
+            
+            for element in elements:
+                type_counts[_model_type_name(element)] += 1
+                unit = _element_unit(element)
+                if unit is not None:
+                    unit_counts[unit] += 1
+                if isinstance(element, (model.SubmodelElementCollection, model.SubmodelElementList)):
+                    count_elements(element.value, depth + 1)
+        
+        count_elements(submodel.submodel_element)
+        return _make_statistics(type_counts, unit_counts, max_depth)
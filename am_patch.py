@@ -0,0 +1,359 @@
+import argparse
+import json
+import sys
+from typing import Dict, Any, List, Optional, Tuple
+
+from basyx.aas import model
+from basyx.aas.adapter.json import AASToJsonEncoder, AASFromJsonDecoder, object_store_to_json
+
+from am_machine import _COERCERS
+from am_model import SubmodelChangeTracker, SubmodelHasher
+
+
+# ============================================================================
+# JSON PATCH (RFC 6902) BETWEEN SUBMODEL SNAPSHOTS
+# ============================================================================
+#
+# Patches address elements by their idShort path written as a JSON Pointer
+# (RFC 6901), e.g. ``/Info/build_volume/x_dimension``. A ``replace`` of a
+# property carries its new value; ``add`` and ``replace`` of anything else carry
+# the element as basyx JSON.
+
+PatchOperation = Dict[str, Any]
+
+
+class PatchError(ValueError):
+    """Raised when a patch operation cannot be applied to a submodel."""
+
+
+def _escape(id_short: str) -> str:
+    return id_short.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def element_pointer(element: model.SubmodelElement, submodel: Optional[model.Submodel] = None) -> Optional[str]:
+    """JSON Pointer of ``element`` by idShort path, or ``None`` if it is not part of ``submodel``."""
+    tokens = []
+    while isinstance(element, model.SubmodelElement):
+        tokens.append(_escape(element.id_short))
+        element = element.parent
+    if element is None or (submodel is not None and element is not submodel):
+        return None
+    return "/" + "/".join(reversed(tokens))
+
+
+def _element_json(element: model.SubmodelElement) -> Dict[str, Any]:
+    return json.loads(json.dumps(element, cls=AASToJsonEncoder))
+
+
+def _value_json(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return model.datatypes.xsd_repr(value)
+
+
+def _value_from_json(prop: model.Property, value: Any) -> Any:
+    if value is None:
+        return None
+    coerce = _COERCERS.get(prop.value_type)
+    if coerce is not None:
+        return coerce(value)
+    return model.datatypes.from_xsd(value, prop.value_type) if isinstance(value, str) else prop.value_type(value)
+
+
+def _children(element: Any) -> Optional[model.NamespaceSet]:
+    if isinstance(element, model.Submodel):
+        return element.submodel_element
+    if isinstance(element, model.SubmodelElementCollection):
+        return element.value
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+
+# Content hashers of the old and new snapshot, if the caller has them
+_Hashers = Optional[Tuple[SubmodelHasher, SubmodelHasher]]
+
+
+def _diff_namespace(old: model.NamespaceSet, new: model.NamespaceSet, prefix: str,
+                    patch: List[PatchOperation], hashers: _Hashers = None) -> None:
+    for element in old:
+        if new.contains_id("id_short", element.id_short):
+            continue
+        patch.append({"op": "remove", "path": prefix + _escape(element.id_short)})
+
+    for element in new:
+        path = prefix + _escape(element.id_short)
+        try:
+            previous = old.get_object_by_attribute("id_short", element.id_short)
+        except KeyError:
+            patch.append({"op": "add", "path": path, "value": _element_json(element)})
+            continue
+        _diff_element(previous, element, path, patch, hashers)
+
+
+def _diff_element(old: model.SubmodelElement, new: model.SubmodelElement, path: str,
+                  patch: List[PatchOperation], hashers: _Hashers = None) -> None:
+    if hashers is not None and hashers[0].digest(old) == hashers[1].digest(new):
+        return
+    if isinstance(new, model.Property) and isinstance(old, model.Property) and old.value_type is new.value_type:
+        if old.value != new.value:
+            patch.append({"op": "replace", "path": path, "value": _value_json(new.value)})
+    elif isinstance(new, model.SubmodelElementCollection) and type(old) is type(new):
+        _diff_namespace(old.value, new.value, path + "/", patch, hashers)
+    else:
+        # Anything else is compared, and replaced, as a whole
+        new_json = _element_json(new)
+        if _element_json(old) != new_json:
+            patch.append({"op": "replace", "path": path, "value": new_json})
+
+
+def diff_submodels(old: model.Submodel, new: model.Submodel, old_hashes: Optional[SubmodelHasher] = None,
+                   new_hashes: Optional[SubmodelHasher] = None) -> List[PatchOperation]:
+    """JSON Patch that turns snapshot ``old`` into snapshot ``new`` of the same machine's submodel.
+
+    Elements are matched by idShort; changed property values become ``replace``
+    operations, elements present in only one snapshot ``remove``/``add``
+    operations. Descriptions and semantic IDs of matching collections are not
+    compared, as both snapshots come from the same specification.
+
+    With a :class:`am_model.SubmodelHasher` for each snapshot, subtrees whose
+    content digests are equal are skipped without descending into them.
+    """
+    patch: List[PatchOperation] = []
+    hashers = (old_hashes, new_hashes) if old_hashes is not None and new_hashes is not None else None
+    if hashers is not None and old_hashes.digest() == new_hashes.digest():
+        return patch
+    _diff_namespace(old.submodel_element, new.submodel_element, "/", patch, hashers)
+    return patch
+
+
+# ---------------------------------------------------------------------------
+# Recording changes as they happen
+# ---------------------------------------------------------------------------
+
+class SubmodelPatchRecorder:
+    """Record the changes of a live submodel and hand them out as JSON Patches.
+
+    Subscribes to a :class:`SubmodelChangeTracker` and only remembers which
+    elements changed, so :meth:`patch` costs time in the number of changes since
+    the previous patch, not in the size of the submodel. Writing a property back
+    to the value of the previous snapshot yields no operation.
+    """
+
+    def __init__(self, submodel: model.Submodel, tracker: Optional[SubmodelChangeTracker] = None):
+        self.submodel = submodel
+        self.tracker = tracker if tracker is not None else SubmodelChangeTracker(submodel)
+        # Snapshot state as of the previous patch, keyed by id(element) and
+        # holding the element so the id stays unique
+        self._values: Dict[int, Any] = {}
+        self._members: Dict[int, Any] = {}
+        self._dirty: Dict[int, Any] = {}
+        self._snapshot(submodel)
+        self.tracker.subscribe(self._record)
+
+    def _snapshot(self, element: Any) -> None:
+        children = _children(element)
+        if children is not None:
+            self._members[id(element)] = (element, {child.id_short: child for child in children})
+            for child in children:
+                self._snapshot(child)
+        elif isinstance(element, model.Property):
+            self._values[id(element)] = (element, element.value)
+
+    def _forget(self, element: Any) -> None:
+        self._values.pop(id(element), None)
+        entry = self._members.pop(id(element), None)
+        if entry is not None:
+            for child in entry[1].values():
+                self._forget(child)
+
+    def _record(self, element: Any) -> None:
+        self._dirty[id(element)] = element
+
+    def patch(self) -> List[PatchOperation]:
+        """Operations for all changes since the previous call (or since construction)."""
+        dirty, self._dirty = self._dirty, {}
+        patch: List[PatchOperation] = []
+        added = set()
+
+        for element in dirty.values():
+            children = _children(element)
+            if children is None or (element is not self.submodel and element_pointer(element, self.submodel) is None):
+                continue
+            entry = self._members.get(id(element))
+            if entry is None:
+                continue  # added in this round, already part of an "add"
+            prefix = "/" if element is self.submodel else element_pointer(element) + "/"
+            old = entry[1]
+            current = {child.id_short: child for child in children}
+            for id_short, child in old.items():
+                if current.get(id_short) is not child:
+                    self._forget(child)
+                    if id_short not in current:
+                        patch.append({"op": "remove", "path": prefix + _escape(id_short)})
+            for id_short, child in current.items():
+                if old.get(id_short) is not child:
+                    op = "replace" if id_short in old else "add"
+                    patch.append({"op": op, "path": prefix + _escape(id_short), "value": _element_json(child)})
+                    self._snapshot(child)
+                    added.add(id(child))
+            self._members[id(element)] = (element, current)
+
+        for element in dirty.values():
+            entry = self._values.get(id(element))
+            if entry is None or entry[0] is not element or entry[1] == element.value:
+                continue
+            ancestor = element
+            while isinstance(ancestor, model.SubmodelElement) and id(ancestor) not in added:
+                ancestor = ancestor.parent
+            if ancestor is not self.submodel:
+                continue  # detached, or already contained in an "add"
+            patch.append({"op": "replace", "path": element_pointer(element), "value": _value_json(element.value)})
+            self._values[id(element)] = (element, element.value)
+        return patch
+
+
+# ---------------------------------------------------------------------------
+# Apply
+# ---------------------------------------------------------------------------
+
+def _element_from_json(value: Dict[str, Any]) -> model.SubmodelElement:
+    element = json.loads(json.dumps(value), cls=AASFromJsonDecoder)
+    if not isinstance(element, model.SubmodelElement):
+        raise PatchError(f"Patch value is not a submodel element: {value!r}")
+    return element
+
+
+def _resolve(submodel: model.Submodel, path: str):
+    """Return (namespace, id_short) addressed by a pointer."""
+    if not path.startswith("/") or path == "/":
+        raise PatchError(f"Invalid element path: {path!r}")
+    *parents, id_short = [_unescape(token) for token in path[1:].split("/")]
+    container: Any = submodel
+    for token in parents:
+        namespace = _children(container)
+        try:
+            container = namespace.get_object_by_attribute("id_short", token) if namespace is not None else None
+        except KeyError:
+            container = None
+        if container is None:
+            raise PatchError(f"Path does not exist: {path}")
+    namespace = _children(container)
+    if namespace is None:
+        raise PatchError(f"Parent of {path} does not hold submodel elements")
+    return namespace, id_short
+
+
+def _apply_operation(submodel: model.Submodel, operation: PatchOperation) -> None:
+    op, path = operation.get("op"), operation.get("path", "")
+    namespace, id_short = _resolve(submodel, path)
+    try:
+        target = namespace.get_object_by_attribute("id_short", id_short)
+    except KeyError:
+        target = None
+
+    replaces_element = op == "replace" and (not isinstance(target, model.Property)
+                                            or isinstance(operation.get("value"), dict))
+    if op == "add" or replaces_element:
+        if op == "replace" and target is None:
+            raise PatchError(f"Path does not exist: {path}")
+        element = _element_from_json(operation["value"])
+        if element.id_short != id_short:
+            raise PatchError(f"idShort {element.id_short!r} does not match path {path}")
+        if target is not None:
+            namespace.remove(target)
+        namespace.add(element)
+    elif target is None:
+        raise PatchError(f"Path does not exist: {path}")
+    elif op == "remove":
+        namespace.remove(target)
+    elif op == "replace":
+        try:
+            target.value = _value_from_json(target, operation["value"])
+        except ValueError as e:
+            raise PatchError(f"Invalid value for {path}: {e}") from e
+    elif op == "test":
+        expected = operation["value"]
+        actual = _value_json(target.value) if isinstance(target, model.Property) else _element_json(target)
+        if actual != expected:
+            raise PatchError(f"Test failed for {path}: {actual!r} != {expected!r}")
+    else:
+        raise PatchError(f"Unsupported patch operation: {op!r}")
+
+
+def apply_patch(submodel: model.Submodel, patch: List[PatchOperation]) -> model.Submodel:
+    """Apply a JSON Patch produced by :func:`diff_submodels` or :class:`SubmodelPatchRecorder` in place.
+
+    Supports the ``add``, ``remove``, ``replace`` and ``test`` operations. Each
+    operation resolves its path with one idShort lookup per level, so the cost
+    depends on the patch, not on the size of the submodel. Operations are applied
+    in order; a failing operation raises :class:`PatchError` and leaves the
+    operations before it applied.
+    """
+    for operation in patch:
+        _apply_operation(submodel, operation)
+    return submodel
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def _load_environment(path: str):
+    """Read an environment file as written by am_machine.py (plain or as JSON string)."""
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    as_string = isinstance(document, str)
+    if as_string:
+        document = json.loads(document)
+    objects = json.loads(json.dumps(document), cls=AASFromJsonDecoder)
+    shells = objects.get("assetAdministrationShells", [])
+    submodels = objects.get("submodels", [])
+    if len(submodels) != 1:
+        raise ValueError(f"Expected exactly one submodel in {path}, found {len(submodels)}")
+    return shells, submodels[0], as_string
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compute or apply JSON Patch (RFC 6902) deltas between PBF-LB/M submodel snapshots"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    diff_parser = subparsers.add_parser("diff", help="Write the patch that turns OLD into NEW")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+    apply_parser = subparsers.add_parser("apply", help="Apply PATCH to the submodel in SNAPSHOT")
+    apply_parser.add_argument("snapshot")
+    apply_parser.add_argument("patch")
+    for subparser in (diff_parser, apply_parser):
+        subparser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout, the default)")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        _, old, _ = _load_environment(args.old)
+        _, new, _ = _load_environment(args.new)
+        result = json.dumps(diff_submodels(old, new), ensure_ascii=False)
+    else:
+        shells, submodel, as_string = _load_environment(args.snapshot)
+        with open(args.patch, encoding="utf-8") as f:
+            apply_patch(submodel, json.load(f))
+        object_store = model.DictObjectStore(shells + [submodel])
+        result = object_store_to_json(object_store)
+        if as_string:
+            result = json.dumps(result, ensure_ascii=False)
+
+    if args.output == "-":
+        sys.stdout.write(result + "\n")
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import contextlib
+import json
+import time
+import tracemalloc
+from typing import Dict, Any, List, Optional, TextIO, Tuple
+
+
+# ============================================================================
+# PROFILING AND INSTRUMENTATION
+# ============================================================================
+
+# Context manager of disabled instrumentation: entering it does nothing
+NO_PHASE = contextlib.nullcontext()
+
+
+class _Phase:
+    """One timed entry into a phase; see :meth:`Instrumentation.phase`."""
+
+    __slots__ = ("instrumentation", "name", "start", "base", "peak")
+
+    def __init__(self, instrumentation: "Instrumentation", name: str):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self) -> "_Phase":
+        if self.instrumentation.trace_memory:
+            self.instrumentation._enter_memory(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        instrumentation = self.instrumentation
+        instrumentation.seconds[self.name] = instrumentation.seconds.get(self.name, 0.0) + elapsed
+        instrumentation.calls[self.name] = instrumentation.calls.get(self.name, 0) + 1
+        if instrumentation.trace_memory:
+            instrumentation._exit_memory(self)
+
+
+class Instrumentation:
+    """Opt-in per-phase timers, counters and memory peaks for builds and exports.
+
+    Pass an instance to :class:`am_model.PBFLBMSubmodelBuilder` (or use
+    ``am_machine.py --profile``) to find out where the time of a build goes.
+    :meth:`phase` accumulates the wall time and number of entries per phase
+    name, and :meth:`count` adds to named counters. Phases may nest.
+
+    With ``trace_memory`` the peak of memory allocated inside every phase
+    (``tracemalloc``, relative to the start of the phase) is recorded as well.
+    Tracing slows allocation down considerably, so it is off by default.
+    Results export as a dict, JSON, or Prometheus text exposition format.
+
+    Code that is instrumented optionally keeps ``None`` when disabled and uses
+    :data:`NO_PHASE` instead of a phase, so the cost is one ``with`` on a
+    no-op context manager.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        if trace_memory and not hasattr(tracemalloc, "reset_peak"):
+            raise RuntimeError("Memory peaks per phase need Python 3.9 or later")
+        self.trace_memory = trace_memory
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.peaks: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self._open: List[_Phase] = []
+        self._started_tracing = False
+
+    def __enter__(self) -> "Instrumentation":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop ``tracemalloc`` if this instance started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def phase(self, name: str) -> _Phase:
+        """Context manager timing one entry into phase ``name``."""
+        return _Phase(self, name)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add ``amount`` to counter ``name``."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    # ------------------------------------------------------------------------
+    # Memory peaks: tracemalloc keeps a single peak, so it is reset when a phase
+    # starts and folded into the enclosing phases when one ends
+    # ------------------------------------------------------------------------
+
+    def _enter_memory(self, phase: _Phase) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        for outer in self._open:
+            outer.peak = max(outer.peak, peak)
+        tracemalloc.reset_peak()
+        phase.base, phase.peak = current, current
+        self._open.append(phase)
+
+    def _exit_memory(self, phase: _Phase) -> None:
+        self._open.remove(phase)
+        peak = max(phase.peak, tracemalloc.get_traced_memory()[1])
+        for outer in self._open:
+            outer.peak = max(outer.peak, peak)
+        self.peaks[phase.name] = max(self.peaks.get(phase.name, 0), peak - phase.base)
+
+    # ------------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        phases = {}
+        for name, seconds in self.seconds.items():
+            phases[name] = {"seconds": seconds, "calls": self.calls[name]}
+            if name in self.peaks:
+                phases[name]["peak_bytes"] = self.peaks[name]
+        return {"phases": phases, "counters": dict(self.counters)}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, namespace: str = "pbflbm") -> str:
+        """Results in the Prometheus text exposition format, one metric family per line group."""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: Dict[str, Any], label: Optional[str]) -> None:
+            if not samples:
+                return
+            lines.append(f"# HELP {namespace}_{name} {help_text}")
+            lines.append(f"# TYPE {namespace}_{name} {kind}")
+            for key, value in samples.items():
+                labels = "{" + label + '="' + _escape_label(key) + '"}' if label else ""
+                lines.append(f"{namespace}_{name}{labels} {value!r}")
+
+        family("phase_seconds_total", "counter", "Wall time spent per phase.", self.seconds, "phase")
+        family("phase_calls_total", "counter", "Number of entries per phase.", self.calls, "phase")
+        family("phase_peak_bytes", "gauge", "Peak memory allocated within a phase.", self.peaks, "phase")
+        for name, value in self.counters.items():
+            family(f"{name}_total", "counter", f"Number of {name.replace('_', ' ')}.", {name: value}, None)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write the results to ``path``: JSON for ``.json`` files, Prometheus text otherwise."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json() + "\n" if path.endswith(".json") else self.to_prometheus())
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class CountingStream:
+    """Text stream wrapper counting the UTF-8 bytes written through it into ``counter``."""
+
+    def __init__(self, stream: TextIO, instrumentation: Instrumentation, counter: str = "bytes_written"):
+        self._stream = stream
+        self._instrumentation = instrumentation
+        self._counter = counter
+
+    def write(self, text: str) -> int:
+        self._instrumentation.count(self._counter, len(text.encode("utf-8")))
+        return self._stream.write(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+# ============================================================================
+# IMPORT TIMES
+# ============================================================================
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """``(module, depth, cumulative µs)`` for every import in ``python -X importtime`` output.
+
+    Entries are in the order printed: an import is printed when it finishes, so
+    nested imports come before their importer. ``depth`` is the nesting level,
+    0 for the imports of the script itself.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.rstrip().endswith("package"):
+            continue  # other output, or the header line
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((name.strip(), (len(name) - len(name.lstrip()) - 1) // 2, int(cumulative)))
+    return imports
+
@@ -0,0 +1,323 @@
+import argparse
+import csv
+import operator
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Iterable, Sequence, Set, Tuple
+
+from basyx.aas import model
+
+from am_machine import (
+    EXPOSURE_UNIT_COLLECTION, EXPOSURE_UNIT_COUNT, EXPOSURE_UNIT_ID_SHORT, ElementSpec, ValueCoercionError,
+    ValueIssue, exposure_units, highest_exposure_unit, machine_specification, property_specs, _COERCERS
+)
+
+
+# ============================================================================
+# INDEXED FLEET QUERIES
+# ============================================================================
+
+# Longest first, so ">=" is not read as ">"
+_OPERATORS = ("==", "!=", "<=", ">=", "=", "<", ">")
+
+_COMPARE = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+# Value types answered from a sorted index; all others get a hash index
+_SORTED_TYPES = (model.datatypes.Double, model.datatypes.Integer)
+
+# "Exposure_unit." paths stand for every unit, "Exposure_unit_<n>." paths for unit n only
+_ANY_UNIT = EXPOSURE_UNIT_COLLECTION.id_short + "."
+_UNIT_PREFIX = EXPOSURE_UNIT_ID_SHORT.format("")
+
+
+def _split_unit(path: str) -> Tuple[Optional[int], str]:
+    """``(n, "Exposure_unit.<rest>")`` for ``"Exposure_unit_<n>.<rest>"``, ``(None, path)`` for other paths."""
+    if path.startswith(_UNIT_PREFIX):
+        unit, dot, rest = path[len(_UNIT_PREFIX):].partition(".")
+        if unit.isdigit() and dot:
+            return int(unit), _ANY_UNIT + rest
+    return None, path
+
+
+def _missing(value: Any) -> bool:
+    """``None``, or a NaN double: it would break the order of a sorted index, so it never matches either."""
+    return value is None or value != value
+
+
+def _any_match(checks: List[Tuple[List[Any], Any, Any]], row: int) -> bool:
+    return any(not _missing(column[row]) and compare(column[row], value) for column, compare, value in checks)
+
+
+@dataclass
+class Predicate:
+    """``<path> <op> <value>`` with the value already coerced to the property's value type."""
+    path: str
+    op: str
+    value: Any
+
+    def __str__(self) -> str:
+        return f"{self.path} {self.op} {self.value!r}"
+
+
+class _SortedIndex:
+    """Non-null, non-NaN values of one column in sorted order, with the row of each."""
+
+    def __init__(self, column: Sequence[Any]):
+        pairs = sorted((value, row) for row, value in enumerate(column) if not _missing(value))
+        self.keys = [value for value, _ in pairs]
+        self.rows = [row for _, row in pairs]
+
+    def _ranges(self, op: str, value: Any) -> List[Tuple[int, int]]:
+        if op == "==":
+            return [(bisect_left(self.keys, value), bisect_right(self.keys, value))]
+        if op == "!=":
+            return [(0, bisect_left(self.keys, value)), (bisect_right(self.keys, value), len(self.keys))]
+        if op == "<":
+            return [(0, bisect_left(self.keys, value))]
+        if op == "<=":
+            return [(0, bisect_right(self.keys, value))]
+        if op == ">":
+            return [(bisect_right(self.keys, value), len(self.keys))]
+        return [(bisect_left(self.keys, value), len(self.keys))]
+
+    def count(self, op: str, value: Any) -> int:
+        return sum(hi - lo for lo, hi in self._ranges(op, value))
+
+    def rows_matching(self, op: str, value: Any) -> List[int]:
+        rows: List[int] = []
+        for lo, hi in self._ranges(op, value):
+            rows.extend(self.rows[lo:hi])
+        return rows
+
+
+class _HashIndex:
+    """Rows of one column grouped by value."""
+
+    def __init__(self, column: Sequence[Any]):
+        self.buckets: Dict[Any, List[int]] = {}
+        self.size = 0
+        for row, value in enumerate(column):
+            if not _missing(value):
+                self.buckets.setdefault(value, []).append(row)
+                self.size += 1
+
+    def count(self, op: str, value: Any) -> int:
+        matches = len(self.buckets.get(value, ()))
+        if op == "==":
+            return matches
+        if op == "!=":
+            return self.size - matches
+        return self.size  # range on a hashed column: every value is a candidate
+
+    def rows_matching(self, op: str, value: Any) -> List[int]:
+        if op == "==":
+            return self.buckets.get(value, [])
+        compare = _COMPARE[op]
+        return [row for key, rows in self.buckets.items() if compare(key, value) for row in rows]
+
+
+class FleetIndex:
+    """Per-property indexes over the values of a fleet, answering conjunctive queries.
+
+    Built once from ``(machine ID, {dotted path: value})`` records (see the
+    sources in :mod:`am_export`). Every leaf property of the specification gets
+    an index: a sorted index for doubles and integers (range and equality
+    predicates via bisection), a hash index for strings and booleans. Without
+    an explicit specification, the columns follow the machine with the most
+    exposure units, so ``Exposure_unit_2`` … values of multi-laser machines
+    are indexed too.
+
+    Paths resolve the same way whatever machines the fleet holds: an exposure
+    unit property given as ``Exposure_unit.<property>`` or by its suffix
+    matches a machine if any of its units matches, ``Exposure_unit_<n>.<property>``
+    only checks unit n (``Exposure_unit_1`` is the first unit).
+
+    :meth:`query` estimates the number of matches of every predicate from its
+    index, materializes the most selective one and intersects the others in
+    order of selectivity. A predicate matching far more rows than are left is
+    checked row by row against the column instead of being materialized.
+    """
+
+    # Probe the column instead of intersecting once a predicate matches this many times more rows
+    PROBE_RATIO = 8
+
+    def __init__(self, records: Iterable[Tuple[str, Dict[str, Any]]],
+                 specification: Optional[Dict[str, ElementSpec]] = None):
+        self.specs = property_specs(specification)
+        self.ids: List[str] = []
+        self.columns: Dict[str, List[Any]] = {path: [] for path in self.specs}
+        units = 1 if specification is None else highest_exposure_unit(self.specs)
+        for machine_id, values in records:
+            count = exposure_units(values) if specification is None else units
+            if count > units:
+                # More units than any machine so far: add their columns, empty for the earlier rows
+                units = count
+                self.specs = property_specs(machine_specification(units))
+                self.columns = {path: self.columns.get(path) or [None] * len(self.ids) for path in self.specs}
+            self.ids.append(machine_id)
+            for path, column in self.columns.items():
+                column.append(values.get(path))
+        self.units = units
+        self.indexes = {
+            path: (_SortedIndex if self.specs[path].value_type in _SORTED_TYPES else _HashIndex)(column)
+            for path, column in self.columns.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def resolve_path(self, name: str) -> str:
+        """Full dotted path of a property, also given as a unique suffix (``z_dimension``).
+
+        Suffixes of exposure unit properties resolve to ``Exposure_unit.<property>``,
+        which :meth:`columns_for` expands to every unit.
+        """
+        unit, path = _split_unit(name)
+        if unit is not None:
+            if path in self.specs and 1 <= unit <= EXPOSURE_UNIT_COUNT.maximum:
+                return name
+            raise KeyError(f"Unknown property: {name}")
+        if name in self.specs:
+            return name
+        matches = [path for path in self.specs if path.endswith("." + name) and _split_unit(path)[0] is None]
+        if len(matches) != 1:
+            raise KeyError(f"{'Ambiguous' if matches else 'Unknown'} property: {name}"
+                           + (f" ({', '.join(matches)})" if matches else ""))
+        return matches[0]
+
+    def columns_for(self, path: str) -> List[str]:
+        """Columns a resolved path stands for; none for a unit beyond the fleet's largest machine."""
+        unit, any_unit = _split_unit(path)
+        if unit == 1:
+            return [any_unit]
+        if unit is None and path.startswith(_ANY_UNIT):
+            rest = path[len(_ANY_UNIT):]
+            return [path] + [EXPOSURE_UNIT_ID_SHORT.format(n) + "." + rest for n in range(2, self.units + 1)]
+        return [path] if path in self.columns else []
+
+    def _count(self, predicate: Predicate) -> int:
+        return sum(self.indexes[path].count(predicate.op, predicate.value) for path in self.columns_for(predicate.path))
+
+    def _rows_matching(self, predicate: Predicate) -> Set[int]:
+        rows: Set[int] = set()
+        for path in self.columns_for(predicate.path):
+            rows.update(self.indexes[path].rows_matching(predicate.op, predicate.value))
+        return rows
+
+    def _checks(self, predicate: Predicate) -> List[Tuple[List[Any], Any, Any]]:
+        compare = _COMPARE[predicate.op]
+        return [(self.columns[path], compare, predicate.value) for path in self.columns_for(predicate.path)]
+
+    def predicate(self, path: str, op: str, value: Any) -> Predicate:
+        """Build a predicate, resolving ``path`` and coercing ``value`` to the property's type."""
+        if op == "=":
+            op = "=="
+        if op not in _COMPARE:
+            raise ValueError(f"Unknown operator: {op}")
+        path = self.resolve_path(path)
+        try:
+            coerced = _COERCERS[self.specs[_split_unit(path)[1]].value_type](value)
+        except (TypeError, ValueError) as e:
+            raise ValueCoercionError([ValueIssue(path, value, str(e) or type(e).__name__)]) from e
+        if _missing(coerced):
+            raise ValueCoercionError([ValueIssue(path, value, "NaN cannot be compared")])
+        return Predicate(path, op, coerced)
+
+    def parse(self, text: str) -> Predicate:
+        """Parse ``"<path><op><value>"``, e.g. ``"laser_source_rated_power>=400"``."""
+        for op in _OPERATORS:
+            path, found, value = text.partition(op)
+            if found:
+                return self.predicate(path.strip(), op, value.strip())
+        raise ValueError(f"No operator ({', '.join(_OPERATORS)}) in predicate: {text}")
+
+    def query(self, *predicates: Predicate) -> List[int]:
+        """Rows matching all predicates, in fleet order. No predicates match every row."""
+        if not predicates:
+            return list(range(len(self.ids)))
+        plan = sorted(predicates, key=self._count)
+        rows = self._rows_matching(plan[0])
+        for predicate in plan[1:]:
+            if not rows:
+                break
+            if self._count(predicate) > self.PROBE_RATIO * len(rows):
+                checks = self._checks(predicate)
+                rows = {row for row in rows if _any_match(checks, row)}
+            else:
+                rows.intersection_update(self._rows_matching(predicate))
+        return sorted(rows)
+
+    def scan(self, *predicates: Predicate) -> List[int]:
+        """Same result as :meth:`query` by checking every row; for comparison and testing."""
+        checks = [self._checks(predicate) for predicate in predicates]
+        return [row for row in range(len(self.ids)) if all(_any_match(check, row) for check in checks)]
+
+    def find(self, *predicates: str) -> List[str]:
+        """IDs of the machines matching all predicates given as text."""
+        return [self.ids[row] for row in self.query(*(self.parse(text) for text in predicates))]
+
+    def row_values(self, row: int, paths: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Values of one row, for all or the given property paths."""
+        return {path: self.columns[path][row] for path in (paths if paths is not None else self.columns)}
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="am_machine.py query",
+        description="Find machines whose property values match all predicates, e.g. "
+                    "'laser_source_rated_power>=400' 'z_dimension>300' 'control_system==X'"
+    )
+    parser.add_argument("predicates", nargs="*", help="<path><op><value> with op one of == != < <= > >=")
+    parser.add_argument("--store", help="Query the machines of this fleet store")
+    parser.add_argument("--inventory", help="Query the machines of an inventory (CSV or JSONL)")
+    parser.add_argument("--files", nargs="+", default=[], help="Query submodel JSON files")
+    parser.add_argument("--select", default="", help="Comma-separated properties to print with each machine")
+    parser.add_argument("--count", action="store_true", help="Only print the number of matches")
+    args = parser.parse_args(argv)
+
+    import am_export
+    store = None
+    if args.store:
+        from am_store import FleetStore
+        store = FleetStore(args.store)
+        records = am_export.store_records(store)
+    elif args.inventory:
+        import am_fleet
+        records = am_export.inventory_records(am_fleet.coerce_inventory(am_fleet.read_inventory(args.inventory)))
+    else:
+        records = am_export.file_records(args.files)
+    try:
+        index = FleetIndex(records)
+    finally:
+        if store is not None:
+            store.close()
+
+    try:
+        predicates = [index.parse(text) for text in args.predicates]
+        select = [path for name in args.select.split(",") if name.strip()
+                  for path in index.columns_for(index.resolve_path(name.strip()))]
+    except (KeyError, ValueError) as e:
+        print(f"✗ {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        sys.exit(2)
+
+    rows = index.query(*predicates)
+    if args.count:
+        print(len(rows))
+        return
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["id"] + select)
+    for row in rows:
+        values = index.row_values(row, select)
+        writer.writerow([index.ids[row]] + ["" if values[path] is None else values[path] for path in select])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+import argparse
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+from http import HTTPStatus
+from typing import Dict, Any, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from basyx.aas import model
+from basyx.aas.adapter.json import AASToJsonEncoder, AASFromJsonDecoder
+
+from am_machine import exposure_units, machine_specification
+from am_model import PBFLBMSubmodelBuilder, SubmodelChangeTracker, SubmodelPathIndex
+from am_json import IncrementalSubmodelSerializer
+
+
+# ============================================================================
+# AAS REPOSITORY WITH CACHED RESPONSES
+# ============================================================================
+
+# (status, headers, body)
+Response = Tuple[int, Dict[str, str], bytes]
+
+# Cached response body and its ETag
+CachedBody = Tuple[str, bytes]
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+def encode_identifier(identifier: str) -> str:
+    """Encode an AAS/Submodel ID for use in a URL (base64url without padding, as in AAS Part 2)."""
+    return base64.urlsafe_b64encode(identifier.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_identifier(segment: str) -> str:
+    """Inverse of :func:`encode_identifier`; padding is optional."""
+    segment = unquote(segment)
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)).decode("utf-8")
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def _error(status: int, text: str) -> Response:
+    body = json.dumps({"messages": [{"code": str(status), "messageType": "Error", "text": text}]}).encode()
+    return status, {"Content-Type": JSON_CONTENT_TYPE}, body
+
+
+def _paged(items: List[str]) -> bytes:
+    return ('{"paging_metadata": {}, "result": [' + ", ".join(items) + "]}").encode("utf-8")
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+class _HostedSubmodel:
+    """A submodel together with its path index, change tracker and incremental serializer."""
+
+    def __init__(self, submodel: model.Submodel, index: Optional[SubmodelPathIndex] = None):
+        self.submodel = submodel
+        self.index = index if index is not None else SubmodelPathIndex(submodel)
+        self.tracker = SubmodelChangeTracker(submodel)
+        self.serializer = IncrementalSubmodelSerializer(submodel, self.tracker)
+        # idShortPath -> cached body of /submodel-elements/{idShortPath}
+        self.element_bodies: Dict[str, CachedBody] = {}
+
+
+class AASRepository:
+    """AAS and submodel repository answering AAS Part 2 HTTP API requests from cached bytes.
+
+    Objects live in a :class:`~basyx.aas.model.DictIdentifiableStore`. Serialized
+    responses are cached per submodel and per element path together with an ETag
+    (a hash of the body), so ``If-None-Match`` requests are answered with 304.
+    Every hosted submodel is watched by a :class:`SubmodelChangeTracker`; a
+    change only invalidates the cached responses that contain the changed element,
+    and re-serializing a submodel re-encodes only its changed collections.
+
+    Objects must be changed from the thread running the server's event loop.
+    """
+
+    def __init__(self, object_store: Optional[model.DictIdentifiableStore] = None,
+                 builder: Optional[PBFLBMSubmodelBuilder] = None):
+        self.object_store = object_store if object_store is not None else model.DictIdentifiableStore()
+        self.builder = builder or PBFLBMSubmodelBuilder()
+        # Without an explicit builder, machines get one builder per number of exposure units
+        self._builders: Optional[Dict[int, PBFLBMSubmodelBuilder]] = None if builder else {1: self.builder}
+        self._submodels: Dict[str, _HostedSubmodel] = {}
+        # ("shells",), ("shells", id), ("submodels",), ("submodels", id), ("submodel-elements", id)
+        self._bodies: Dict[Tuple[str, ...], CachedBody] = {}
+        for identifiable in self.object_store:
+            if isinstance(identifiable, model.Submodel):
+                self._host(identifiable)
+
+    # ------------------------------------------------------------------------
+    # Content
+    # ------------------------------------------------------------------------
+
+    def _host(self, submodel: model.Submodel, index: Optional[SubmodelPathIndex] = None) -> None:
+        hosted = _HostedSubmodel(submodel, index)
+        hosted.tracker.subscribe(lambda element: self._invalidate(hosted, element))
+        self._submodels[submodel.id] = hosted
+
+    def add(self, aas: model.AssetAdministrationShell, submodel: model.Submodel,
+            index: Optional[SubmodelPathIndex] = None) -> None:
+        """Host an AAS and its submodel."""
+        self._store(aas)
+        self._store(submodel, index)
+
+    def _store(self, identifiable: model.Identifiable, index: Optional[SubmodelPathIndex] = None) -> None:
+        """Add an AAS or submodel, replacing a stored object with the same ID."""
+        try:
+            self.object_store.discard(self.object_store.get_item(identifiable.id))
+        except KeyError:
+            pass
+        self.object_store.add(identifiable)
+        if isinstance(identifiable, model.Submodel):
+            self._host(identifiable, index)
+            for key in (("submodels",), ("submodels", identifiable.id), ("submodel-elements", identifiable.id)):
+                self._bodies.pop(key, None)
+        else:
+            self._bodies.pop(("shells",), None)
+            self._bodies.pop(("shells", identifiable.id), None)
+
+    def add_machine(self, aas_id: str, submodel_id: str,
+                    values: Optional[Dict[str, Any]] = None) -> model.Submodel:
+        """Build a PBF-LB/M machine with the repository's builder and host it.
+
+        Unless the repository was given a builder, the machine gets as many exposure
+        units as ``values`` ask for (see :func:`am_machine.exposure_units`).
+        """
+        builder = self.builder
+        if self._builders is not None and values:
+            units = exposure_units(values)
+            if units not in self._builders:
+                self._builders[units] = PBFLBMSubmodelBuilder(specification=machine_specification(units))
+            builder = self._builders[units]
+        aas, submodel, index = builder.build_aas_and_submodel(aas_id, submodel_id, with_index=True)
+        if values:
+            builder.set_values(submodel, values)
+        self.add(aas, submodel, index)
+        return submodel
+
+    @property
+    def submodel_ids(self) -> List[str]:
+        """IDs of all hosted submodels."""
+        return list(self._submodels)
+
+    def index(self, submodel_id: str) -> SubmodelPathIndex:
+        """Path index of a hosted submodel, e.g. to push live values."""
+        return self._submodels[submodel_id].index
+
+    def _invalidate(self, hosted: _HostedSubmodel, changed: Any) -> None:
+        self._bodies.pop(("submodels",), None)
+        self._bodies.pop(("submodels", hosted.submodel.id), None)
+        self._bodies.pop(("submodel-elements", hosted.submodel.id), None)
+
+        id_shorts = []
+        element = changed
+        while isinstance(element, model.SubmodelElement):
+            id_shorts.append(element.id_short)
+            element = element.parent
+        if element is not hosted.submodel:
+            return  # change of an element that is no longer part of the submodel
+        id_shorts.reverse()
+        for depth in range(1, len(id_shorts) + 1):
+            hosted.element_bodies.pop(".".join(id_shorts[:depth]), None)
+        if not isinstance(changed, model.Property):
+            # Added or removed children: drop everything cached below
+            prefix = ".".join(id_shorts) + "." if id_shorts else ""
+            for path in [path for path in hosted.element_bodies if path.startswith(prefix)]:
+                del hosted.element_bodies[path]
+
+    # ------------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------------
+
+    def _cached(self, cache: Dict[Any, CachedBody], key: Any, render) -> CachedBody:
+        entry = cache.get(key)
+        if entry is None:
+            body = render()
+            entry = cache[key] = (_etag(body), body)
+        return entry
+
+    def _identifiable(self, segment: str, kind: type):
+        try:
+            identifiable = self.object_store.get_item(decode_identifier(segment))
+        except (binascii.Error, ValueError, KeyError):
+            return None
+        return identifiable if isinstance(identifiable, kind) else None
+
+    def _resolve(self, segments: List[str]):
+        """Return (cache, key, render) for a GET, or an error response."""
+        if segments == ["shells"]:
+            return self._bodies, ("shells",), lambda: _paged(
+                [json.dumps(aas, cls=AASToJsonEncoder) for aas in self.object_store
+                 if isinstance(aas, model.AssetAdministrationShell)])
+        if segments == ["submodels"]:
+            return self._bodies, ("submodels",), lambda: _paged(
+                [hosted.serializer.to_json() for hosted in self._submodels.values()])
+        if len(segments) == 2 and segments[0] == "shells":
+            aas = self._identifiable(segments[1], model.AssetAdministrationShell)
+            if aas is None:
+                return _error(404, "Asset Administration Shell not found")
+            return self._bodies, ("shells", aas.id), lambda: json.dumps(aas, cls=AASToJsonEncoder).encode("utf-8")
+
+        if len(segments) < 2 or segments[0] != "submodels":
+            return _error(404, "Resource not found")
+        submodel = self._identifiable(segments[1], model.Submodel)
+        if submodel is None:
+            return _error(404, "Submodel not found")
+        hosted = self._submodels[submodel.id]
+        if len(segments) == 2:
+            return self._bodies, ("submodels", submodel.id), lambda: hosted.serializer.to_json().encode("utf-8")
+        if segments[2] != "submodel-elements" or len(segments) > 4:
+            return _error(404, "Resource not found")
+        if len(segments) == 3:
+            return self._bodies, ("submodel-elements", submodel.id), lambda: _paged(
+                [hosted.serializer.element_json(element) for element in submodel.submodel_element])
+        path = unquote(segments[3])
+        if path not in hosted.index:
+            return _error(404, f"Submodel element not found: {path}")
+        element = hosted.index[path]
+        return hosted.element_bodies, path, lambda: hosted.serializer.element_json(element).encode("utf-8")
+
+    def _patch_value(self, segments: List[str], body: bytes) -> Response:
+        submodel = self._identifiable(segments[1], model.Submodel)
+        if submodel is None:
+            return _error(404, "Submodel not found")
+        index = self._submodels[submodel.id].index
+        path = unquote(segments[3])
+        if path not in index:
+            return _error(404, f"Submodel element not found: {path}")
+        try:
+            index.set_value(path, json.loads(body))
+        except (ValueError, TypeError) as e:  # TypeError: well-formed JSON of the wrong shape
+            return _error(400, str(e))
+        return 204, {}, b""
+
+    def _put_or_post(self, method: str, segments: List[str], body: bytes) -> Response:
+        """POST /shells, /submodels creates; PUT /shells/{id}, /submodels/{id} replaces."""
+        kind = model.AssetAdministrationShell if segments[0] == "shells" else model.Submodel
+        try:
+            identifiable = json.loads(body, cls=AASFromJsonDecoder)
+        except (ValueError, KeyError, TypeError) as e:
+            return _error(400, f"Invalid request body: {e}")
+        if not isinstance(identifiable, kind):
+            return _error(400, f"Request body is not a {kind.__name__}")
+
+        try:
+            self.object_store.get_item(identifiable.id)
+            exists = True
+        except KeyError:
+            exists = False
+        if method == "POST":
+            if exists:
+                return _error(409, f"Identifiable already exists: {identifiable.id}")
+            self._store(identifiable)
+            return 201, {"Content-Type": JSON_CONTENT_TYPE}, body
+
+        try:
+            path_id = decode_identifier(segments[1])
+        except (binascii.Error, ValueError):
+            return _error(404, "Resource not found")
+        if not exists:
+            return _error(404, f"Identifiable not found: {identifiable.id}")
+        if path_id != identifiable.id:
+            return _error(400, f"ID in the path does not match the request body: {path_id}")
+        self._store(identifiable)
+        return 204, {}, b""
+
+    def handle(self, method: str, target: str, headers: Dict[str, str], body: bytes = b"") -> Response:
+        """Answer one request; ``headers`` are keyed by lower-case name."""
+        segments = [segment for segment in target.split("?", 1)[0].split("/") if segment]
+
+        if method == "PATCH" and len(segments) == 5 and segments[0] == "submodels" \
+                and segments[2] == "submodel-elements" and segments[4] == "$value":
+            return self._patch_value(segments, body)
+        if segments and segments[0] in ("shells", "submodels") and (
+                (method == "POST" and len(segments) == 1) or (method == "PUT" and len(segments) == 2)):
+            return self._put_or_post(method, segments, body)
+        if method != "GET":
+            return _error(405, f"Method not allowed: {method}")
+
+        resolved = self._resolve(segments)
+        if isinstance(resolved[0], int):
+            return resolved
+        etag, payload = self._cached(*resolved)
+        if _etag_matches(headers.get("if-none-match"), etag):
+            return 304, {"ETag": etag}, b""
+        return 200, {"Content-Type": JSON_CONTENT_TYPE, "ETag": etag}, payload
+
+
+# ============================================================================
+# ASYNCIO HTTP SERVER
+# ============================================================================
+
+def format_response(status: int, headers: Dict[str, str], body: bytes, keep_alive: bool = True) -> bytes:
+    """Serialize an HTTP/1.1 response."""
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    if status not in (204, 304):
+        lines.append(f"Content-Length: {len(body)}")
+    if not keep_alive:
+        lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+class AASServer:
+    """Minimal HTTP/1.1 server (keep-alive, no chunked requests) in front of an :class:`AASRepository`."""
+
+    def __init__(self, repository: AASRepository, host: str = "127.0.0.1", port: int = 8080):
+        self.repository = repository
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        # Port 0 picks a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop accepting connections and close the open ones."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+                parts = request_line.split(" ")
+                if len(parts) != 3:
+                    writer.write(format_response(*_error(400, "Malformed request line"), keep_alive=False))
+                    break
+                method, target, version = parts
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    writer.write(format_response(*_error(400, "Invalid Content-Length"), keep_alive=False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, response_headers, payload = self.repository.handle(method, target, headers, body)
+                except Exception as e:
+                    status, response_headers, payload = _error(500, f"{type(e).__name__}: {e}")
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(format_response(status, response_headers, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client went away, or the server is closing
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve PBF-LB/M submodels over the AAS Part 2 HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--inventory", help="Machine inventory (CSV or JSONL); serves one AAS/Submodel per machine")
+    args = parser.parse_args()
+
+    repository = AASRepository()
+    if args.inventory:
+        import am_fleet
+        for row in am_fleet.read_inventory(args.inventory):
+            serial_number, values = am_fleet.split_inventory_row(row)
+            repository.add_machine(*am_fleet.machine_ids(serial_number), values=values)
+    else:
+        repository.add_machine("https://acplt.org/PBF-LB-M_AAS", "https://acplt.org/PBF-LB-M_Submodel")
+
+    server = AASServer(repository, args.host, args.port)
+
+    async def run():
+        await server.start()
+        print(f"✓ Serving {len(repository.submodel_ids)} submodels on http://{server.host}:{server.port}")
+        for submodel_id in repository.submodel_ids:
+            print(f"  - /submodels/{encode_identifier(submodel_id)}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+import json
+import os
+import sqlite3
+from typing import Dict, Any, Collection, List, Optional, Iterator, Tuple
+
+from basyx.aas import model
+from basyx.aas.adapter.json import AASToJsonEncoder
+
+from am_fleet import (
+    DEFAULT_AAS_ID_PREFIX, DEFAULT_SUBMODEL_ID_PREFIX, build_fleet, machine_ids, split_inventory_row
+)
+from am_json import (
+    SubmodelJSONEmitter, SubmodelJSONLoader, collection_reference, collection_references, environment_json,
+    join_collections, split_collections
+)
+from am_machine import ValueCoercionError, coerce_values
+
+
+# ============================================================================
+# ON-DISK FLEET STORE
+# ============================================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS machines (
+    aas_id        TEXT PRIMARY KEY,
+    submodel_id   TEXT NOT NULL UNIQUE,
+    serial_number TEXT,
+    aas_json      TEXT NOT NULL,
+    submodel_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS machines_serial_number ON machines (serial_number);
+CREATE TABLE IF NOT EXISTS collections (
+    digest TEXT PRIMARY KEY,
+    json   TEXT NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO machines (aas_id, submodel_id, serial_number, aas_json, submodel_json) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (aas_id) DO UPDATE SET
+    submodel_id = excluded.submodel_id, serial_number = excluded.serial_number,
+    aas_json = excluded.aas_json, submodel_json = excluded.submodel_json
+"""
+
+_INSERT_COLLECTION = "INSERT OR IGNORE INTO collections (digest, json) VALUES (?, ?)"
+
+# Top-level collections that are usually identical across machines of the same
+# model and firmware; ``Exposure_unit`` also covers ``Exposure_unit_2`` and so on
+SHARED_COLLECTIONS = frozenset({"PLC", "MCSW", "Exposure_unit"})
+
+
+def _canonical_json(document: str) -> str:
+    """The document as written with ``ensure_ascii=False``, like every write path of the store."""
+    if "\\u" not in document:
+        return document
+    return json.dumps(json.loads(document), ensure_ascii=False)
+
+
+class FleetStore:
+    """Persistent store of machine AAS/Submodel documents in a single SQLite file.
+
+    Every machine is one row keyed by AAS ID, with an index on
+    ``Info.serial_number`` so machines can be looked up by either. Serial
+    numbers are not unique: looking up one that several machines share
+    raises ``ValueError``. A machine is read or rewritten without
+    touching the others. Documents are kept as the JSON basyx writes with
+    ``ensure_ascii=False``, so :meth:`environment` returns exactly what
+    ``am_machine.py`` writes for that machine in a fleet. :meth:`update_values` re-emits a document straight from the
+    specification. Use as a context manager, or call :meth:`close`.
+
+    With ``deduplicate``, the ``shared_collections`` of every submodel written
+    are content-addressed (:func:`am_json.split_collections`): each distinct
+    collection is kept once in a ``collections`` table and the machines
+    reference it. Reading always puts the collections back, so documents come
+    back byte for byte as they were written, whichever mode wrote them.
+    :meth:`deduplication` reports what sharing saves.
+    """
+
+    def __init__(self, path: str, specification=None, deduplicate: bool = False,
+                 shared_collections: Collection[str] = SHARED_COLLECTIONS):
+        self.path = path
+        self.deduplicate = deduplicate
+        self.shared_collections = shared_collections
+        self.loader = SubmodelJSONLoader(specification)
+        self._emitters: Dict[int, SubmodelJSONEmitter] = {}  # per specification, by id()
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "FleetStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    # ------------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------------
+
+    def _row(self, aas_json: str, submodel_json: str, serial_number: Optional[str]) -> Tuple[str, ...]:
+        if serial_number is None:
+            serial_number = self.loader.read(submodel_json)[1].get("Info.serial_number")
+        return json.loads(aas_json)["id"], json.loads(submodel_json)["id"], serial_number, aas_json, submodel_json
+
+    def _upsert(self, machine: Tuple[str, str, Optional[str], str, str]) -> None:
+        """Write one machine row; the caller holds the transaction.
+
+        Documents are stored without ASCII escapes whichever way they were
+        serialized, so the same machine is stored (and deduplicated) the same
+        way through every write path.
+        """
+        machine = (*machine[:3], _canonical_json(machine[3]), _canonical_json(machine[4]))
+        if self.deduplicate:
+            submodel_json, collections = split_collections(machine[4], self.shared_collections)
+            self._connection.executemany(_INSERT_COLLECTION, collections.items())
+            machine = (*machine[:4], submodel_json)
+        self._connection.execute(_UPSERT, machine)
+
+    def put(self, aas_json: str, submodel_json: str, serial_number: Optional[str] = None) -> None:
+        """Insert or replace one machine given its serialized AAS and Submodel.
+
+        Without ``serial_number`` it is read from ``Info.serial_number`` of the submodel.
+        """
+        with self._connection:
+            self._upsert(self._row(aas_json, submodel_json, serial_number))
+
+    def put_objects(self, aas: model.AssetAdministrationShell, submodel: model.Submodel) -> None:
+        """Insert or replace one machine given as basyx objects."""
+        serial_number = None
+        try:
+            serial_number = submodel.get_referable(["Info", "serial_number"]).value
+        except KeyError:
+            pass
+        with self._connection:
+            self._upsert((aas.id, submodel.id, serial_number,
+                          json.dumps(aas, cls=AASToJsonEncoder, ensure_ascii=False),
+                          json.dumps(submodel, cls=AASToJsonEncoder, ensure_ascii=False)))
+
+    def put_many(self, machines: Iterator[Tuple[str, str, Optional[str], str, str]]) -> int:
+        """Insert or replace many machines in one transaction.
+
+        Every machine is given as ``(aas_id, submodel_id, serial_number, aas_json, submodel_json)``.
+        """
+        count = 0
+        with self._connection:
+            for machine in machines:
+                self._upsert(machine)
+                count += 1
+        return count
+
+    def update_values(self, key: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge dotted-path ``values`` into one stored machine and rewrite only that machine.
+
+        ``key`` is an AAS ID or serial number. Returns the merged values.
+        """
+        aas_id, submodel_id, serial_number, _, submodel_json = self._fetch(key)
+        stored = self.loader.read(submodel_json)[1]
+        # Checked against the specification of this machine, e.g. its number of exposure units
+        specification = self.loader.specification_for(stored)
+        values, issues = coerce_values(values, specification)
+        if issues:
+            raise ValueCoercionError(issues)
+        stored.update(values)
+        emitter = self._emitters.get(id(specification))
+        if emitter is None:
+            emitter = self._emitters[id(specification)] = SubmodelJSONEmitter(specification=specification,
+                                                                              ensure_ascii=False)
+        aas_json, submodel_json = emitter.emit_pair(stored, aas_id=aas_id, submodel_id=submodel_id)
+        with self._connection:
+            self._upsert((aas_id, submodel_id, stored.get("Info.serial_number", serial_number),
+                          aas_json, submodel_json))
+        return stored
+
+    def delete(self, key: str) -> None:
+        """Remove one machine, by AAS ID or serial number."""
+        aas_id = self._fetch(key)[0]
+        with self._connection:
+            self._connection.execute("DELETE FROM machines WHERE aas_id = ?", (aas_id,))
+
+    def compact(self) -> None:
+        """Reclaim the space of deleted and rewritten machines, and of collections no machine references."""
+        referenced = {digest for (submodel_json,) in self._connection.execute("SELECT submodel_json FROM machines")
+                      for digest in collection_references(submodel_json)}
+        with self._connection:
+            self._connection.executemany("DELETE FROM collections WHERE digest = ?", [
+                (digest,) for (digest,) in self._connection.execute("SELECT digest FROM collections")
+                if digest not in referenced])
+        self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._connection.execute("VACUUM")
+
+    # ------------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------------
+
+    def _join(self, submodel_json: str) -> str:
+        """Put the shared collections back into a stored submodel document."""
+        digests = collection_references(submodel_json)
+        if not digests:
+            return submodel_json
+        collections = dict(self._connection.execute(
+            f"SELECT digest, json FROM collections WHERE digest IN ({', '.join('?' * len(digests))})", digests))
+        return join_collections(submodel_json, collections)
+
+    def _fetch(self, key: str) -> Tuple[str, str, Optional[str], str, str]:
+        cursor = self._connection.execute(
+            "SELECT aas_id, submodel_id, serial_number, aas_json, submodel_json FROM machines WHERE aas_id = ?",
+            (key,))
+        row = cursor.fetchone()
+        if row is None:
+            # Serial numbers are not unique in the table, so never pick one of several machines
+            rows = self._connection.execute(
+                "SELECT aas_id, submodel_id, serial_number, aas_json, submodel_json FROM machines "
+                "WHERE serial_number = ? LIMIT 2", (key,)).fetchall()
+            if len(rows) > 1:
+                raise ValueError(f"Serial number {key} belongs to more than one machine; use its AAS ID")
+            row = rows[0] if rows else None
+        if row is None:
+            raise KeyError(key)
+        return (*row[:4], self._join(row[4]))
+
+    def get(self, key: str) -> Tuple[str, str]:
+        """Serialized ``(aas_json, submodel_json)`` of a machine, by AAS ID or serial number."""
+        return self._fetch(key)[3:]
+
+    def environment(self, key: str) -> str:
+        """The machine as AAS environment document."""
+        return environment_json(*self.get(key))
+
+    def values(self, key: str) -> Dict[str, Any]:
+        """Dotted-path values of a machine."""
+        return self.loader.read(self.get(key)[1])[1]
+
+    def submodel(self, key: str) -> model.Submodel:
+        """The machine's submodel, populated from the stored values."""
+        submodel_id, values = self.loader.read(self._fetch(key)[4])
+        return self.loader.build_submodel(submodel_id, values)
+
+    def iter_values(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream ``(aas_id, values)`` of every machine, ordered by AAS ID, one at a time."""
+        for aas_id, submodel_json in self._connection.execute(
+                "SELECT aas_id, submodel_json FROM machines ORDER BY aas_id"):
+            yield aas_id, self.loader.read(self._join(submodel_json))[1]
+
+    def __contains__(self, key: str) -> bool:
+        return self._connection.execute(
+            "SELECT 1 FROM machines WHERE aas_id = ? OR serial_number = ? LIMIT 1", (key, key)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """AAS IDs of all stored machines."""
+        return (row[0] for row in self._connection.execute("SELECT aas_id FROM machines ORDER BY aas_id"))
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM machines").fetchone()[0]
+
+    def serial_numbers(self) -> List[str]:
+        """Serial numbers of all stored machines that have one."""
+        return [row[0] for row in self._connection.execute(
+            "SELECT serial_number FROM machines WHERE serial_number IS NOT NULL ORDER BY serial_number")]
+
+    def deduplication(self) -> Dict[str, Any]:
+        """What sharing collections saves: references, distinct collections and UTF-8 bytes.
+
+        ``document_bytes`` is the size of all AAS and submodel documents as read
+        back, ``stored_bytes`` what the store keeps for them (AAS documents,
+        submodel documents with references, and every referenced collection
+        once); ``dedup_ratio`` is their quotient. SQLite's own overhead is not
+        counted; compare :meth:`file_size` for that.
+        """
+        sizes = dict(self._connection.execute("SELECT digest, length(CAST(json AS BLOB)) FROM collections"))
+        reference_size = len(collection_reference("0" * 32))
+        machines = references = document_bytes = stored_bytes = 0
+        used = set()
+        for aas_size, size, submodel_json in self._connection.execute(
+                "SELECT length(CAST(aas_json AS BLOB)), length(CAST(submodel_json AS BLOB)), submodel_json "
+                "FROM machines"):
+            digests = collection_references(submodel_json)
+            machines += 1
+            references += len(digests)
+            used.update(digests)
+            stored_bytes += aas_size + size
+            document_bytes += aas_size + size + sum(sizes[digest] - reference_size for digest in digests)
+        stored_bytes += sum(sizes[digest] for digest in used)
+        return {
+            "machines": machines,
+            "collection_references": references,
+            "distinct_collections": len(used),
+            "document_bytes": document_bytes,
+            "stored_bytes": stored_bytes,
+            "bytes_saved": document_bytes - stored_bytes,
+            "dedup_ratio": document_bytes / stored_bytes if stored_bytes else 1.0,
+        }
+
+    def file_size(self) -> int:
+        """Size of the database on disk, including its write-ahead log."""
+        return sum(os.path.getsize(path) for path in (self.path, self.path + "-wal") if os.path.exists(path))
+
+
+def store_fleet(rows: List[Dict[str, Any]], store: FleetStore,
+                aas_id_prefix: str = DEFAULT_AAS_ID_PREFIX,
+                submodel_id_prefix: str = DEFAULT_SUBMODEL_ID_PREFIX,
+                **fleet_kwargs) -> int:
+    """Build every machine of an inventory and write it into ``store``; returns the number of machines."""
+    serial_numbers = (split_inventory_row(row)[0] for row in rows)
+    pairs = build_fleet(rows, aas_id_prefix=aas_id_prefix, submodel_id_prefix=submodel_id_prefix, **fleet_kwargs)
+    return store.put_many(
+        (*machine_ids(serial_number, aas_id_prefix, submodel_id_prefix), serial_number, aas_json, submodel_json)
+        for serial_number, (aas_json, submodel_json) in zip(serial_numbers, pairs))
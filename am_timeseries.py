@@ -0,0 +1,261 @@
+import datetime
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from am_json import xsd_lexical
+from am_machine import EXPOSURE_UNIT_ID_SHORT
+
+
+# ============================================================================
+# PROCESS SIGNALS
+# ============================================================================
+
+@dataclass(frozen=True)
+class Signal:
+    """A monitored process signal, named by the dotted path of the element it belongs to."""
+    path: str
+    unit: Optional[str] = None
+    description: Optional[str] = None
+
+
+def process_signals(exposure_units: int = 1) -> Dict[str, Signal]:
+    """The process monitoring signals of a machine: laser power per exposure unit plus atmosphere signals."""
+    units = ["Exposure_unit"] + [EXPOSURE_UNIT_ID_SHORT.format(unit) for unit in range(2, exposure_units + 1)]
+    signals = [Signal(f"{unit}.laser_power", "W", "Actual laser power output") for unit in units]
+    signals.append(Signal("Atmosphere.oxygen_level", "ppm", "Residual oxygen in the process chamber"))
+    signals.append(Signal("Atmosphere.gas_flow", "m³/h", "Inert gas flow through the filtration system"))
+    return {signal.path: signal for signal in signals}
+
+
+# ============================================================================
+# RING BUFFER
+# ============================================================================
+
+class RingBuffer:
+    """Fixed-capacity buffer of ``(time, value)`` samples in two preallocated ``float64`` arrays.
+
+    Appending writes into the arrays in place and, once the buffer is full,
+    overwrites the oldest sample, so memory use is fixed at ``capacity`` samples
+    however long a machine runs. Times are seconds since the epoch (UTC).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"Ring buffer capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.times = np.empty(capacity, dtype=np.float64)
+        self.values = np.empty(capacity, dtype=np.float64)
+        self._next = 0  # position of the next write
+        self._count = 0
+        self.dropped = 0  # samples overwritten since creation
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.values.nbytes
+
+    def append(self, time: float, value: float) -> None:
+        """Add one sample in O(1)."""
+        position = self._next
+        self.times[position] = time
+        self.values[position] = value
+        self._next = position + 1 if position + 1 < self.capacity else 0
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self.dropped += 1
+
+    def extend(self, times: Any, values: Any) -> None:
+        """Add a batch of samples with at most two array copies, keeping the newest ``capacity``."""
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if times.shape != values.shape or times.ndim != 1:
+            raise ValueError("times and values must be 1-d arrays of the same length")
+        count = len(times)
+        self.dropped += max(0, self._count + count - self.capacity)
+        if count > self.capacity:
+            times, values = times[-self.capacity:], values[-self.capacity:]
+            count = self.capacity
+        first = min(count, self.capacity - self._next)
+        self.times[self._next:self._next + first] = times[:first]
+        self.values[self._next:self._next + first] = values[:first]
+        self.times[:count - first] = times[first:]
+        self.values[:count - first] = values[first:]
+        self._next = (self._next + count) % self.capacity
+        self._count = min(self.capacity, self._count + count)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Copies of the buffered times and values, oldest first."""
+        start = (self._next - self._count) % self.capacity
+        if start + self._count <= self.capacity:
+            window = slice(start, start + self._count)
+            return self.times[window].copy(), self.values[window].copy()
+        return (np.concatenate((self.times[start:], self.times[:self._next])),
+                np.concatenate((self.values[start:], self.values[:self._next])))
+
+
+def downsample(times: np.ndarray, values: np.ndarray, window: float) -> Dict[str, np.ndarray]:
+    """Minimum, maximum and mean of the samples in every ``window`` seconds, vectorized.
+
+    Windows are aligned to multiples of ``window`` since the epoch; only windows
+    with samples are returned. Returns the arrays ``start``, ``min``, ``max``,
+    ``mean`` and ``count``, one entry per window in time order.
+    """
+    if window <= 0:
+        raise ValueError(f"Window must be positive, got {window}")
+    if len(times) and np.any(times[1:] < times[:-1]):
+        order = np.argsort(times, kind="stable")
+        times, values = times[order], values[order]
+    bins = np.floor(times / window).astype(np.int64)
+    # First sample of every window
+    starts = np.flatnonzero(np.concatenate(([True], bins[1:] != bins[:-1]))) if len(bins) else np.empty(0, np.intp)
+    counts = np.diff(np.append(starts, len(bins)))
+    return {
+        "start": bins[starts] * window,
+        "min": np.minimum.reduceat(values, starts) if len(starts) else values[:0],
+        "max": np.maximum.reduceat(values, starts) if len(starts) else values[:0],
+        "mean": np.add.reduceat(values, starts) / counts if len(starts) else values[:0],
+        "count": counts,
+    }
+
+
+# ============================================================================
+# MACHINE TIME SERIES
+# ============================================================================
+
+TIME_SERIES_SEMANTIC_URI = "https://admin-shell.io/idta/TimeSeries"
+
+# Statistics of every signal per downsampled record
+_AGGREGATES = ("min", "max", "mean")
+
+
+def _utc(seconds: float) -> str:
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _reference_json(uri: str) -> Dict[str, Any]:
+    return {"type": "ExternalReference", "keys": [{"type": "GlobalReference", "value": uri}]}
+
+
+def _property_json(id_short: str, value: Any, value_type: str, semantic_uri: Optional[str] = None,
+                   unit: Optional[str] = None, description: Optional[str] = None) -> Dict[str, Any]:
+    """A property in AAS JSON, with members in the order the basyx encoder writes them."""
+    data: Dict[str, Any] = {"idShort": id_short}
+    if description:
+        data["description"] = [{"language": "en", "text": description}]
+    data["modelType"] = "Property"
+    if semantic_uri:
+        data["semanticId"] = _reference_json(semantic_uri)
+    if unit:
+        data["qualifiers"] = [{"value": unit, "kind": "ConceptQualifier", "valueType": "xs:string", "type": "unit"}]
+    if value is not None:
+        data["value"] = value
+    data["valueType"] = value_type
+    return data
+
+
+def _collection_json(id_short: str, elements: List[Dict[str, Any]],
+                     semantic_uri: Optional[str] = None) -> Dict[str, Any]:
+    data: Dict[str, Any] = {"idShort": id_short, "modelType": "SubmodelElementCollection"}
+    if semantic_uri:
+        data["semanticId"] = _reference_json(semantic_uri)
+    if elements:
+        data["value"] = elements
+    return data
+
+
+def _variable(path: str, aggregate: str) -> str:
+    """idShort of one aggregate of a signal, e.g. ``Exposure_unit_2_laser_power_max``."""
+    return f"{path.replace('.', '_')}_{aggregate}"
+
+
+class MachineTimeSeries:
+    """High-rate process signals of one machine, next to its static submodel.
+
+    Every signal has its own :class:`RingBuffer` of ``capacity`` samples, so
+    memory use is fixed (``16 * capacity`` bytes per signal) and recording never
+    allocates Python objects per sample. :meth:`segment_json` downsamples the
+    buffered samples into min/max/mean records per window, shaped like an
+    ``InternalSegment`` of the IDTA Time Series Data submodel, and
+    :meth:`submodel_json` wraps that segment in a Time Series submodel for the
+    machine (``<machine submodel ID>/TimeSeries`` by default).
+    """
+
+    def __init__(self, submodel_id: str, signals: Optional[Dict[str, Signal]] = None, capacity: int = 65536):
+        self.submodel_id = submodel_id
+        self.signals = signals if signals is not None else process_signals()
+        self.buffers = {path: RingBuffer(capacity) for path in self.signals}
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the sample buffers."""
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    def record(self, path: str, time: float, value: float) -> None:
+        """Append one sample of signal ``path``."""
+        self.buffers[path].append(time, value)
+
+    def record_many(self, path: str, times: Any, values: Any) -> None:
+        """Append a batch of samples of signal ``path``."""
+        self.buffers[path].extend(times, values)
+
+    def downsample(self, path: str, window: float) -> Dict[str, np.ndarray]:
+        """Per-window statistics of the buffered samples of one signal, see :func:`downsample`."""
+        return downsample(*self.buffers[path].arrays(), window)
+
+    def segment_json(self, window: float, name: str = "InternalSegment") -> Dict[str, Any]:
+        """The buffered samples downsampled to ``window`` seconds, as AAS JSON of a time series segment.
+
+        Every record holds its window start (``Time``) and the minimum, maximum and
+        mean of every signal with samples in that window.
+        """
+        windows: Dict[float, List[Dict[str, Any]]] = {}
+        for path, signal in self.signals.items():
+            statistics = self.downsample(path, window)
+            columns = [statistics[aggregate].tolist() for aggregate in _AGGREGATES]
+            for position, start in enumerate(statistics["start"].tolist()):
+                windows.setdefault(start, []).extend(
+                    _property_json(_variable(path, aggregate), xsd_lexical(column[position]), "xs:double",
+                                   unit=signal.unit)
+                    for aggregate, column in zip(_AGGREGATES, columns))
+
+        starts = sorted(windows)
+        records = []
+        for number, start in enumerate(starts):
+            time = _property_json("Time", _utc(start), "xs:dateTime", f"{TIME_SERIES_SEMANTIC_URI}/UtcTime/1/1")
+            records.append(_collection_json(f"Record{number}", [time] + windows[start],
+                                            f"{TIME_SERIES_SEMANTIC_URI}/Record/1/1"))
+        elements = [
+            _property_json("Name", name, "xs:string"),
+            _property_json("RecordCount", str(len(records)), "xs:long"),
+        ]
+        if starts:
+            elements.append(_property_json("StartTime", _utc(starts[0]), "xs:dateTime"))
+            elements.append(_property_json("EndTime", _utc(starts[-1] + window), "xs:dateTime"))
+        elements.append(_property_json("SamplingInterval", xsd_lexical(float(window)), "xs:double", unit="s"))
+        elements.append(_collection_json("Records", records, f"{TIME_SERIES_SEMANTIC_URI}/Records/1/1"))
+        return _collection_json(name, elements, f"{TIME_SERIES_SEMANTIC_URI}/Segments/InternalSegment/1/1")
+
+    def submodel_json(self, window: float, submodel_id: Optional[str] = None) -> Dict[str, Any]:
+        """AAS JSON of a Time Series submodel with the metadata of the signals and one downsampled segment."""
+        variables = [
+            _property_json(_variable(path, aggregate), None, "xs:double", unit=signal.unit,
+                           description=f"{aggregate.capitalize()} of {signal.description or path} per record")
+            for path, signal in self.signals.items() for aggregate in _AGGREGATES
+        ]
+        metadata = _collection_json("Metadata", [
+            _property_json("Name", f"Process signals of {self.submodel_id}", "xs:string"),
+            _collection_json("Record", variables, f"{TIME_SERIES_SEMANTIC_URI}/Record/1/1"),
+        ], f"{TIME_SERIES_SEMANTIC_URI}/Metadata/1/1")
+        segments = _collection_json("Segments", [self.segment_json(window)],
+                                    f"{TIME_SERIES_SEMANTIC_URI}/Segments/1/1")
+        return {
+            "modelType": "Submodel",
+            "id": submodel_id or f"{self.submodel_id}/TimeSeries",
+            "semanticId": _reference_json(f"{TIME_SERIES_SEMANTIC_URI}/1/1"),
+            "submodelElements": [metadata, segments],
+        }
@@ -0,0 +1,198 @@
+import asyncio
+import json
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+from urllib.parse import urlsplit
+
+from am_fleet import (
+    DEFAULT_AAS_ID_PREFIX, DEFAULT_SUBMODEL_ID_PREFIX, ProgressCallback, build_fleet, machine_ids, split_inventory_row
+)
+from am_server import encode_identifier
+
+
+# ============================================================================
+# ASYNC UPLOAD TO AN AAS REPOSITORY
+# ============================================================================
+
+# Statuses worth retrying: the server is overloaded or temporarily unavailable
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Methods that may be repeated when the connection fails after the request went out
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+
+class UploadError(RuntimeError):
+    """Raised when an object cannot be uploaded, after all retries."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, method: str, target: str, host: str, body: bytes) -> Tuple[int, bytes]:
+        self.writer.write(
+            f"{method} {target} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+        length = 0
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        payload = await self.reader.readexactly(length) if length else b""
+        return int(status_line.split(" ")[1]), payload
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AASRepositoryClient:
+    """Asyncio client uploading AAS and submodels to an AAS Part 2 repository.
+
+    Requests go over a pool of at most ``concurrency`` keep-alive connections,
+    which also bounds the number of requests in flight. Failed connects and
+    ``RETRY_STATUSES`` are retried up to ``retries`` times with exponential
+    backoff starting at ``backoff`` seconds. A connection that fails once the
+    request was sent is only retried for ``IDEMPOTENT_METHODS``: a POST may
+    have reached the server, and repeating it could create the object twice.
+
+    Use as ``async with AASRepositoryClient(url) as client: ...``.
+    """
+
+    def __init__(self, base_url: str, concurrency: int = 8, retries: int = 3, backoff: float = 0.05):
+        url = urlsplit(base_url)
+        if url.scheme != "http":
+            raise ValueError(f"Only plain http:// repositories are supported: {base_url}")
+        self.host = url.hostname or "localhost"
+        self.port = url.port or 80
+        self.prefix = url.path.rstrip("/")
+        self.retries = retries
+        self.backoff = backoff
+        self._slots = asyncio.Semaphore(concurrency)
+        self._idle: List[_Connection] = []
+        self.requests = 0
+
+    async def __aenter__(self) -> "AASRepositoryClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        while self._idle:
+            self._idle.pop().close()
+
+    async def request(self, method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+        """Send one request over a pooled connection, retrying transient failures."""
+        async with self._slots:
+            for attempt in range(self.retries + 1):
+                connection = None
+                try:
+                    self.requests += 1  # attempts, including failed connects
+                    connection = self._idle.pop() if self._idle else _Connection(
+                        *await asyncio.open_connection(self.host, self.port))
+                    status, payload = await connection.request(method, self.prefix + path, self.host, body)
+                except (OSError, asyncio.IncompleteReadError) as e:
+                    # OSError covers refused and reset connects as well as ConnectionError
+                    if connection is not None:
+                        connection.close()
+                    if attempt == self.retries or (connection is not None and method not in IDEMPOTENT_METHODS):
+                        raise UploadError(f"{method} {path} failed: {e}") from e
+                else:
+                    self._idle.append(connection)
+                    if status not in RETRY_STATUSES or attempt == self.retries:
+                        return status, payload
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def upsert(self, collection: str, identifier: str, body: bytes) -> bool:
+        """PUT the object if it exists, otherwise POST it; returns whether it was created.
+
+        ``collection`` is ``"shells"`` or ``"submodels"``.
+        """
+        status, payload = await self.request("PUT", f"/{collection}/{encode_identifier(identifier)}", body)
+        created = status == 404
+        if created:
+            status, payload = await self.request("POST", f"/{collection}", body)
+        if status >= 300:
+            raise UploadError(f"Uploading {identifier} failed with HTTP {status}: {payload[:200]!r}", status)
+        return created
+
+    async def upload_pair(self, aas_id: str, aas_json: str, submodel_id: str, submodel_json: str) -> bool:
+        """Upsert one machine's submodel and AAS; returns whether the AAS was new."""
+        await self.upsert("submodels", submodel_id, submodel_json.encode("utf-8"))
+        return await self.upsert("shells", aas_id, aas_json.encode("utf-8"))
+
+
+async def upload_machine(base_url: str, aas_json: str, submodel_json: str, **client_kwargs) -> bool:
+    """Upsert a single AAS/Submodel pair; returns whether the AAS was new."""
+    aas_id, submodel_id = json.loads(aas_json)["id"], json.loads(submodel_json)["id"]
+    async with AASRepositoryClient(base_url, **client_kwargs) as client:
+        return await client.upload_pair(aas_id, aas_json, submodel_id, submodel_json)
+
+
+async def upload_fleet(rows: List[Dict[str, Any]], base_url: str,
+                       concurrency: int = 8,
+                       retries: int = 3,
+                       aas_id_prefix: str = DEFAULT_AAS_ID_PREFIX,
+                       submodel_id_prefix: str = DEFAULT_SUBMODEL_ID_PREFIX,
+                       progress: Optional[ProgressCallback] = None,
+                       **fleet_kwargs) -> Dict[str, int]:
+    """Build every machine of an inventory and upsert it into the repository at ``base_url``.
+
+    Machines are built by :func:`am_fleet.build_fleet` (``fleet_kwargs`` are
+    passed on) in a background thread and uploaded by ``concurrency`` workers
+    through a bounded queue, so memory use and the number of open connections
+    do not grow with the fleet. Returns the number of created and updated machines.
+    """
+    ids = (machine_ids(split_inventory_row(row)[0], aas_id_prefix, submodel_id_prefix) for row in rows)
+    pairs: Iterator[Tuple[str, str]] = build_fleet(rows, aas_id_prefix=aas_id_prefix,
+                                                   submodel_id_prefix=submodel_id_prefix, **fleet_kwargs)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2 * concurrency)
+    counts = {"created": 0, "updated": 0}
+    total = len(rows)
+    loop = asyncio.get_running_loop()
+    building: Optional[asyncio.Future] = None  # next(pairs), running in the executor
+
+    async def produce() -> None:
+        nonlocal building
+        for aas_id, submodel_id in ids:
+            building = loop.run_in_executor(None, next, pairs)
+            # Shielded, so that cancelling produce() leaves the future following the thread
+            aas_json, submodel_json = await asyncio.shield(building)
+            await queue.put((aas_id, aas_json, submodel_id, submodel_json))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def upload(client: AASRepositoryClient) -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            counts["created" if await client.upload_pair(*item) else "updated"] += 1
+            if progress:
+                progress(counts["created"] + counts["updated"], total)
+
+    async with AASRepositoryClient(base_url, concurrency=concurrency, retries=retries) as client:
+        tasks = [asyncio.ensure_future(produce())] + [asyncio.ensure_future(upload(client)) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            # The generator cannot be closed while the executor is still inside next(pairs)
+            if building is not None and not building.done():
+                await asyncio.wait([building])
+            # Shuts down the process pool of build_fleet
+            pairs.close()
+    return counts
@@ -0,0 +1,302 @@
+import argparse
+import json
+import operator
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+
+from am_machine import (
+    ElementSpec, ValueCoercionError, ValueIssue, EXPOSURE_UNIT_COUNT, PROPERTY_CODE, COLLECTION_CODE, coerce_table,
+    compile_specification, exposure_units, machine_specification
+)
+
+
+# ============================================================================
+# RULES
+# ============================================================================
+
+_COMPARE = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+}
+
+
+@dataclass(frozen=True)
+class Compare:
+    """``<left> <op> <right>`` between two properties of every collection with semantic ID suffix ``scope``."""
+    scope: str
+    left: str
+    op: str
+    right: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.left} {self.op} {self.right}"
+
+
+@dataclass(frozen=True)
+class RequiredWhen:
+    """``path`` must have a value in every ``scope`` collection whose ``when`` property equals ``equals``.
+
+    Strings are compared case-insensitively.
+    """
+    scope: str
+    path: str
+    when: str
+    equals: Any
+
+    @property
+    def name(self) -> str:
+        return f"{self.path} required when {self.when} == {self.equals!r}"
+
+
+Rule = Union[Compare, RequiredWhen]
+
+# Cross-field rules of the machine specification. Scopes are semantic ID suffixes,
+# so a rule on "ExposureUnit" applies to every exposure unit of a multi-laser machine.
+MACHINE_RULES: Tuple[Rule, ...] = (
+    Compare("ExposureUnit", "beam_focus_diameter_min", "<=", "beam_focus_diameter_max"),
+    Compare("ExposureUnit", "laser_powers", "<=", "laser_source_rated_power"),
+    RequiredWhen("BuildVolume", "diameter", when="type", equals="cylindrical"),
+)
+
+# Properties no two machines of a batch may share: the AAS and Submodel IDs derive from the serial number
+UNIQUE_PATHS: Tuple[str, ...] = ("Info.serial_number",)
+
+
+# ============================================================================
+# VALIDATION REPORTS
+# ============================================================================
+
+@dataclass
+class Violation(ValueIssue):
+    """A value that breaks ``rule``: ``"type"``, ``"range"``, ``"unique"`` or the name of a cross-field rule."""
+    rule: str = "type"
+
+    def __str__(self) -> str:
+        return f"{super().__str__()} [{self.rule}]"
+
+
+@dataclass
+class ValidationReport:
+    """Every violation found in a batch of machines, plus the coerced rows."""
+    rows: List[Dict[str, Any]]
+    violations: List[Violation]
+
+    @property
+    def valid(self) -> bool:
+        return not self.violations
+
+    def invalid_rows(self) -> List[int]:
+        """Indexes of the machines with at least one violation."""
+        return sorted({violation.row for violation in self.violations})
+
+    def counts(self) -> Dict[str, int]:
+        """Number of violations per rule."""
+        return dict(Counter(violation.rule for violation in self.violations))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "machines": len(self.rows),
+            "invalid_machines": len(self.invalid_rows()),
+            "counts": self.counts(),
+            "violations": [{"row": v.row, "path": v.path, "value": v.value, "rule": v.rule, "message": v.message}
+                           for v in self.violations],
+        }
+
+
+class ValidationError(ValueCoercionError):
+    """Raised with the :class:`ValidationReport` of a batch that has violations."""
+
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        super().__init__(report.violations)
+
+
+# ============================================================================
+# COMPILED VALIDATOR
+# ============================================================================
+
+class _CompiledChecks:
+    """The checks of one specification as flat lists of column paths."""
+
+    def __init__(self, specification: Dict[str, ElementSpec], rules: Sequence[Rule]):
+        compiled = compile_specification(specification)
+        self.specification = specification
+        self.ranges: List[Tuple[str, Optional[float], Optional[float], str]] = [
+            (node.path, node.minimum, node.maximum, f" {node.unit}" if node.unit else "")
+            for node in compiled if node.type_code == PROPERTY_CODE
+            and (node.minimum is not None or node.maximum is not None)
+        ]
+        self.compares: List[Tuple[str, str, str, str]] = []
+        self.required: List[Tuple[str, str, str, Any]] = []
+        for rule in rules:
+            scopes = [node.path for node in compiled
+                      if node.type_code == COLLECTION_CODE and node.semantic_id_suffix == rule.scope]
+            for scope in scopes:
+                if isinstance(rule, Compare):
+                    left, right = self._resolve(compiled, scope, rule.left), self._resolve(compiled, scope, rule.right)
+                    self.compares.append((rule.name, left, rule.op, right))
+                else:
+                    path, when = self._resolve(compiled, scope, rule.path), self._resolve(compiled, scope, rule.when)
+                    equals = rule.equals.casefold() if isinstance(rule.equals, str) else rule.equals
+                    self.required.append((rule.name, path, when, equals))
+
+    @staticmethod
+    def _resolve(compiled, scope: str, name: str) -> str:
+        path = f"{scope}.{name}"
+        if path not in compiled or compiled[path].type_code != PROPERTY_CODE:
+            raise ValueError(f"Rule refers to {path}, which is not a property of the specification")
+        return path
+
+
+class FleetValidator:
+    """Validate whole batches of machines column by column against rules compiled from the specification.
+
+    Checks, in order: value types (:func:`am_machine.coerce_table`), the
+    ``minimum``/``maximum`` ranges of the element specs, cross-field
+    ``rules`` (:data:`MACHINE_RULES` by default), and that no two machines
+    share a value of the ``unique`` paths; every repetition after the first
+    is a ``"unique"`` violation. The checks are compiled once
+    per specification into lists of column paths, so validating a batch runs a
+    few comprehensions per column rather than per machine and rule.
+
+    Without an explicit specification, every machine is checked against
+    :func:`am_machine.machine_specification` for its number of exposure units.
+    A machine whose number of units is outside the range of
+    ``Info.exposure_unit_count`` is checked as a single-unit machine, where
+    the count fails its range check, so no specification is built for it.
+    """
+
+    def __init__(self, specification: Optional[Dict[str, ElementSpec]] = None,
+                 rules: Sequence[Rule] = MACHINE_RULES, unique: Sequence[str] = UNIQUE_PATHS):
+        self.specification = specification
+        self.rules = tuple(rules)
+        self.unique = tuple(unique)
+        self._compiled: Dict[int, _CompiledChecks] = {}
+
+    def _checks(self, specification: Dict[str, ElementSpec]) -> _CompiledChecks:
+        checks = self._compiled.get(id(specification))
+        if checks is None or checks.specification is not specification:
+            checks = self._compiled[id(specification)] = _CompiledChecks(specification, self.rules)
+        return checks
+
+    def validate(self, rows: List[Dict[str, Any]]) -> ValidationReport:
+        """Coerce and check a batch of machines given as dotted-path values (raw or coerced)."""
+        groups: Dict[int, List[int]] = {}
+        minimum, maximum = EXPOSURE_UNIT_COUNT.minimum, EXPOSURE_UNIT_COUNT.maximum
+        for i, values in enumerate(rows):
+            units = 1
+            if self.specification is None:
+                try:
+                    units = exposure_units(values)
+                except (TypeError, ValueError):
+                    pass  # the invalid count is reported with the other values
+                if not minimum <= units <= maximum:
+                    # Checked before grouping, so no specification is built for an absurd count; the
+                    # range check of Info.exposure_unit_count (or the unknown unit paths) reports it
+                    units = 1
+            groups.setdefault(units, []).append(i)
+
+        coerced: List[Dict[str, Any]] = [{} for _ in rows]
+        violations: List[Violation] = []
+        for units, members in groups.items():
+            specification = self.specification if self.specification is not None else machine_specification(units)
+            group_rows, group_violations = self._validate_group([rows[i] for i in members], specification)
+            for i, values in zip(members, group_rows):
+                coerced[i] = values
+            for violation in group_violations:
+                violation.row = members[violation.row]
+            violations.extend(group_violations)
+        # Across groups, so machines with different numbers of exposure units are compared too
+        for path in self.unique:
+            first: Dict[Any, int] = {}
+            for i, values in enumerate(coerced):
+                value = values.get(path)
+                if value is None:
+                    continue
+                if value in first:
+                    violations.append(Violation(path, value, f"same as row {first[value]}", i, "unique"))
+                else:
+                    first[value] = i
+        violations.sort(key=lambda violation: (violation.row, violation.path))
+        return ValidationReport(coerced, violations)
+
+    def _validate_group(self, rows: List[Dict[str, Any]], specification: Dict[str, ElementSpec]
+                        ) -> Tuple[List[Dict[str, Any]], List[Violation]]:
+        checks = self._checks(specification)
+        coerced, issues = coerce_table(rows, specification)
+        violations = [Violation(issue.path, issue.value, issue.message, issue.row) for issue in issues]
+        columns: Dict[str, List[Any]] = {}
+
+        def column(path: str) -> List[Any]:
+            if path not in columns:
+                columns[path] = [row.get(path) for row in coerced]
+            return columns[path]
+
+        for path, minimum, maximum, unit in checks.ranges:
+            values = column(path)
+            if minimum is not None:
+                violations.extend(Violation(path, value, f"below minimum {minimum}{unit}", i, "range")
+                                  for i, value in enumerate(values) if value is not None and value < minimum)
+            if maximum is not None:
+                violations.extend(Violation(path, value, f"above maximum {maximum}{unit}", i, "range")
+                                  for i, value in enumerate(values) if value is not None and value > maximum)
+
+        for name, left, op, right in checks.compares:
+            compare = _COMPARE[op]
+            violations.extend(Violation(left, a, f"must be {op} {right} ({b!r})", i, name)
+                              for i, (a, b) in enumerate(zip(column(left), column(right)))
+                              if a is not None and b is not None and not compare(a, b))
+
+        for name, path, when, equals in checks.required:
+            violations.extend(
+                Violation(path, None, f"required because {when} is {condition!r}", i, name)
+                for i, (value, condition) in enumerate(zip(column(path), column(when)))
+                if value is None and condition is not None
+                and (condition.casefold() if isinstance(condition, str) else condition) == equals)
+
+        return coerced, violations
+
+
+def validate_machines(rows: List[Dict[str, Any]],
+                      specification: Optional[Dict[str, ElementSpec]] = None) -> ValidationReport:
+    """Validate a batch of machines with the machine rules; see :class:`FleetValidator`."""
+    return FleetValidator(specification).validate(rows)
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="am_machine.py validate",
+        description="Check an inventory (CSV or JSONL) against value types, ranges and cross-field rules"
+    )
+    parser.add_argument("inventory", help="Machine inventory (CSV or JSONL)")
+    parser.add_argument("--report", metavar="PATH", help="Write the full report as JSON")
+    parser.add_argument("--limit", type=int, default=20, help="Number of violations to print (default: 20)")
+    args = parser.parse_args(argv)
+
+    import am_fleet
+    rows = am_fleet.read_inventory(args.inventory)
+    report = FleetValidator().validate([am_fleet.split_inventory_row(row)[1] for row in rows])
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False, default=str)
+
+    if report.valid:
+        print(f"✓ {len(rows)} machines valid: {args.inventory}")
+        return
+    print(f"✗ {len(report.invalid_rows())} of {len(rows)} machines invalid, {len(report.violations)} violation(s):",
+          file=sys.stderr)
+    for rule, count in sorted(report.counts().items()):
+        print(f"  {count:>6}  {rule}", file=sys.stderr)
+    for violation in report.violations[:args.limit]:
+        print(f"  - {violation}", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
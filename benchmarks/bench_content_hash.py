@@ -0,0 +1,71 @@
+"""Content hashing: comparing snapshots by Merkle digests instead of element by element.
+
+Builds two snapshots of a machine with ``--units`` exposure units, changes one
+property of the newer one and reports, per comparison, the time to
+
+* ``full diff``:   :func:`am_patch.diff_submodels` walking every element,
+* ``hashed diff``: the same with a :class:`am_model.SubmodelHasher` per snapshot,
+  after the change (only the changed path is rehashed),
+* ``rehash``:      one property write followed by :meth:`SubmodelHasher.digest`,
+
+plus the one-off cost of hashing a whole submodel.
+
+    python benchmarks/bench_content_hash.py [--units 1 8 32] [--repeat 500]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from am_machine import compile_specification, machine_specification
+from am_model import PBFLBMSubmodelBuilder, SemanticCache, SubmodelHasher
+from am_patch import diff_submodels
+
+
+def _per_call_us(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for n in range(repeat):
+        function(n)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(unit_counts, repeat: int) -> None:
+    print(f"{'units':>6} {'elements':>9} {'hash all µs':>12} {'full diff µs':>13} {'hashed diff µs':>15} "
+          f"{'rehash µs':>10} {'speedup':>8}")
+    for units in unit_counts:
+        specification = machine_specification(units)
+        builder = PBFLBMSubmodelBuilder(specification=specification, cache=SemanticCache())
+        _, old = builder.build_aas_and_submodel("urn:aas:old", "urn:sm:old")
+        _, new = builder.build_aas_and_submodel("urn:aas:new", "urn:sm:new")
+        power = new.get_referable(["Exposure_unit", "laser_powers"])
+        power.value = 200.0
+
+        start = time.perf_counter()
+        old_hashes, new_hashes = SubmodelHasher(old), SubmodelHasher(new)
+        old_hashes.digest()
+        new_hashes.digest()
+        hash_all = (time.perf_counter() - start) / 2 * 1e6
+
+        assert diff_submodels(old, new, old_hashes, new_hashes) == diff_submodels(old, new)
+        full = _per_call_us(lambda n: diff_submodels(old, new), repeat)
+        hashed = _per_call_us(lambda n: diff_submodels(old, new, old_hashes, new_hashes), repeat)
+
+        def rehash(n):
+            power.value = float(n)
+            new_hashes.digest()
+
+        rehash_us = _per_call_us(rehash, repeat)
+        print(f"{units:>6} {len(compile_specification(specification)):>9} {hash_all:>12.1f} {full:>13.1f} "
+              f"{hashed:>15.1f} {rehash_us:>10.1f} {full / hashed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeat", type=int, default=500, help="Comparisons timed per unit count")
+    args = parser.parse_args()
+    run(args.units, args.repeat)
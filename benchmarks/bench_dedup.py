@@ -0,0 +1,70 @@
+"""Deduplicated fleet store: space saved by sharing identical collections, and what it costs.
+
+Writes the same fleet into a plain and a deduplicated :class:`am_store.FleetStore`
+and reports for each the time to store all machines, the time to read every
+machine back as an environment document, and the compacted file size, plus the
+dedup report (:meth:`FleetStore.deduplication`) of the deduplicated store.
+Without ``--inventory`` a synthetic fleet is used whose machines come in
+``--models`` models that differ in their PLC, MCSW and exposure unit values.
+
+    python benchmarks/bench_dedup.py [--inventory machines.csv] [--machines 2000] [--models 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import am_fleet
+from am_store import FleetStore, store_fleet
+
+
+def _synthetic_fleet(machines: int, models: int) -> list:
+    return [{
+        "serial_number": f"SN-{n:06d}",
+        "Info.manufacturer_brand": "EOS",
+        "PLC.software_version": f"4.{n % models}",
+        "MCSW.control_system": f"CS-{n % models}",
+        "Exposure_unit.laser_source_rated_power": 400.0 * (1 + n % models),
+    } for n in range(machines)]
+
+
+def run(rows: list) -> None:
+    print(f"{'mode':>13} {'store s':>8} {'read s':>7} {'file MB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for deduplicate in (False, True):
+            path = os.path.join(directory, f"fleet-{deduplicate}.db")
+            with FleetStore(path, deduplicate=deduplicate) as store:
+                start = time.perf_counter()
+                store_fleet(rows, store, workers=1, direct=True)
+                stored = time.perf_counter() - start
+                start = time.perf_counter()
+                for aas_id in store:
+                    store.environment(aas_id)
+                read = time.perf_counter() - start
+                store.compact()
+                print(f"{'deduplicated' if deduplicate else 'plain':>13} {stored:>8.2f} {read:>7.2f} "
+                      f"{store.file_size() / 1e6:>8.2f}")
+                if deduplicate:
+                    savings = store.deduplication()
+    print(f"\n{savings['machines']} machines, {savings['collection_references']} shared collections, "
+          f"{savings['distinct_collections']} distinct")
+    print(f"dedup ratio {savings['dedup_ratio']:.2f}x: {savings['stored_bytes']:,} of "
+          f"{savings['document_bytes']:,} bytes stored, {savings['bytes_saved']:,} saved")
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inventory", help="Machine inventory (CSV or JSONL) to measure instead of a synthetic fleet")
+    parser.add_argument("--machines", type=int, default=2000, help="Size of the synthetic fleet")
+    parser.add_argument("--models", type=int, default=5, help="Distinct machine models in the synthetic fleet")
+    args = parser.parse_args()
+    if args.inventory:
+        rows = am_fleet.coerce_inventory(am_fleet.read_inventory(args.inventory))
+    else:
+        rows = _synthetic_fleet(args.machines, args.models)
+    run(rows)
@@ -0,0 +1,73 @@
+"""Update-rate benchmark for live telemetry: incremental vs. full re-serialization.
+
+For every fraction of changed properties, each round writes new values to a
+random sample of properties of every machine and re-serializes the submodel,
+either with :class:`IncrementalSubmodelSerializer` or with a full
+``json.dumps(submodel, cls=AASToJsonEncoder)``.
+
+    python benchmarks/bench_dirty_updates.py [--machines 200] [--rounds 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from basyx.aas import model
+from basyx.aas.adapter.json import AASToJsonEncoder
+
+from am_machine import PBFLBMSubmodelBuilder
+from am_json import IncrementalSubmodelSerializer
+
+FRACTIONS = (0.02, 0.1, 0.25, 0.5, 1.0)
+
+
+def _new_value(prop, rng):
+    if prop.value_type is model.datatypes.Boolean:
+        return rng.random() < 0.5
+    if prop.value_type is model.datatypes.String:
+        return f"v{rng.randrange(1000)}"
+    if issubclass(prop.value_type, int):
+        return prop.value_type(rng.randrange(1000))
+    return rng.random() * 1000.0
+
+
+def run(machines: int, rounds: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    builder = PBFLBMSubmodelBuilder()
+    fleet = []
+    for _ in range(machines):
+        aas, submodel, index = builder.build_aas_and_submodel(with_index=True)
+        properties = [element for element in index.values() if isinstance(element, model.Property)]
+        serializer = IncrementalSubmodelSerializer(submodel)
+        serializer.to_json()
+        fleet.append((submodel, properties, serializer))
+
+    print(f"{machines} machines, {len(fleet[0][1])} properties each, {rounds} rounds")
+    print(f"{'fraction':>8} {'incremental/s':>14} {'full/s':>10} {'speedup':>8}")
+    for fraction in FRACTIONS:
+        count = max(1, round(fraction * len(fleet[0][1])))
+        rates = []
+        for incremental in (True, False):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for submodel, properties, serializer in fleet:
+                    for prop in rng.sample(properties, count):
+                        prop.value = _new_value(prop, rng)
+                    if incremental:
+                        serializer.to_json()
+                    else:
+                        json.dumps(submodel, cls=AASToJsonEncoder)
+            rates.append(rounds * machines / (time.perf_counter() - start))
+        print(f"{fraction:>8.2f} {rates[0]:>14.0f} {rates[1]:>10.0f} {rates[0] / rates[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--machines", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.machines, args.rounds)
@@ -0,0 +1,84 @@
+"""Multi-laser machines: build and serialization cost per number of exposure units.
+
+For machines with 1 to 64 exposure units (``machine_specification(n)``) reports,
+per machine, the time to
+
+* ``build``:     clone the compiled template (:meth:`PBFLBMSubmodelBuilder.build_aas_and_submodel`)
+  and set one value per unit,
+* ``serialize``: encode the built submodel with basyx's ``AASToJsonEncoder``,
+* ``emit``:      emit the same document straight from the specification (``--direct``),
+
+plus the one-off template compilation and the marginal cost of every unit
+beyond the first. Costs should grow linearly with the number of units.
+
+    python benchmarks/bench_exposure_units.py [--units 1 2 4 8 16 32 64] [--machines 200]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from basyx.aas.adapter.json import AASToJsonEncoder
+
+from am_machine import EXPOSURE_UNIT_ID_SHORT, compile_specification, machine_specification
+from am_model import PBFLBMSubmodelBuilder, SemanticCache
+from am_json import SubmodelJSONEmitter
+
+
+def _unit_values(units: int) -> dict:
+    values = {"Info.exposure_unit_count": units, "Exposure_unit.laser_source_serial_number": "L-1"}
+    for unit in range(2, units + 1):
+        values[f"{EXPOSURE_UNIT_ID_SHORT.format(unit)}.laser_source_serial_number"] = f"L-{unit}"
+    return values
+
+
+def _per_machine_us(function, machines: int) -> float:
+    start = time.perf_counter()
+    for n in range(machines):
+        function(n)
+    return (time.perf_counter() - start) / machines * 1e6
+
+
+def run(unit_counts, machines: int) -> None:
+    print(f"{'units':>6} {'elements':>9} {'template ms':>12} {'build µs':>9} {'serialize µs':>13} "
+          f"{'emit µs':>8} {'build µs/unit':>14} {'emit µs/unit':>13}")
+    first = None
+    for units in unit_counts:
+        specification = machine_specification(units)
+        values = _unit_values(units)
+        builder = PBFLBMSubmodelBuilder(specification=specification, cache=SemanticCache())
+        start = time.perf_counter()
+        builder.compile_template()
+        template = (time.perf_counter() - start) * 1e3
+
+        def build(n):
+            _, submodel = builder.build_aas_and_submodel(f"urn:aas:{n}", f"urn:sm:{n}")
+            builder.set_values(submodel, values)
+            return submodel
+
+        submodel = build(0)
+        build_us = _per_machine_us(build, machines)
+        serialize_us = _per_machine_us(lambda n: json.dumps(submodel, cls=AASToJsonEncoder), machines)
+        emitter = SubmodelJSONEmitter(specification=specification)
+        emit_us = _per_machine_us(lambda n: emitter.emit_pair(values, f"urn:aas:{n}", f"urn:sm:{n}"), machines)
+
+        if first is None:
+            first = (units, build_us, emit_us)
+        extra = units - first[0]
+        marginal = (f"{(build_us - first[1]) / extra:>14.1f} {(emit_us - first[2]) / extra:>13.1f}" if extra
+                    else f"{'-':>14} {'-':>13}")
+        print(f"{units:>6} {len(compile_specification(specification)):>9} {template:>12.2f} {build_us:>9.1f} "
+              f"{serialize_us:>13.1f} {emit_us:>8.1f} {marginal}")
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--machines", type=int, default=200, help="Machines built per unit count")
+    args = parser.parse_args()
+    run(args.units, args.machines)
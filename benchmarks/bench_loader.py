@@ -0,0 +1,93 @@
+"""Loading submodel JSON files: spec-aware loader vs. the generic basyx deserializer.
+
+Writes ``--files`` machine documents in the format of ``am_machine.py`` to a
+temporary directory, then reads all of them with
+
+* ``basyx``:    ``read_aas_json_file`` (full object graph, validated),
+* ``values``:   :meth:`SubmodelJSONLoader.load_values` (flat path -> value),
+* ``submodel``: :meth:`SubmodelJSONLoader.load_submodel` (populated template clone),
+
+and reports files per second and the peak memory of holding all results.
+
+    python benchmarks/bench_loader.py [--files 500]
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from basyx.aas import model
+from basyx.aas.adapter.json import read_aas_json_file
+
+from am_machine import PBFLBMSubmodelBuilder, property_specs
+from am_json import SubmodelJSONEmitter, SubmodelJSONLoader, environment_json
+
+
+def _random_values(rng):
+    values = {}
+    for path, spec in property_specs().items():
+        if spec.value_type is model.datatypes.String:
+            values[path] = f"value-{rng.randrange(10 ** 6)}"
+        elif spec.value_type is model.datatypes.Boolean:
+            values[path] = rng.random() < 0.5
+        elif spec.value_type is model.datatypes.Integer:
+            values[path] = rng.randrange(100)
+        else:
+            values[path] = rng.random() * 1000
+    return values
+
+
+def _read_basyx(path):
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    return read_aas_json_file(io.StringIO(document))
+
+
+def run(files: int) -> None:
+    rng = random.Random(0)
+    emitter = SubmodelJSONEmitter(ensure_ascii=False)
+    loader = SubmodelJSONLoader()
+    builder = PBFLBMSubmodelBuilder()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for n in range(files):
+            document = environment_json(*emitter.emit_pair(_random_values(rng), f"urn:aas:{n}", f"urn:sm:{n}"))
+            paths.append(os.path.join(directory, f"machine_{n}.json"))
+            with open(paths[-1], "w", encoding="utf-8") as f:
+                f.write(json.dumps(document, ensure_ascii=False))
+
+        readers = {
+            "basyx": _read_basyx,
+            "values": loader.load_values,
+            "submodel": lambda path: loader.load_submodel(path, builder),
+        }
+        print(f"{files} files")
+        print(f"{'reader':>8} {'files/s':>9} {'peak MiB':>9}")
+        for name, read in readers.items():
+            start = time.perf_counter()
+            for path in paths:
+                read(path)
+            elapsed = time.perf_counter() - start
+            # Separate pass, as tracing slows allocation down
+            tracemalloc.start()
+            results = [read(path) for path in paths]
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del results
+            print(f"{name:>8} {files / elapsed:>9.0f} {peak / 2 ** 20:>9.1f}")
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=500)
+    args = parser.parse_args()
+    run(args.files)
@@ -0,0 +1,81 @@
+"""Fleet queries: per-property index intersection vs. a full scan.
+
+Builds a :class:`FleetIndex` over fleets of random machines and answers
+
+* ``selective``: ``laser_source_rated_power>=900``, ``z_dimension>550``, ``control_system==X``
+  (few matches),
+* ``broad``:     ``laser_source_rated_power>=400``, ``z_dimension>300``, ``remote_control==true``
+  (about a third of the fleet),
+
+reporting the time to build the index and the mean time per query with
+:meth:`FleetIndex.query` and :meth:`FleetIndex.scan`.
+
+    python benchmarks/bench_query.py [--sizes 1000 10000 100000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from basyx.aas import model
+
+from am_machine import property_specs
+from am_query import FleetIndex
+
+QUERIES = {
+    "selective": ["laser_source_rated_power>=900", "z_dimension>550", "control_system==X"],
+    "broad": ["laser_source_rated_power>=400", "z_dimension>300", "remote_control==true"],
+}
+
+
+def _records(machines, rng):
+    specs = property_specs()
+    for n in range(machines):
+        values = {}
+        for path, spec in specs.items():
+            if spec.value_type is model.datatypes.String:
+                values[path] = f"value-{rng.randrange(100)}"
+            elif spec.value_type is model.datatypes.Boolean:
+                values[path] = rng.random() < 0.5
+            elif spec.value_type is model.datatypes.Integer:
+                values[path] = rng.randrange(1, 9)
+            else:
+                values[path] = rng.random() * 1000
+        values["Info.build_volume.z_dimension"] = float(rng.randrange(100, 600))
+        values["MCSW.control_system"] = rng.choice("XYZW")
+        yield f"urn:aas:{n}", values
+
+
+def _mean_seconds(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run(sizes, repeat: int) -> None:
+    print(f"{'machines':>9} {'build s':>8} {'query':>10} {'matches':>8} {'index ms':>9} {'scan ms':>9} {'speedup':>8}")
+    for machines in sizes:
+        start = time.perf_counter()
+        index = FleetIndex(_records(machines, random.Random(0)))
+        build = time.perf_counter() - start
+        for name, texts in QUERIES.items():
+            predicates = [index.parse(text) for text in texts]
+            indexed, rows = _mean_seconds(lambda: index.query(*predicates), repeat)
+            scanned, expected = _mean_seconds(lambda: index.scan(*predicates), max(1, repeat // 10))
+            assert rows == expected
+            print(f"{machines:>9} {build:>8.2f} {name:>10} {len(rows):>8} {indexed * 1e3:>9.3f} "
+                  f"{scanned * 1e3:>9.2f} {scanned / indexed:>7.0f}x")
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,97 @@
+"""Load test for the asyncio AAS server: requests per second and latency percentiles.
+
+Starts an :class:`AASServer` in-process on a free port, opens ``--clients``
+keep-alive connections and issues GET requests for whole submodels and single
+elements. A share of the requests revalidates with ``If-None-Match`` (answered
+with 304), and a background task pushes value updates to exercise cache
+invalidation.
+
+    python benchmarks/bench_server_load.py [--machines 20] [--clients 32] [--requests 200]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from am_server import AASRepository, AASServer, encode_identifier
+
+PATHS = ("", "/submodel-elements/Info", "/submodel-elements/Info.build_volume.x_dimension",
+         "/submodel-elements/Exposure_unit.laser_powers", "/submodel-elements")
+
+
+async def _client(port, targets, count, revalidate, latencies, rng):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    etags = {}
+    for _ in range(count):
+        target = rng.choice(targets)
+        headers = f"If-None-Match: {etags[target]}\r\n" if target in etags and rng.random() < revalidate else ""
+        start = time.perf_counter()
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode())
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.split(b"\r\n"):
+            name, _, value = line.partition(b": ")
+            if name == b"Content-Length":
+                length = int(value)
+            elif name == b"ETag":
+                etags[target] = value.decode()
+        if length:
+            await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def _updates(repository, interval, rng, stop):
+    indexes = [repository.index(submodel_id) for submodel_id in repository.submodel_ids]
+    while not stop.is_set():
+        rng.choice(indexes).set_value("Exposure_unit.laser_powers", rng.random() * 400)
+        await asyncio.sleep(interval)
+
+
+async def run(machines, clients, requests, revalidate, update_interval, seed=0):
+    rng = random.Random(seed)
+    repository = AASRepository()
+    for n in range(machines):
+        repository.add_machine(f"https://acplt.org/PBF-LB-M_AAS/SN-{n:04d}",
+                               f"https://acplt.org/PBF-LB-M_Submodel/SN-{n:04d}")
+    targets = [f"/submodels/{encode_identifier(submodel_id)}{path}"
+               for submodel_id in repository.submodel_ids for path in PATHS]
+
+    server = AASServer(repository, port=0)
+    await server.start()
+    stop = asyncio.Event()
+    updater = asyncio.create_task(_updates(repository, update_interval, rng, stop)) if update_interval else None
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(server.port, targets, requests, revalidate, latencies,
+                                   random.Random(seed + n)) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    if updater:
+        await updater
+    await server.close()
+
+    latencies.sort()
+    percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"{len(latencies)} requests from {clients} clients against {machines} machines")
+    print(f"  throughput: {len(latencies) / elapsed:,.0f} requests/s")
+    print(f"  latency:    p50 {percentile(0.5):.2f} ms, p99 {percentile(0.99):.2f} ms")
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--machines", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("--revalidate", type=float, default=0.5,
+                        help="Share of repeated requests sent with If-None-Match")
+    parser.add_argument("--update-interval", type=float, default=0.001,
+                        help="Seconds between value updates (0 disables updates)")
+    args = parser.parse_args()
+    asyncio.run(run(args.machines, args.clients, args.requests, args.revalidate, args.update_interval))
@@ -0,0 +1,76 @@
+"""CLI startup: which paths import basyx, and what it costs.
+
+Runs every scenario ``--runs`` times in a fresh interpreter under
+``python -X importtime`` and reports the median wall time, the time spent in
+imports and the part of it spent importing ``basyx`` (0 when it is never imported).
+
+* ``import``:        ``import am_machine``
+* ``stats+direct``:  ``am_machine.py --stats --direct`` (specification only)
+* ``stats``:         ``am_machine.py --stats`` (builds basyx objects)
+* ``basyx``:         ``import basyx.aas.model, basyx.aas.adapter.json`` for reference
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from am_profile import parse_importtime
+
+
+def import_times(stderr: str) -> Tuple[int, int]:
+    """Total and basyx import time in microseconds from ``-X importtime`` output.
+
+    Each line holds the cumulative time of a module and is indented by nesting
+    level; a package imported inside another one is counted with its importer.
+    """
+    total = basyx = 0
+    stack: List[str] = []  # names of the enclosing imports, outermost first
+    # Imports are printed when they finish, so children come before their parent
+    for name, depth, cumulative in reversed(parse_importtime(stderr)):
+        del stack[depth:]
+        if depth == 0:
+            total += cumulative
+        if name.split(".")[0] == "basyx" and not any(parent.split(".")[0] == "basyx" for parent in stack):
+            basyx += cumulative
+        stack.append(name)
+    return total, basyx
+
+
+def run(runs: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "machine.json")
+        scenarios = {
+            "import": ["-c", "import am_machine"],
+            "stats+direct": ["am_machine.py", "--stats", "--direct", "-o", output],
+            "stats": ["am_machine.py", "--stats", "-o", output],
+            "basyx": ["-c", "import basyx.aas.model, basyx.aas.adapter.json"],
+        }
+        print(f"{'scenario':>13} {'wall ms':>8} {'imports ms':>11} {'basyx ms':>9}")
+        for name, args in scenarios.items():
+            walls, imports, basyx = [], [], []
+            for _ in range(runs):
+                start = time.perf_counter()
+                result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=ROOT,
+                                        capture_output=True, text=True, check=True)
+                walls.append(time.perf_counter() - start)
+                total, basyx_us = import_times(result.stderr)
+                imports.append(total)
+                basyx.append(basyx_us)
+            print(f"{name:>13} {statistics.median(walls) * 1e3:>8.1f} {statistics.median(imports) / 1e3:>11.1f} "
+                  f"{statistics.median(basyx) / 1e3:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    run(args.runs)
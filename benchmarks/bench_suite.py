@@ -0,0 +1,252 @@
+"""Benchmark suite for the builder and serializers, with regression baselines.
+
+Cases, each for ``--sizes`` machines with the machine specification and for
+``--spec-machines`` machines with synthetic specifications ``--spec-scales``
+times the size of the machine specification:
+
+* ``build``:        :meth:`PBFLBMSubmodelBuilder.build_aas_and_submodel`
+* ``statistics``:   :meth:`PBFLBMSubmodelBuilder.get_statistics` of a built submodel (walked)
+* ``serialize``:    ``json.dumps(object_store_to_json(store))``, stores of up to 1000 machines
+* ``write``:        the file write of ``am_machine.py``: basyx objects through
+  :class:`EnvironmentJSONWriter` as JSON string literal into a file
+* ``write_direct``: the same with ``--direct``, emitted from the specification
+
+Only the named step is timed; objects it needs are built beforehand, in chunks
+of 1000 machines so 100k machines fit in memory. Every case runs ``--repeat``
+times (more often for small sizes) and the fastest run counts.
+
+    python benchmarks/bench_suite.py --save benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json [--threshold 0.2]
+    python benchmarks/bench_suite.py --sizes 1 100 --spec-scales 1 10   # quick run
+
+With ``--compare`` the exit status is 1 if any case is slower than its baseline
+by more than ``--threshold`` (a fraction) and by more than ``--noise-floor``
+seconds. Baselines are only comparable on the same machine.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import warnings
+from importlib import metadata
+from typing import Dict, Any, List, Optional, Callable, Iterator, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from basyx.aas import model
+from basyx.aas.adapter import json as aas_json
+
+from am_machine import ElementSpec, ElementType, MACHINE_SPECIFICATION, datatypes, property_specs
+from am_model import PBFLBMSubmodelBuilder
+from am_json import EnvironmentJSONWriter, SubmodelJSONEmitter
+
+CHUNK = 1000
+
+_VALUE_TYPES = (datatypes.String, datatypes.Double, datatypes.Integer, datatypes.Boolean)
+
+
+def synthetic_specification(scale: int) -> Dict[str, ElementSpec]:
+    """A specification shaped like the machine specification with ``scale`` times its properties.
+
+    Collections of ten properties, every third of them nested one level deeper.
+    """
+    properties = scale * len(property_specs())
+    specification: Dict[str, ElementSpec] = {}
+    for c in range(0, properties, 10):
+        children = {}
+        for p in range(c, min(c + 10, properties)):
+            value_type = _VALUE_TYPES[p % len(_VALUE_TYPES)]
+            children[f"property_{p}"] = ElementSpec(
+                id_short=f"property_{p}", element_type=ElementType.PROPERTY, value_type=value_type,
+                unit="mm" if value_type is datatypes.Double else None, description=f"Synthetic property {p}")
+        collection = ElementSpec(id_short=f"Collection_{c // 10}", element_type=ElementType.COLLECTION,
+                                 description="Synthetic collection", children=children,
+                                 semantic_id_suffix=f"Collection_{c // 10}")
+        if c // 10 % 3 == 2:
+            parent = specification[f"Collection_{c // 10 - 1}"]
+            parent.children[collection.id_short] = collection
+        else:
+            specification[collection.id_short] = collection
+    return specification
+
+
+def _chunks(machines: int) -> Iterator[range]:
+    for start in range(0, machines, CHUNK):
+        yield range(start, min(start + CHUNK, machines))
+
+
+def _build_chunk(builder: PBFLBMSubmodelBuilder, ids: range) -> List[Tuple[Any, Any]]:
+    return [builder.build_aas_and_submodel(f"urn:aas:{n}", f"urn:sm:{n}") for n in ids]
+
+
+# ---------------------------------------------------------------------------
+# Cases: each returns the seconds spent in the measured step for all machines
+# ---------------------------------------------------------------------------
+
+def case_build(machines: int, specification: Dict[str, ElementSpec]) -> float:
+    builder = PBFLBMSubmodelBuilder(specification=specification)
+    builder.compile_template()
+    start = time.perf_counter()
+    for n in range(machines):
+        builder.build_aas_and_submodel(f"urn:aas:{n}", f"urn:sm:{n}")
+    return time.perf_counter() - start
+
+
+def case_statistics(machines: int, specification: Dict[str, ElementSpec]) -> float:
+    builder = PBFLBMSubmodelBuilder(specification=specification)
+    _, submodel = builder.build_aas_and_submodel()
+    start = time.perf_counter()
+    for _ in range(machines):
+        builder.get_statistics(submodel)
+    return time.perf_counter() - start
+
+
+def case_serialize(machines: int, specification: Dict[str, ElementSpec]) -> float:
+    builder = PBFLBMSubmodelBuilder(specification=specification)
+    elapsed = 0.0
+    for ids in _chunks(machines):
+        store = model.DictObjectStore()
+        for aas, submodel in _build_chunk(builder, ids):
+            store.add(aas)
+            store.add(submodel)
+        start = time.perf_counter()
+        json.dumps(aas_json.object_store_to_json(store))
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def _timed_write(write_chunk: Callable[[EnvironmentJSONWriter, range], float], machines: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "fleet.json"), "w", encoding="utf-8") as f:
+            start = time.perf_counter()
+            writer = EnvironmentJSONWriter(f, as_string_literal=True)
+            excluded = sum(write_chunk(writer, ids) for ids in _chunks(machines))
+            writer.close()
+            f.flush()
+            os.fsync(f.fileno())
+            return time.perf_counter() - start - excluded
+
+
+def case_write(machines: int, specification: Dict[str, ElementSpec]) -> float:
+    builder = PBFLBMSubmodelBuilder(specification=specification)
+
+    def write_chunk(writer: EnvironmentJSONWriter, ids: range) -> float:
+        start = time.perf_counter()
+        pairs = _build_chunk(builder, ids)
+        built = time.perf_counter() - start
+        for aas, submodel in pairs:
+            writer.write_objects(aas, submodel)
+        return built
+
+    return _timed_write(write_chunk, machines)
+
+
+def case_write_direct(machines: int, specification: Dict[str, ElementSpec]) -> float:
+    emitter = SubmodelJSONEmitter(specification=specification)
+
+    def write_chunk(writer: EnvironmentJSONWriter, ids: range) -> float:
+        for n in ids:
+            writer.write_pair(*emitter.emit_pair(aas_id=f"urn:aas:{n}", submodel_id=f"urn:sm:{n}"))
+        return 0.0
+
+    return _timed_write(write_chunk, machines)
+
+
+CASES: Dict[str, Callable[[int, Dict[str, ElementSpec]], float]] = {
+    "build": case_build,
+    "statistics": case_statistics,
+    "serialize": case_serialize,
+    "write": case_write,
+    "write_direct": case_write_direct,
+}
+
+
+# ---------------------------------------------------------------------------
+# Running, baselines and comparison
+# ---------------------------------------------------------------------------
+
+def run_suite(sizes: List[int], spec_scales: List[int], spec_machines: int, repeat: int,
+              cases: List[str]) -> Dict[str, Dict[str, float]]:
+    """Run all cases; returns ``{"<case>/machines=<n>/spec=<scale>x": {"seconds", "per_machine_us"}}``."""
+    runs = [(machines, 1) for machines in sizes] + [(spec_machines, scale) for scale in spec_scales if scale != 1]
+    results: Dict[str, Dict[str, float]] = {}
+    for machines, scale in runs:
+        specification = MACHINE_SPECIFICATION if scale == 1 else synthetic_specification(scale)
+        # Small runs are repeated more often to even out timer noise
+        repeats = max(1, repeat * 100 // max(machines * scale, 1))
+        for name in cases:
+            seconds = min(CASES[name](machines, specification) for _ in range(repeats))
+            key = f"{name}/machines={machines}/spec={scale}x"
+            results[key] = {"seconds": seconds, "per_machine_us": seconds / machines * 1e6}
+            print(f"{key:>40} {seconds:>10.4f} s {seconds / machines * 1e6:>10.1f} µs/machine", flush=True)
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "basyx": metadata.version("basyx-python-sdk"),
+        "platform": platform.platform(),
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any],
+            threshold: float, noise_floor: float) -> List[str]:
+    """Describe every case that is slower than its baseline beyond both the threshold and the noise floor."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            continue
+        seconds, base = result["seconds"], reference["seconds"]
+        if seconds > base * (1 + threshold) and seconds - base > noise_floor:
+            regressions.append(f"{key}: {seconds:.4f} s vs. {base:.4f} s baseline (+{seconds / base - 1:.0%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000, 100000],
+                        help="Fleet sizes run with the machine specification")
+    parser.add_argument("--spec-scales", type=int, nargs="+", default=[1, 10, 100],
+                        help="Synthetic specification sizes, as multiples of the machine specification")
+    parser.add_argument("--spec-machines", type=int, default=100,
+                        help="Fleet size run with the synthetic specifications")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="Write the results as new baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Fail if a case regressed against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline, as a fraction (default: 0.2)")
+    parser.add_argument("--noise-floor", type=float, default=0.0005,
+                        help="Ignore slowdowns below this many seconds (default: 0.0005)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.spec_scales, args.spec_machines, args.repeat, args.cases)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"✓ Baseline written to: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.noise_floor)
+        if regressions:
+            print(f"✗ {len(regressions)} case(s) regressed beyond {args.threshold:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            return 1
+        print(f"✓ No regressions against: {args.compare} (basyx {baseline['environment']['basyx']})")
+    return 0
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    sys.exit(main())
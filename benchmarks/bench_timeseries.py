@@ -0,0 +1,74 @@
+"""Process monitoring: ring-buffer appends, memory and downsampled export.
+
+Records ``--samples`` samples of laser power per exposure unit and of the
+atmosphere signals into a :class:`MachineTimeSeries`, reporting
+
+* the time per sample of :meth:`MachineTimeSeries.record` (one at a time) and
+  of :meth:`MachineTimeSeries.record_many` (batches of ``--batch``),
+* the memory of the buffers and the memory allocated while recording, which
+  stays fixed however many samples are written,
+* the time to downsample the full buffers into a Time Series segment.
+
+Needs NumPy.
+
+    python benchmarks/bench_timeseries.py [--samples 1000000] [--capacity 65536] [--units 4]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+from am_timeseries import MachineTimeSeries, process_signals
+
+
+def run(samples: int, capacity: int, units: int, batch: int, window: float) -> None:
+    series = MachineTimeSeries("urn:sm:bench", process_signals(units), capacity=capacity)
+    signals = list(series.signals)
+    times = 1.7e9 + np.arange(samples) * 1e-3
+    values = 400 + 50 * np.sin(times)
+
+    single = min(samples, 200000)
+    record = series.record
+    start = time.perf_counter()
+    for t, v in zip(times[:single].tolist(), values[:single].tolist()):
+        record(signals[0], t, v)
+    per_sample = (time.perf_counter() - start) / single
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for path in signals:
+        for offset in range(0, samples, batch):
+            series.record_many(path, times[offset:offset + batch], values[offset:offset + batch])
+    batched = (time.perf_counter() - start) / (samples * len(signals))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    document = json.dumps(series.submodel_json(window))
+    export = time.perf_counter() - start
+
+    print(f"signals:              {len(signals)} ({units} exposure units), capacity {capacity} samples each")
+    print(f"record():             {per_sample * 1e6:.2f} µs/sample")
+    print(f"record_many():        {batched * 1e9:.1f} ns/sample "
+          f"({1 / batched / 1e6:.0f} M samples/s, batches of {batch})")
+    print(f"buffer memory:        {series.nbytes / 2 ** 20:.1f} MiB, fixed")
+    print(f"peak while recording: {peak / 2 ** 20:.1f} MiB for {samples * len(signals)} samples")
+    print(f"export:               {export * 1e3:.1f} ms for {len(signals) * capacity} samples "
+          f"in {window:g} s windows ({len(document) / 1024:.0f} KiB JSON)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=1000000, help="Samples recorded per signal")
+    parser.add_argument("--capacity", type=int, default=65536)
+    parser.add_argument("--units", type=int, default=4, help="Exposure units (one laser power signal each)")
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--window", type=float, default=1.0, help="Downsampling window in seconds")
+    args = parser.parse_args()
+    run(args.samples, args.capacity, args.units, args.batch, args.window)
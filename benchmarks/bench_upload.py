@@ -0,0 +1,45 @@
+"""Upload throughput against an in-process AAS repository for growing fleets.
+
+Builds fleets of increasing size, uploads them with :func:`upload_fleet` into a
+fresh :class:`AASRepository` served on a free local port, uploads them again
+(updates) and reports machines per second. With pooled connections and a
+bounded queue the rate should stay flat as the fleet grows.
+
+    python benchmarks/bench_upload.py [--sizes 100 300 900] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from am_server import AASRepository, AASServer
+from am_upload import upload_fleet
+
+
+async def run(sizes, concurrency):
+    print(f"{'machines':>8} {'create/s':>10} {'update/s':>10}")
+    for size in sizes:
+        rows = [{"serial_number": f"SN-{n:06d}", "Info.manufacturer_brand": "EOS"} for n in range(size)]
+        server = AASServer(AASRepository(), port=0)
+        await server.start()
+        url = f"http://127.0.0.1:{server.port}"
+        rates = []
+        for _ in range(2):
+            start = time.perf_counter()
+            await upload_fleet(rows, url, concurrency=concurrency, workers=1, direct=True)
+            rates.append(size / (time.perf_counter() - start))
+        await server.close()
+        print(f"{size:>8} {rates[0]:>10.0f} {rates[1]:>10.0f}")
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore", DeprecationWarning)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 900])
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.concurrency))
@@ -0,0 +1,60 @@
+"""Fleet validation throughput: types, ranges and cross-field rules, column by column.
+
+Validates inventories of random machines (raw string values as read from CSV,
+about 1% of them breaking a rule) with :class:`FleetValidator` and reports the
+machines validated per minute. The target is at least 100k machines per minute.
+
+    python benchmarks/bench_validate.py [--sizes 10000 100000] [--units 1 8]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from am_machine import datatypes, machine_specification, property_specs
+from am_validate import FleetValidator
+
+
+def _rows(machines: int, units: int, rng: random.Random):
+    specs = property_specs(machine_specification(units))
+    for n in range(machines):
+        row = {}
+        for path, spec in specs.items():
+            if spec.value_type is datatypes.String:
+                row[path] = f"value-{rng.randrange(100)}"
+            elif spec.value_type is datatypes.Boolean:
+                row[path] = rng.choice(("true", "false"))
+            elif spec.value_type is datatypes.Integer:
+                row[path] = str(rng.randrange(1, 9))
+            else:
+                row[path] = f"{rng.random() * 100:.3f}"
+        row["Info.exposure_unit_count"] = str(units)
+        for prefix in [path[:-len(".laser_powers")] for path in specs if path.endswith(".laser_powers")]:
+            row[f"{prefix}.laser_source_rated_power"] = "400"
+            row[f"{prefix}.laser_powers"] = "450" if rng.random() < 0.01 else "350"
+            row[f"{prefix}.beam_focus_diameter_min"] = "50"
+            row[f"{prefix}.beam_focus_diameter_max"] = "100"
+        yield row
+
+
+def run(sizes, unit_counts) -> None:
+    print(f"{'machines':>9} {'units':>6} {'seconds':>8} {'machines/min':>13} {'violations':>11}")
+    for machines in sizes:
+        for units in unit_counts:
+            rows = list(_rows(machines, units, random.Random(0)))
+            start = time.perf_counter()
+            report = FleetValidator().validate(rows)
+            seconds = time.perf_counter() - start
+            print(f"{machines:>9} {units:>6} {seconds:>8.2f} {machines / seconds * 60:>13,.0f} "
+                  f"{len(report.violations):>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--units", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+    run(args.sizes, args.units)
@@ -0,0 +1,112 @@
+import ast
+import csv
+import io
+import json
+import struct
+import zipfile
+
+import numpy as np
+import pytest
+from am_export import (
+    csv_columns, export_columns, inventory_records, write_csv, write_csv_metadata, write_npz
+)
+
+ROWS = [
+    {"Info.serial_number": "SN-001", "Info.manufacturer_brand": "EÖS", "Info.build_volume.x_dimension": 250.0,
+     "Info.exposure_unit_count": 4, "Info.remote_control": True},
+    {"Info.serial_number": "SN-002"},
+]
+
+
+def _npy(archive, name):
+    data = archive.read(name + ".npy")
+    length = struct.unpack("<H", data[8:10])[0]
+    assert (10 + length) % 64 == 0
+    return ast.literal_eval(data[10:10 + length].decode("latin-1")), data[10 + length:]
+
+
+def test_columns_follow_specification():
+    """Test that every leaf property becomes a typed column with its unit."""
+    columns = {column.path: column for column in export_columns()}
+    assert len(columns) == 41
+    assert columns["Info.build_volume.x_dimension"].unit == "mm"
+    assert columns["Info.exposure_unit_count"].xsd_type == "xs:integer"
+
+
+def test_multi_laser_fleet_keeps_every_unit(tmp_path):
+    """Test that columns grow to the largest machine in one pass and that values outside given columns are refused."""
+    rows = ROWS + [{"Info.serial_number": "SN-003", "Info.exposure_unit_count": 2,
+                    "Exposure_unit_2.laser_source_serial_number": "L-2"}]
+    with pytest.raises(ValueError, match="Exposure_unit_2.laser_source_serial_number"):
+        write_csv(inventory_records(rows), io.StringIO(), export_columns())
+
+    csv_path = str(tmp_path / "fleet.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        assert write_csv(inventory_records(rows), f) == 3
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        exported = list(csv.DictReader(f))
+    assert len(exported[0]) == 1 + 41 + 12
+    assert exported[0]["Info.build_volume.x_dimension"] == "250.0"
+    assert exported[0]["Exposure_unit_2.laser_source_serial_number"] == ""
+    assert exported[2]["Exposure_unit_2.laser_source_serial_number"] == "L-2"
+    assert [column.path for column in csv_columns(csv_path)] == list(exported[0])[1:]
+
+    path = str(tmp_path / "fleet.npz")
+    write_npz(inventory_records(rows), path, chunk_rows=1)
+    arrays = np.load(path)
+    assert arrays["Exposure_unit_2.laser_source_serial_number"].tolist() == ["", "", "L-2"]
+    assert arrays["Exposure_unit_2.laser_source_serial_number:missing"].tolist() == [True, True, False]
+
+
+def test_write_csv_with_metadata(tmp_path):
+    """Test CSV rows in lexical form and the metadata file next to them."""
+    csv_path = str(tmp_path / "fleet.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        assert write_csv(inventory_records(ROWS), f) == 2
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["id"] == "https://acplt.org/PBF-LB-M_AAS/SN-001"
+    assert rows[0]["Info.build_volume.x_dimension"] == "250.0"
+    assert rows[0]["Info.remote_control"] == "true"
+    assert rows[1]["Info.manufacturer_brand"] == ""
+
+    metadata_path = write_csv_metadata(csv_path)
+    with open(metadata_path, encoding="utf-8") as f:
+        metadata = json.load(f)
+    assert metadata["url"] == "fleet.csv"
+    assert {"name": "Info.build_volume.x_dimension", "valueType": "xs:double", "unit": "mm"} in metadata["columns"]
+
+
+def test_write_npz_arrays(tmp_path):
+    """Test the .npy layout of the archive."""
+    path = str(tmp_path / "fleet.npz")
+    assert write_npz(inventory_records(ROWS), path, chunk_rows=1) == 2
+
+    with zipfile.ZipFile(path) as archive:
+        header, data = _npy(archive, "Info.build_volume.x_dimension")
+        assert header == {"descr": "<f8", "fortran_order": False, "shape": (2,)}
+        assert struct.unpack("<d", data[:8])[0] == 250.0
+        header, data = _npy(archive, "Info.manufacturer_brand")
+        assert header["descr"] == "<U3" and data.decode("utf-32-le") == "EÖS\0\0\0"
+        assert _npy(archive, "Info.exposure_unit_count:missing")[1] == b"\x00\x01"
+        assert "id:missing.npy" not in archive.namelist()
+
+
+def test_write_npz_loads_with_numpy(tmp_path):
+    """Test that numpy.load reads the archive with the expected dtypes."""
+    path = str(tmp_path / "fleet.npz")
+    write_npz(inventory_records(ROWS), path, compress=True)
+
+    arrays = np.load(path)
+    assert arrays["Info.exposure_unit_count"].dtype == np.int64
+    assert arrays["Info.remote_control"].tolist() == [True, False]
+    assert np.isnan(arrays["Info.build_volume.x_dimension"][1])
+    units = {column["name"]: column["unit"] for column in json.loads(str(arrays["__metadata__"]))["columns"]}
+    assert units["Info.build_volume.x_dimension"] == "mm"
+
+
+def test_write_npz_rejects_integers_beyond_int64(tmp_path):
+    """Test that an unbounded xs:integer too large for int64 names its column."""
+    rows = [{"Info.serial_number": "SN-001", "Info.exposure_unit_count": 2 ** 63}]
+    with pytest.raises(ValueError, match="Column Info.exposure_unit_count: 9223372036854775808"):
+        write_npz(inventory_records(rows), str(tmp_path / "fleet.npz"))
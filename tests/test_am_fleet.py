@@ -0,0 +1,128 @@
+import io
+import json
+
+import pytest
+from basyx.aas import model
+from am_machine import ValueCoercionError
+from am_fleet import read_inventory, machine_ids, build_machine, build_fleet, write_fleet, coerce_inventory
+
+
+ROWS = [
+    {"serial_number": "SN-001", "Info.manufacturer_brand": "EOS",
+     "Exposure_unit.laser_source_rated_power": "400", "Info.remote_control": "true"},
+    {"serial_number": "SN 002", "Info.build_volume.z_dimension": 350,
+     "Info.exposure_unit_count": 4},
+]
+
+
+def test_machine_ids_are_deterministic_and_url_safe():
+    """Test that IDs depend only on the serial number."""
+    assert machine_ids("SN-001") == machine_ids("SN-001")
+    aas_id, submodel_id = machine_ids("SN 002/A")
+    assert aas_id == "https://acplt.org/PBF-LB-M_AAS/SN%20002%2FA"
+    assert submodel_id == "https://acplt.org/PBF-LB-M_Submodel/SN%20002%2FA"
+
+
+def test_read_inventory_csv_and_jsonl(tmp_path):
+    """Test that CSV and JSONL inventories are read into equivalent rows."""
+    csv_path = tmp_path / "machines.csv"
+    csv_path.write_text("serial_number,Info.manufacturer_brand,Info.host_name\nSN-001,EOS,\n")
+    jsonl_path = tmp_path / "machines.jsonl"
+    jsonl_path.write_text(json.dumps({"serial_number": "SN-001", "Info.manufacturer_brand": "EOS"}) + "\n\n")
+
+    assert read_inventory(str(csv_path)) == [{"serial_number": "SN-001", "Info.manufacturer_brand": "EOS"}]
+    assert read_inventory(str(jsonl_path)) == read_inventory(str(csv_path))
+
+    with pytest.raises(ValueError):
+        read_inventory(str(tmp_path / "machines.xlsx"))
+
+
+def test_build_machine_sets_values_with_type_coercion():
+    """Test that inventory values are coerced to the property value types."""
+    aas, submodel = build_machine(ROWS[0])
+
+    assert aas.id == "https://acplt.org/PBF-LB-M_AAS/SN-001"
+    assert submodel.get_referable(["Info", "serial_number"]).value == "SN-001"
+    assert submodel.get_referable(["Info", "remote_control"]).value is True
+    power = submodel.get_referable(["Exposure_unit", "laser_source_rated_power"])
+    assert power.value == 400.0
+    assert isinstance(power.value, model.datatypes.Double)
+
+
+def test_build_machine_rejects_row_without_serial_number():
+    """Test that every inventory row must identify its machine."""
+    with pytest.raises(ValueError):
+        build_machine({"Info.manufacturer_brand": "EOS"})
+
+
+def test_build_fleet_is_identical_for_serial_and_parallel_runs():
+    """Test that the process pool yields the same documents in inventory order."""
+    progress = []
+    serial = list(build_fleet(ROWS, workers=1, progress=lambda done, total: progress.append((done, total))))
+    parallel = list(build_fleet(ROWS, workers=2, chunksize=1))
+
+    assert serial == parallel
+    assert progress == [(1, 2), (2, 2)]
+    assert json.loads(serial[1][1])["id"] == "https://acplt.org/PBF-LB-M_Submodel/SN%20002"
+
+
+def test_write_fleet_streams_json_lines(tmp_path):
+    """Test that the fleet is written as one JSON document per line."""
+    output = tmp_path / "fleet.jsonl"
+    with open(output, "w", encoding="utf-8") as f:
+        count = write_fleet(ROWS, f, workers=1)
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert count == len(lines) == 2
+    assert [len(json.loads(line)["assetAdministrationShells"]) for line in lines] == [1, 1]
+
+
+def test_write_fleet_streams_single_environment_document():
+    """Test that the whole fleet can be written as one environment document."""
+    stream = io.StringIO()
+    count = write_fleet(ROWS, stream, format="json", workers=1, direct=True)
+
+    document = json.loads(stream.getvalue())
+    assert count == 2
+    assert [sm["id"] for sm in document["submodels"]] == [
+        "https://acplt.org/PBF-LB-M_Submodel/SN-001", "https://acplt.org/PBF-LB-M_Submodel/SN%20002"]
+    assert len(document["assetAdministrationShells"]) == 2
+
+
+def test_direct_fleet_output_matches_object_model_output():
+    """Test that direct emission yields the same documents as building basyx objects."""
+    assert list(build_fleet(ROWS, workers=1, direct=True)) == list(build_fleet(ROWS, workers=1))
+
+
+def test_coerce_inventory_reports_all_invalid_values():
+    """Test that the whole inventory is validated in one pass with one report."""
+    rows = ROWS + [{"serial_number": "SN-003", "Info.exposure_unit_count": "two",
+                    "Info.remote_control": "maybe"},
+                   {"serial_number": "SN-004", "Info.build_volume.x_dimension": "wide"}]
+    with pytest.raises(ValueCoercionError) as excinfo:
+        coerce_inventory(rows)
+
+    assert [(issue.row, issue.path) for issue in excinfo.value.issues] == [
+        (2, "Info.exposure_unit_count"), (2, "Info.remote_control"), (3, "Info.build_volume.x_dimension")]
+
+    coerced = coerce_inventory(ROWS)
+    assert coerced[0]["Exposure_unit.laser_source_rated_power"] == 400.0
+    assert coerced[1]["Info.serial_number"] == "SN 002"
+
+
+def test_inventory_machines_get_their_number_of_exposure_units():
+    """Test that every row is validated and built with the exposure units it declares."""
+    rows = [{"serial_number": "SN-8", "Info.exposure_unit_count": "8", "Exposure_unit_8.laser_mode": "pulsed"},
+            {"serial_number": "SN-1", "Exposure_unit.laser_mode": "cw"}]
+    coerced = coerce_inventory(rows)
+    _, submodel = build_machine(coerced[0])
+    assert submodel.get_referable(["Exposure_unit_8", "laser_mode"]).value == "pulsed"
+    assert len(submodel.submodel_element) == 5 + 7
+    assert len(build_machine(coerced[1])[1].submodel_element) == 5
+    assert list(build_fleet(coerced, workers=1, direct=True)) == list(build_fleet(coerced, workers=1))
+
+    with pytest.raises(ValueCoercionError) as excinfo:
+        coerce_inventory([{"serial_number": "SN-2", "Info.exposure_unit_count": 2, "Exposure_unit_3.laser_mode": "cw"},
+                          {"serial_number": "SN-0", "Info.exposure_unit_count": 0}])
+    assert [(issue.row, issue.path) for issue in excinfo.value.issues] == [
+        (0, "Exposure_unit_3.laser_mode"), (1, "Info.exposure_unit_count")]
@@ -0,0 +1,179 @@
+import io
+import json
+import os
+
+import pytest
+from basyx.aas import model
+from basyx.aas.adapter import json as aas_json
+from am_machine import PBFLBMSubmodelBuilder, ValueCoercionError
+from am_json import (
+    SubmodelJSONEmitter, EnvironmentJSONWriter, IncrementalSubmodelSerializer, SubmodelJSONLoader, xsd_lexical,
+    collection_references, join_collections, split_collections
+)
+
+
+EXAMPLE_SUBMODEL = os.path.join(os.path.dirname(__file__), "..", "docs", "example_submodel.json")
+
+VALUES = {
+    "Info.manufacturer_brand": "EÖS \"M 290\"\n",
+    "Info.remote_control": "true",
+    "Info.exposure_unit_count": 4,
+    "Info.build_volume.x_dimension": 250,
+    "Exposure_unit.laser_powers": 1e20,
+    "Exposure_unit.laser_source_rated_power": "400",
+    "PLC.model": None,
+}
+
+
+def _basyx_json(values, aas_id, submodel_id, **kwargs):
+    builder = PBFLBMSubmodelBuilder()
+    aas, submodel = builder.build_aas_and_submodel(aas_id=aas_id, submodel_id=submodel_id)
+    builder.set_values(submodel, values)
+    object_store = model.DictObjectStore()
+    object_store.add(aas)
+    object_store.add(submodel)
+    return aas_json.object_store_to_json(object_store, **kwargs)
+
+
+def test_emitter_conforms_to_example_submodel():
+    """Test that the empty template matches docs/example_submodel.json byte for byte."""
+    with open(EXAMPLE_SUBMODEL, encoding="utf-8") as f:
+        expected = json.loads(f.read())
+    assert SubmodelJSONEmitter().emit() == expected
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_emitter_matches_basyx_output_with_values(ensure_ascii):
+    """Test that populated documents are identical to the basyx serialization."""
+    emitter = SubmodelJSONEmitter(ensure_ascii=ensure_ascii)
+    emitted = emitter.emit(VALUES, aas_id="urn:äas:1", submodel_id="urn:sm:\"1\"")
+    assert emitted == _basyx_json(VALUES, "urn:äas:1", "urn:sm:\"1\"", ensure_ascii=ensure_ascii)
+
+
+def test_emitter_rejects_unknown_paths_and_bad_values():
+    """Test that values are validated against the specification."""
+    emitter = SubmodelJSONEmitter()
+    with pytest.raises(ValueCoercionError) as excinfo:
+        emitter.emit({"Info.build_volume": "large", "Info.exposure_unit_count": "four"})
+    assert [issue.path for issue in excinfo.value.issues] == ["Info.build_volume", "Info.exposure_unit_count"]
+
+
+def test_xsd_lexical_representation():
+    """Test the lexical forms used for property values."""
+    assert xsd_lexical(True) == "true"
+    assert xsd_lexical(250.0) == "250.0"
+    assert xsd_lexical(1e20) == "1E+20"
+    assert xsd_lexical(float("inf")) == "INF"
+    assert xsd_lexical(4) == "4"
+
+
+def _three_machine_store():
+    builder = PBFLBMSubmodelBuilder()
+    object_store = model.DictObjectStore()
+    pairs = []
+    for i in range(3):
+        aas, submodel = builder.build_aas_and_submodel(aas_id=f"urn:aas:{i}", submodel_id=f"urn:sm:{i}")
+        builder.set_values(submodel, {"Info.manufacturer_brand": "EÖS"})
+        object_store.add(aas)
+        object_store.add(submodel)
+        pairs.append((aas, submodel))
+    return object_store, pairs
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_streaming_writer_matches_whole_document_dump(indent):
+    """Test that streaming pairs yields the same bytes as dumping the whole environment."""
+    object_store, pairs = _three_machine_store()
+    stream = io.StringIO()
+    with EnvironmentJSONWriter(stream, indent=indent, spool_size=64) as writer:
+        for aas, submodel in pairs:
+            writer.write_objects(aas, submodel)
+
+    expected = json.dumps(json.loads(aas_json.object_store_to_json(object_store)), indent=indent)
+    assert stream.getvalue() == expected
+    assert writer.count == 3
+
+
+def test_streaming_writer_string_literal_matches_main_file_format():
+    """Test the string-literal mode used for the files written by am_machine.py."""
+    object_store, pairs = _three_machine_store()
+    stream = io.StringIO()
+    with EnvironmentJSONWriter(stream, indent=2, as_string_literal=True) as writer:
+        for aas, submodel in pairs:
+            writer.write_objects(aas, submodel)
+
+    expected = json.dumps(aas_json.object_store_to_json(object_store), indent=2, ensure_ascii=False)
+    assert stream.getvalue() == expected
+
+
+def test_streaming_writer_empty_environment():
+    """Test that an empty writer produces an empty environment."""
+    stream = io.StringIO()
+    EnvironmentJSONWriter(stream).close()
+    assert stream.getvalue() == "{}"
+
+
+def test_incremental_serializer_reencodes_only_dirty_collections():
+    """Test that re-serialization after updates matches basyx and reuses unchanged encodings."""
+    builder = PBFLBMSubmodelBuilder()
+    aas, submodel, index = builder.build_aas_and_submodel(with_index=True)
+    serializer = IncrementalSubmodelSerializer(submodel)
+    assert serializer.to_json() == json.dumps(submodel, cls=aas_json.AASToJsonEncoder)
+
+    encoded = serializer.encoded_elements
+    index.set_value("Info.build_volume.x_dimension", 250)
+    assert serializer.is_dirty(index["Info.build_volume"]) and serializer.is_dirty(index["Info"])
+    assert not serializer.is_dirty(index["Exposure_unit"])
+    assert serializer.to_json() == json.dumps(submodel, cls=aas_json.AASToJsonEncoder)
+    # property, build_volume, Info and the submodel itself
+    assert serializer.encoded_elements - encoded == 4
+
+    index["PLC"].value.add(model.Property(id_short="firmware", value_type=model.datatypes.String, value="1.2"))
+    assert serializer.to_json() == json.dumps(submodel, cls=aas_json.AASToJsonEncoder)
+
+
+def test_loader_reads_values_and_submodel(tmp_path):
+    """Test that the loader reads back what the emitter wrote, as values and as a submodel."""
+    submodel_id = "https://acplt.org/PBF-LB-M_Submodel/SN-001"
+    path = tmp_path / "machine.json"
+    path.write_text(json.dumps(_basyx_json(VALUES, "https://acplt.org/PBF-LB-M_AAS/SN-001", submodel_id)))
+
+    loader = SubmodelJSONLoader()
+    values = loader.load_values(str(path))
+    assert values["Exposure_unit.laser_powers"] == 1e20
+    assert values["Info.exposure_unit_count"] == 4
+    assert isinstance(values["Info.exposure_unit_count"], model.datatypes.Integer)
+    assert values["Info.remote_control"] is True and values["PLC.model"] is None
+
+    submodel = loader.load_submodel(str(path))
+    assert submodel.id == submodel_id
+    assert submodel.get_referable(["Info", "manufacturer_brand"]).value == VALUES["Info.manufacturer_brand"]
+    assert loader.load_values(EXAMPLE_SUBMODEL) == dict.fromkeys(values)
+
+
+def test_loader_rejects_elements_not_in_specification():
+    """Test that structure and value mismatches are all reported in one error."""
+    document = json.loads(_basyx_json({}, "urn:aas", "urn:sm"))
+    info = document["submodels"][0]["submodelElements"][0]["value"]
+    info.append({"idShort": "vendor_extension", "modelType": "Property", "valueType": "xs:string"})
+    info[0]["valueType"] = "xs:int"
+    info[9]["value"] = "four"
+    info[10]["modelType"] = "Property"
+
+    with pytest.raises(ValueCoercionError) as excinfo:
+        SubmodelJSONLoader().read(document)
+    assert [issue.path for issue in excinfo.value.issues] == [
+        "Info.manufacturer_brand", "Info.exposure_unit_count", "Info.build_volume", "Info.vendor_extension"]
+
+
+def test_split_and_join_shared_collections():
+    """Test that shared collections are replaced by digests and joined back byte for byte."""
+    emitter = SubmodelJSONEmitter(ensure_ascii=False)
+    first = emitter.emit_pair({"Info.serial_number": "SN-1", "Exposure_unit.laser_powers": 400})[1]
+    second = emitter.emit_pair({"Info.serial_number": "SN-2", "Exposure_unit.laser_powers": 400})[1]
+    document, collections = split_collections(first, {"PLC", "Exposure_unit"})
+    assert len(collections) == 2 and collection_references(document) == list(collections)
+    assert json.loads(document)["submodelElements"][1] == {"$collection": collection_references(document)[0]}
+    assert join_collections(document, collections) == first
+    assert split_collections(second, {"PLC", "Exposure_unit"})[1] == collections
+    assert split_collections(first, set()) == (first, {})
@@ -1,6 +1,11 @@
 import pytest
 from basyx.aas import model
-from am_machine import PBFLBMSubmodelBuilder, MACHINE_SPECIFICATION
+from am_machine import (
+    PBFLBMSubmodelBuilder, SemanticCache, SubmodelChangeTracker, SubmodelHasher, MACHINE_SPECIFICATION, BUILD_VOLUME,
+    CompiledSpecification, compile_specification, specification_statistics, machine_specification,
+    exposure_units
+)
+from am_json import SubmodelJSONEmitter, SubmodelJSONLoader
 
 
 def test_submodel_builder_creates_valid_aas_and_submodel():
@@ -119,6 +124,85 @@ def test_machine_specification_structure():
         assert MACHINE_SPECIFICATION[key].id_short == key
 
 
+def test_machine_specification_with_exposure_units():
+    """Test that multi-laser specifications stamp every unit from the shared exposure unit specs."""
+    assert machine_specification() is MACHINE_SPECIFICATION
+    specification = machine_specification(4)
+    assert specification is machine_specification(4)
+    assert list(specification) == ["Info", "Exposure_unit", "Exposure_unit_2", "Exposure_unit_3", "Exposure_unit_4",
+                                   "Atmosphere", "PLC", "MCSW"]
+    assert all(specification[f"Exposure_unit_{n}"].children is MACHINE_SPECIFICATION["Exposure_unit"].children
+               for n in range(2, 5))
+    stats = specification_statistics(specification)
+    assert (stats["total_collections"], stats["total_properties"]) == (6 + 3, 41 + 3 * 12)
+    assert exposure_units({"Info.exposure_unit_count": "8"}) == 8
+    assert exposure_units({"Exposure_unit_3.laser_mode": "cw"}) == 3
+    assert exposure_units({}) == 1
+    with pytest.raises(ValueError):
+        machine_specification(0)
+
+
+def test_multi_laser_machine_builds_emits_and_loads_per_unit_values():
+    """Test per-unit values through the builder, the direct emitter and the default loader."""
+    specification = machine_specification(3)
+    values = {"Info.exposure_unit_count": 3, "Exposure_unit.laser_source_serial_number": "L-1",
+              "Exposure_unit_3.laser_source_rated_power": 700}
+    builder = PBFLBMSubmodelBuilder(specification=specification)
+    _, submodel = builder.build_aas_and_submodel()
+    builder.set_values(submodel, values)
+    assert submodel.get_referable(["Exposure_unit_3", "laser_source_rated_power"]).value == 700.0
+    assert submodel.get_referable(["Exposure_unit_2", "laser_source_rated_power"]).value is None
+    assert (submodel.get_referable(["Exposure_unit_2", "laser_mode"]).semantic_id
+            is submodel.get_referable(["Exposure_unit", "laser_mode"]).semantic_id)
+
+    document = SubmodelJSONEmitter(specification=specification).emit(values)
+    loaded = SubmodelJSONLoader().read(document)[1]
+    assert loaded["Exposure_unit_3.laser_source_rated_power"] == 700.0
+    assert len(loaded) == 41 + 2 * 12
+    assert SubmodelJSONLoader().build_submodel("urn:sm", loaded).get_referable(
+        ["Exposure_unit_3", "laser_source_rated_power"]).value == 700.0
+
+
+def test_compiled_specification_reproduces_tree():
+    """Test that the flat compiled specification rebuilds the same recursive specification."""
+    compiled = compile_specification()
+    assert compiled is compile_specification(MACHINE_SPECIFICATION)
+    assert compiled.to_specification() == MACHINE_SPECIFICATION
+    assert len(compiled) == 47  # 41 properties, 6 collections
+    assert [node.id_short for node in compiled.children()] == list(MACHINE_SPECIFICATION)
+
+
+def test_compiled_specification_is_flat_pre_order_table():
+    """Test parent indexes, depths, subtree extents and codes of the compiled nodes."""
+    compiled = compile_specification()
+    for node in compiled:
+        assert compiled.parents[node.index] == node.parent < node.index
+        if node.parent >= 0:
+            parent = compiled.nodes[node.parent]
+            assert parent.end >= node.end and node.depth == parent.depth + 1
+            assert node.path == f"{parent.path}.{node.id_short}"
+        assert compiled.value_types[node.value_type_code] is node.value_type
+    build_volume = compiled["Info.build_volume"]
+    assert build_volume.element_type == BUILD_VOLUME.element_type and build_volume.depth == 1
+    assert [node.id_short for node in compiled.children(build_volume.index)] == list(BUILD_VOLUME.children)
+    assert compiled.nodes[build_volume.index + 1:build_volume.end] == tuple(compiled.children(build_volume.index))
+    with pytest.raises(AttributeError):
+        compiled.nodes = ()
+    with pytest.raises(AttributeError):
+        compiled["Info.serial_number"].unit = "mm"
+    with pytest.raises(TypeError):
+        compiled.parents[0] = 1
+    with pytest.raises(TypeError):
+        compiled._indexes["Info"] = 0
+
+
+def test_compiled_subtree_builds_same_elements():
+    """Test that compiling a single collection yields the same nodes below it."""
+    compiled = CompiledSpecification({BUILD_VOLUME.id_short: BUILD_VOLUME})
+    assert compiled.to_specification() == {"build_volume": BUILD_VOLUME}
+    assert [node.path for node in compiled][1:] == [f"build_volume.{key}" for key in BUILD_VOLUME.children]
+
+
 def test_semantic_references():
     """Test that semantic references are properly set."""
     builder = PBFLBMSubmodelBuilder()
@@ -135,3 +219,238 @@ def test_semantic_references():
             assert element.semantic_id is not None
             assert len(element.semantic_id.key) == 1
 
+
+
+def test_template_is_compiled_once_per_builder():
+    """Test that repeated builds stamp out clones of the same compiled template."""
+    builder = PBFLBMSubmodelBuilder()
+    builder.build_aas_and_submodel()
+    template = builder.compile_template()
+    _, submodel = builder.build_aas_and_submodel()
+
+    assert builder.compile_template() is template
+    assert [element.id_short for element in submodel.submodel_element] == [t.id_short for t in template]
+    assert all(element is not t for element, t in zip(submodel.submodel_element, template))
+
+
+def test_cloned_submodels_are_independent():
+    """Test that values and children of one machine do not leak into another."""
+    builder = PBFLBMSubmodelBuilder()
+    _, first = builder.build_aas_and_submodel(submodel_id="https://acplt.org/first")
+    _, second = builder.build_aas_and_submodel(submodel_id="https://acplt.org/second")
+
+    power = first.get_referable(["Exposure_unit", "laser_source_rated_power"])
+    power.value = 400.0
+    power.description = model.MultiLanguageTextType({"de": "Nennleistung"})
+    first.get_referable("PLC").value.remove_by_id("id_short", "model")
+
+    other = second.get_referable(["Exposure_unit", "laser_source_rated_power"])
+    assert other.value is None
+    assert dict(other.description) == {"en": "Maximum rated power output of the laser source"}
+    assert other.parent.parent is second
+    assert len(second.get_referable("PLC").value) == 3
+    assert len(builder.compile_template()[3].value) == 3
+
+
+def test_cloned_submodel_matches_freshly_built_elements():
+    """Test that the clone path yields the same elements as walking the specification."""
+    builder = PBFLBMSubmodelBuilder()
+    _, submodel = builder.build_aas_and_submodel()
+
+    def describe(element):
+        children = [describe(child) for child in element.value] \
+            if isinstance(element, model.SubmodelElementCollection) else None
+        return (type(element), element.id_short, element.semantic_id, dict(element.description),
+                sorted((q.type, q.value) for q in element.qualifier), children)
+
+    fresh = [builder._build_submodel_element(spec) for spec in MACHINE_SPECIFICATION.values()]
+    assert [describe(e) for e in submodel.submodel_element] == [describe(e) for e in fresh]
+
+
+def test_semantic_cache_shares_objects_across_submodels():
+    """Test that references, descriptions and unit qualifiers are interned once."""
+    cache = SemanticCache()
+    builder = PBFLBMSubmodelBuilder(cache=cache)
+    _, first = builder.build_aas_and_submodel()
+    _, second = builder.build_aas_and_submodel()
+
+    path = ["Info", "build_volume", "x_dimension"]
+    a, b = first.get_referable(path), second.get_referable(path)
+    assert a.semantic_id is b.semantic_id
+    assert a.description is b.description
+    assert next(iter(a.qualifier)) is next(iter(b.qualifier))
+    assert first.semantic_id is second.semantic_id
+    assert cache.reference("https://acplt.org/Properties/x_dimension") is a.semantic_id
+
+
+def test_semantic_cache_entries_are_read_only():
+    """Test that shared entries cannot be changed through one submodel."""
+    cache = SemanticCache()
+    with pytest.raises(TypeError):
+        cache.description("Build plate width (X-axis)")["de"] = "Breite"
+    with pytest.raises(AttributeError):
+        cache.unit_qualifier("mm").value = "cm"
+
+
+def test_semantic_cache_memory_counters():
+    """Test that the cache reports entries, hits and saved bytes."""
+    cache = SemanticCache()
+    builder = PBFLBMSubmodelBuilder(cache=cache)
+    builder.build_aas_and_submodel()
+    after_first = cache.statistics()
+    builder.build_aas_and_submodel()
+    stats = cache.statistics()
+
+    assert stats["qualifiers"] == 3  # mm, W and µm
+    assert stats["interned_bytes"] == after_first["interned_bytes"] > 0
+    assert stats["hits"] > after_first["hits"]
+    assert stats["lookups"] - after_first["lookups"] == stats["hits"] - after_first["hits"]
+    assert stats["saved_bytes"] - after_first["saved_bytes"] >= stats["interned_bytes"]
+
+
+def test_path_index_maps_every_element():
+    """Test that the optional path index addresses every element by dotted path."""
+    builder = PBFLBMSubmodelBuilder()
+    _, submodel, index = builder.build_aas_and_submodel(with_index=True)
+
+    assert len(index) == 47  # 6 collections + 41 properties
+    assert index["Info.build_volume.x_dimension"] is submodel.get_referable(["Info", "build_volume", "x_dimension"])
+    assert isinstance(index["Info.build_volume"], model.SubmodelElementCollection)
+
+    index.set_value("Exposure_unit.laser_source_rated_power", "400")
+    assert index.get_value("Exposure_unit.laser_source_rated_power") == 400.0
+    with pytest.raises(ValueError):
+        index.set_value("Info", "x")
+
+
+def test_path_index_tracks_added_and_removed_elements():
+    """Test that the index stays consistent when the submodel changes."""
+    builder = PBFLBMSubmodelBuilder()
+    _, submodel, index = builder.build_aas_and_submodel(with_index=True)
+    info = index["Info"]
+
+    info.value.remove(index["Info.build_volume"])
+    assert "Info.build_volume" not in index
+    assert "Info.build_volume.x_dimension" not in index
+
+    extra = model.SubmodelElementCollection(
+        id_short="chamber",
+        value=[model.Property(id_short="volume", value_type=model.datatypes.Double)])
+    info.value.add(extra)
+    assert index["Info.chamber.volume"].parent is extra
+
+    submodel.submodel_element.remove(index["PLC"])
+    assert not [path for path in index if path.startswith("PLC")]
+    assert len(index) == 47 - 6 + 2 - 4
+
+
+def test_specification_statistics_match_walked_submodel():
+    """Test that spec-level statistics equal the counts of a built submodel."""
+    builder = PBFLBMSubmodelBuilder()
+    _, submodel = builder.build_aas_and_submodel()
+
+    stats = builder.get_statistics()
+    assert stats == builder.get_statistics(submodel)
+    assert stats["by_type"] == {"Property": 41, "SubmodelElementCollection": 6}
+    assert stats["by_unit"] == {"W": 2, "mm": 4, "µm": 2}
+    assert specification_statistics() is stats
+
+
+def test_statistics_count_other_element_types():
+    """Test that element types other than Property and Collection are counted."""
+    builder = PBFLBMSubmodelBuilder()
+    _, submodel = builder.build_aas_and_submodel()
+    submodel.get_referable("MCSW").value.add(
+        model.MultiLanguageProperty(id_short="notes", value=model.MultiLanguageTextType({"en": "x"})))
+
+    stats = builder.get_statistics(submodel)
+    assert stats["by_type"]["MultiLanguageProperty"] == 1
+    assert stats["total_properties"] == 41
+
+
+def test_index_statistics_are_maintained_incrementally():
+    """Test that the path index keeps statistics current without walking."""
+    builder = PBFLBMSubmodelBuilder()
+    _, submodel, index = builder.build_aas_and_submodel(with_index=True)
+    assert builder.get_statistics(index) == builder.get_statistics()
+
+    info = index["Info"]
+    info.value.remove(index["Info.build_volume"])
+    assert builder.get_statistics(index) == builder.get_statistics(submodel)
+    assert builder.get_statistics(index)["max_depth"] == 1
+    assert builder.get_statistics(index)["by_unit"] == {"W": 2, "µm": 2}
+
+    nested = model.SubmodelElementCollection(id_short="a", value=[
+        model.SubmodelElementCollection(id_short="b", value=[
+            model.Property(id_short="c", value_type=model.datatypes.Double,
+                           qualifier=[model.Qualifier("unit", model.datatypes.String, value="mm")])])])
+    info.value.add(nested)
+    assert builder.get_statistics(index) == builder.get_statistics(submodel)
+    assert builder.get_statistics(index)["max_depth"] == 3
+
+
+def test_change_tracker_reports_writes_and_structure_changes():
+    """Test that value writes and added/removed elements notify the tracker's listeners."""
+    builder = PBFLBMSubmodelBuilder()
+    aas, submodel = builder.build_aas_and_submodel()
+    tracker = SubmodelChangeTracker(submodel)
+    changed = []
+    tracker.subscribe(changed.append)
+
+    power = submodel.get_referable(["Exposure_unit", "laser_powers"])
+    power.value = 200.0
+    assert changed == [power]
+    assert power.parent.id_short == "Exposure_unit"
+
+    plc = submodel.get_referable("PLC")
+    extra = model.Property(id_short="firmware", value_type=model.datatypes.String)
+    plc.value.add(extra)
+    extra.value = "1.2"
+    plc.value.remove(extra)
+    assert changed[1:] == [plc, extra, plc]
+    assert tracker.version == 4
+
+    tracker.unsubscribe(changed.append)
+    extra.value = "1.3"
+    power.value = 300.0
+    assert len(changed) == 4 and tracker.version == 5
+
+
+def test_tracked_properties_count_as_properties():
+    """Test that statistics and index counts treat tracked properties as plain properties."""
+    builder = PBFLBMSubmodelBuilder()
+    _, submodel, index = builder.build_aas_and_submodel(with_index=True)
+    expected = builder.get_statistics()
+    SubmodelChangeTracker(submodel)
+    assert builder.get_statistics(submodel) == expected
+    assert builder.get_statistics(index) == expected
+
+    power = index["Exposure_unit.laser_powers"]
+    power.parent.value.remove(power)
+    statistics = builder.get_statistics(index)
+    assert statistics == builder.get_statistics(submodel)
+    assert statistics["total_properties"] == expected["total_properties"] - 1
+    assert set(statistics["by_type"]) == {"Property", "SubmodelElementCollection"}
+
+
+def test_hasher_rehashes_only_ancestors_of_changes():
+    """Test that content digests ignore IDs, follow changes and only rehash the changed path."""
+    builder = PBFLBMSubmodelBuilder()
+    _, first = builder.build_aas_and_submodel("urn:aas:1", "urn:sm:1")
+    _, second = builder.build_aas_and_submodel("urn:aas:2", "urn:sm:2")
+    hashes, other = SubmodelHasher(first), SubmodelHasher(second)
+    assert hashes.digest() == other.digest() and len(hashes.digest()) == 16
+    assert hashes.differences(other) == []
+
+    before = hashes.rehashed
+    first.get_referable(["Info", "build_volume", "x_dimension"]).value = 250.0
+    assert hashes.digest() != other.digest()
+    assert hashes.rehashed - before == 4  # property, build_volume, Info, submodel
+    assert hashes.digest(first.get_referable("PLC")) == other.digest(second.get_referable("PLC"))
+    assert hashes.differences(other) == ["Info.build_volume.x_dimension"]
+
+    first.get_referable("PLC").value.add(model.Property(id_short="firmware", value_type=model.datatypes.String))
+    assert hashes.differences(other) == ["Info.build_volume.x_dimension", "PLC.firmware"]
+    first.get_referable("PLC").value.remove_by_id("id_short", "firmware")
+    first.get_referable(["Info", "build_volume", "x_dimension"]).value = None
+    assert hashes.digest() == other.digest()
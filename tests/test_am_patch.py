@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from basyx.aas import model
+from basyx.aas.adapter.json import AASToJsonEncoder
+from am_machine import PBFLBMSubmodelBuilder, SubmodelHasher
+from am_patch import diff_submodels, apply_patch, element_pointer, SubmodelPatchRecorder, PatchError
+
+
+def _dumps(submodel):
+    return json.dumps(submodel, cls=AASToJsonEncoder)
+
+
+def _snapshots(values):
+    builder = PBFLBMSubmodelBuilder()
+    _, old = builder.build_aas_and_submodel()
+    _, new = builder.build_aas_and_submodel()
+    builder.set_values(new, values)
+    return old, new
+
+
+def test_diff_and_apply_round_trip():
+    """Test that applying the diff of two snapshots reproduces the newer one."""
+    old, new = _snapshots({"Info.build_volume.x_dimension": 250, "Info.manufacturer_brand": "EOS/M~290"})
+    new.get_referable("PLC").value.add(
+        model.Property(id_short="firmware", value_type=model.datatypes.String, value="1.2"))
+    new.get_referable("Info").value.remove_by_id("id_short", "host_name")
+
+    patch = diff_submodels(old, new)
+    assert patch == [
+        {"op": "remove", "path": "/Info/host_name"},
+        {"op": "replace", "path": "/Info/manufacturer_brand", "value": "EOS/M~290"},
+        {"op": "replace", "path": "/Info/build_volume/x_dimension", "value": 250.0},
+        {"op": "add", "path": "/PLC/firmware",
+         "value": {"idShort": "firmware", "modelType": "Property", "value": "1.2", "valueType": "xs:string"}},
+    ]
+    apply_patch(old, json.loads(json.dumps(patch)))
+    assert _dumps(old) == _dumps(new)
+    assert diff_submodels(old, new) == []
+
+
+def test_hashed_diff_matches_full_diff():
+    """Test that diffing with content hashers skips unchanged subtrees but yields the same patch."""
+    old, new = _snapshots({"Exposure_unit.laser_powers": 200.0, "Info.build_volume.x_dimension": 250})
+    old_hashes, new_hashes = SubmodelHasher(old), SubmodelHasher(new)
+    patch = diff_submodels(old, new, old_hashes, new_hashes)
+    assert patch == diff_submodels(old, new)
+    assert [op["path"] for op in patch] == ["/Info/build_volume/x_dimension", "/Exposure_unit/laser_powers"]
+
+    apply_patch(old, patch)
+    assert diff_submodels(old, new, old_hashes, new_hashes) == []
+
+
+def test_recorder_emits_only_changes_since_last_patch():
+    """Test that the recorder turns tracked changes into a patch and resets afterwards."""
+    old, new = _snapshots({})
+    recorder = SubmodelPatchRecorder(new)
+    power = new.get_referable(["Exposure_unit", "laser_powers"])
+    power.value = 200.0
+    new.get_referable(["Info", "remote_control"]).value = None  # unchanged
+    extra = model.SubmodelElementCollection(id_short="extra")
+    new.submodel_element.add(extra)
+    extra.value.add(model.Property(id_short="count", value_type=model.datatypes.Integer, value=1))
+
+    patch = recorder.patch()
+    assert [(op["op"], op["path"]) for op in patch] == [("add", "/extra"), ("replace", "/Exposure_unit/laser_powers")]
+    assert element_pointer(power) == "/Exposure_unit/laser_powers"
+    apply_patch(old, patch)
+    assert _dumps(old) == _dumps(new)
+
+    assert recorder.patch() == []
+    power.value = 200.0
+    assert recorder.patch() == []
+    new.submodel_element.remove(extra)
+    assert recorder.patch() == [{"op": "remove", "path": "/extra"}]
+
+
+def test_apply_patch_rejects_invalid_operations():
+    """Test that invalid paths, values and failed tests raise PatchError."""
+    _, submodel = _snapshots({})
+    with pytest.raises(PatchError):
+        apply_patch(submodel, [{"op": "replace", "path": "/Info/missing", "value": 1}])
+    with pytest.raises(PatchError):
+        apply_patch(submodel, [{"op": "replace", "path": "/Info/exposure_unit_count", "value": "two"}])
+    with pytest.raises(PatchError):
+        apply_patch(submodel, [{"op": "test", "path": "/Info/exposure_unit_count", "value": 3}])
+    with pytest.raises(PatchError):
+        apply_patch(submodel, [{"op": "move", "from": "/Info", "path": "/PLC/Info"}])
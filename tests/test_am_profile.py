@@ -0,0 +1,70 @@
+import json
+
+from am_machine import PBFLBMSubmodelBuilder
+from am_profile import Instrumentation, CountingStream, NO_PHASE
+
+
+def test_phases_and_counters():
+    """Test accumulated phase times and entries, counters and the JSON export."""
+    instrumentation = Instrumentation()
+    for _ in range(3):
+        with instrumentation.phase("outer"):
+            with instrumentation.phase("inner"):
+                instrumentation.count("items", 2)
+    data = json.loads(instrumentation.to_json())
+    assert data["phases"]["outer"]["calls"] == data["phases"]["inner"]["calls"] == 3
+    assert data["phases"]["outer"]["seconds"] >= data["phases"]["inner"]["seconds"] > 0
+    assert "peak_bytes" not in data["phases"]["outer"]
+    assert data["counters"] == {"items": 6}
+
+
+def test_memory_peaks_of_nested_phases():
+    """Test that an allocation inside an inner phase also counts for the enclosing phase."""
+    with Instrumentation(trace_memory=True) as instrumentation:
+        with instrumentation.phase("outer"):
+            with instrumentation.phase("inner"):
+                block = bytearray(4 * 2 ** 20)
+                del block
+            with instrumentation.phase("small"):
+                pass
+    # Peaks are net of what the phase frees, e.g. objects collected meanwhile, so allow a little less
+    assert instrumentation.peaks["inner"] >= 4 * 2 ** 20 - 2 ** 16
+    assert instrumentation.peaks["outer"] >= instrumentation.peaks["inner"]
+    assert instrumentation.peaks["small"] < 2 ** 20
+
+
+def test_prometheus_text_format():
+    """Test metric families, labels and values of the Prometheus export."""
+    instrumentation = Instrumentation()
+    with instrumentation.phase('json "encode"'):
+        pass
+    instrumentation.count("bytes_written", 10)
+    lines = instrumentation.to_prometheus().splitlines()
+    assert "# TYPE pbflbm_phase_seconds_total counter" in lines
+    assert 'pbflbm_phase_calls_total{phase="json \\"encode\\""} 1' in lines
+    assert "# TYPE pbflbm_bytes_written_total counter" in lines
+    assert "pbflbm_bytes_written_total 10" in lines
+
+
+def test_builder_records_build_phases_and_counters():
+    """Test the phases and counters of instrumented builds, and no-op phases without instrumentation."""
+    instrumentation = Instrumentation()
+    builder = PBFLBMSubmodelBuilder(instrumentation=instrumentation)
+    builder.build_aas_and_submodel("urn:aas:1", "urn:sm:1")
+    builder.build_aas_and_submodel("urn:aas:2", "urn:sm:2", with_index=True)
+    assert instrumentation.calls == {"references": 4, "shell": 2, "template": 1, "elements": 2, "index": 1}
+    assert instrumentation.counters["machines_built"] == 2
+    assert instrumentation.counters["elements_built"] == 2 * 47
+    # After the first build all semantic references are interned; only the model reference is new
+    assert instrumentation.counters["references_allocated"] >= 2
+    assert PBFLBMSubmodelBuilder()._phase("elements") is NO_PHASE
+
+
+def test_counting_stream(tmp_path):
+    """Test that the bytes written through the wrapper are counted in UTF-8."""
+    instrumentation = Instrumentation()
+    with open(tmp_path / "out.txt", "w", encoding="utf-8") as f:
+        stream = CountingStream(f, instrumentation)
+        stream.write("µm")
+        stream.flush()
+    assert instrumentation.counters["bytes_written"] == (tmp_path / "out.txt").stat().st_size == 3
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+from am_export import inventory_records
+from am_machine import ValueCoercionError
+from am_query import FleetIndex
+
+ROWS = [
+    {"Info.serial_number": "SN-001", "Exposure_unit.laser_source_rated_power": 400.0,
+     "Info.build_volume.z_dimension": 350.0, "MCSW.control_system": "EOSPRINT", "Info.remote_control": True},
+    {"Info.serial_number": "SN-002", "Exposure_unit.laser_source_rated_power": 1000.0,
+     "Info.build_volume.z_dimension": 300.0, "MCSW.control_system": "EOSPRINT", "Info.remote_control": False},
+    {"Info.serial_number": "SN-003", "Exposure_unit.laser_source_rated_power": 500.0,
+     "Info.build_volume.z_dimension": 400.0, "MCSW.control_system": "Materialise"},
+    {"Info.serial_number": "SN-004", "Info.build_volume.z_dimension": 500.0, "MCSW.control_system": "EOSPRINT"},
+]
+
+
+@pytest.fixture
+def index():
+    return FleetIndex(inventory_records(ROWS))
+
+
+def test_conjunctive_range_and_equality(index):
+    """Test the example query over range and equality predicates, with short property names."""
+    found = index.find("laser_source_rated_power>=400", "z_dimension>300", "control_system==EOSPRINT")
+    assert found == ["https://acplt.org/PBF-LB-M_AAS/SN-001"]
+    assert index.find("Info.build_volume.z_dimension<=300") == ["https://acplt.org/PBF-LB-M_AAS/SN-002"]
+    assert len(index.find("control_system!=Materialise")) == 3
+    assert len(index.find()) == 4
+
+
+def test_missing_values_never_match(index):
+    """Test that a machine without a value matches neither a predicate nor its negation."""
+    assert len(index.find("laser_source_rated_power>0")) == 3
+    assert len(index.find("laser_source_rated_power!=400")) == 2
+    assert index.find("remote_control=true") == ["https://acplt.org/PBF-LB-M_AAS/SN-001"]
+
+
+def test_invalid_predicates(index):
+    """Test unknown and ambiguous properties, missing operators and uncoercible values."""
+    with pytest.raises(KeyError, match="Ambiguous"):
+        index.parse("serial_number==SN-001")
+    with pytest.raises(KeyError, match="Unknown"):
+        index.parse("wavelength>1000")
+    with pytest.raises(ValueError, match="No operator"):
+        index.parse("z_dimension")
+    with pytest.raises(ValueCoercionError):
+        index.parse("z_dimension>tall")
+
+
+def test_query_matches_full_scan():
+    """Test index intersection against a full scan on a random fleet."""
+    rng = random.Random(7)
+    rows = [{"Info.serial_number": f"SN-{i}",
+             "Exposure_unit.laser_source_rated_power": rng.choice([200.0, 400.0, 700.0, 1000.0]),
+             "Exposure_unit_2.laser_source_rated_power": rng.choice([None, 200.0, 700.0]),
+             "Info.build_volume.z_dimension": float(rng.randrange(100, 600)),
+             "Info.exposure_unit_count": rng.randrange(1, 5),
+             "MCSW.control_system": rng.choice("XYZ")} for i in range(500)]
+    index = FleetIndex(inventory_records(rows))
+    for _ in range(50):
+        predicates = [index.parse(text) for text in rng.sample([
+            f"Exposure_unit.laser_source_rated_power{rng.choice(['>=', '<', '=='])}{rng.choice([200, 400, 700])}",
+            f"z_dimension>{rng.randrange(100, 600)}",
+            f"exposure_unit_count<={rng.randrange(1, 5)}",
+            f"control_system=={rng.choice('XYZ')}",
+        ], rng.randrange(1, 5))]
+        assert index.query(*predicates) == index.scan(*predicates)
+
+
+def test_multi_laser_units_are_indexed():
+    """Test that units beyond the first get columns, empty for machines with fewer units."""
+    rows = [{"Info.serial_number": "SN-1", "Exposure_unit.laser_source_rated_power": 400.0},
+            {"Info.serial_number": "SN-2", "Info.exposure_unit_count": 3,
+             "Exposure_unit_3.laser_source_rated_power": 700.0}]
+    index = FleetIndex(inventory_records(rows))
+    assert index.find("Exposure_unit_3.laser_source_rated_power>500") == ["https://acplt.org/PBF-LB-M_AAS/SN-2"]
+    assert index.row_values(0, ["Exposure_unit_3.laser_source_rated_power"]) == {
+        "Exposure_unit_3.laser_source_rated_power": None}
+    assert index.find("laser_source_rated_power>500") == ["https://acplt.org/PBF-LB-M_AAS/SN-2"]
+
+
+def test_unit_properties_resolve_independently_of_the_fleet():
+    """Test that unit properties match any unit, and Exposure_unit_<n> exactly unit n, in every fleet."""
+    single = [{"Info.serial_number": "SN-1", "Exposure_unit.laser_source_rated_power": 400.0}]
+    multi = single + [{"Info.serial_number": "SN-2", "Info.exposure_unit_count": 2,
+                       "Exposure_unit.laser_source_rated_power": 200.0,
+                       "Exposure_unit_2.laser_source_rated_power": 700.0}]
+    for rows in (single, multi):
+        index = FleetIndex(inventory_records(rows))
+        assert index.resolve_path("laser_source_rated_power") == "Exposure_unit.laser_source_rated_power"
+        assert index.find("laser_source_rated_power>=400") == index.find("Exposure_unit.laser_source_rated_power>=400")
+        assert index.find("Exposure_unit_1.laser_source_rated_power>=400") == ["https://acplt.org/PBF-LB-M_AAS/SN-1"]
+        assert index.find("Exposure_unit_5.laser_source_rated_power>0") == []
+    assert index.find("laser_source_rated_power>=400") == [
+        "https://acplt.org/PBF-LB-M_AAS/SN-1", "https://acplt.org/PBF-LB-M_AAS/SN-2"]
+    assert index.find("Exposure_unit_2.laser_source_rated_power>=400") == ["https://acplt.org/PBF-LB-M_AAS/SN-2"]
+    assert index.columns_for("Exposure_unit.laser_source_rated_power") == [
+        "Exposure_unit.laser_source_rated_power", "Exposure_unit_2.laser_source_rated_power"]
+    with pytest.raises(KeyError, match="Unknown"):
+        index.parse("Exposure_unit_65.laser_source_rated_power>0")
+
+
+def test_nan_values_are_left_out_like_missing_ones():
+    """Test that NaN values neither match nor break the order of the sorted index."""
+    powers = [400.0, float("nan"), 200.0, float("nan"), 700.0, None, 500.0]
+    rows = [{"Info.serial_number": f"SN-{n}", "Exposure_unit.laser_source_rated_power": power}
+            for n, power in enumerate(powers)]
+    index = FleetIndex(inventory_records(rows))
+    for text in ("laser_source_rated_power>=400", "laser_source_rated_power<500", "laser_source_rated_power!=200",
+                 "laser_source_rated_power==700"):
+        predicate = index.parse(text)
+        assert index.query(predicate) == index.scan(predicate)
+    assert [index.ids.index(machine_id) for machine_id in index.find("laser_source_rated_power>=400")] == [0, 4, 6]
+    assert len(index.find("laser_source_rated_power!=200")) == 3
+    with pytest.raises(ValueCoercionError, match="NaN"):
+        index.parse("laser_source_rated_power>nan")
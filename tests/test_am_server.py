@@ -0,0 +1,90 @@
+import asyncio
+
+from am_server import AASRepository, AASServer, encode_identifier, decode_identifier
+
+SUBMODEL_ID = "https://acplt.org/PBF-LB-M_Submodel/SN-001"
+ELEMENTS = f"/submodels/{encode_identifier(SUBMODEL_ID)}/submodel-elements"
+
+
+def _repository():
+    repository = AASRepository()
+    repository.add_machine("https://acplt.org/PBF-LB-M_AAS/SN-001", SUBMODEL_ID,
+                           values={"Info.manufacturer_brand": "EOS"})
+    return repository
+
+
+def test_identifier_encoding_round_trip():
+    """Test that IDs are base64url encoded without padding."""
+    assert "=" not in encode_identifier(SUBMODEL_ID)
+    assert decode_identifier(encode_identifier(SUBMODEL_ID)) == SUBMODEL_ID
+
+
+def test_etag_revalidation_and_targeted_invalidation():
+    """Test 304 answers and that a change only invalidates responses containing the element."""
+    repository = _repository()
+    status, headers, body = repository.handle("GET", ELEMENTS + "/Info.build_volume.x_dimension", {})
+    assert status == 200 and b'"idShort": "x_dimension"' in body
+    x_etag = headers["ETag"]
+    plc_etag = repository.handle("GET", ELEMENTS + "/PLC", {})[1]["ETag"]
+    info_etag = repository.handle("GET", ELEMENTS + "/Info", {})[1]["ETag"]
+
+    assert repository.handle("GET", ELEMENTS + "/Info.build_volume.x_dimension",
+                             {"if-none-match": x_etag})[0] == 304
+
+    status, _, _ = repository.handle("PATCH", ELEMENTS + "/Info.build_volume.x_dimension/$value", {}, b"250")
+    assert status == 204
+    status, headers, body = repository.handle("GET", ELEMENTS + "/Info.build_volume.x_dimension",
+                                              {"if-none-match": x_etag})
+    assert status == 200 and b'"value": "250.0"' in body
+    assert repository.handle("GET", ELEMENTS + "/Info", {"if-none-match": info_etag})[0] == 200
+    assert repository.handle("GET", ELEMENTS + "/PLC", {"if-none-match": plc_etag})[0] == 304
+    assert "PLC" in repository._submodels[SUBMODEL_ID].element_bodies
+
+
+def test_repository_errors():
+    """Test 404/400/405 responses."""
+    repository = _repository()
+    assert repository.handle("GET", "/submodels/not-base64!", {})[0] == 404
+    assert repository.handle("GET", ELEMENTS + "/Info.missing", {})[0] == 404
+    assert repository.handle("PATCH", ELEMENTS + "/Info.exposure_unit_count/$value", {}, b'"two"')[0] == 400
+    assert repository.handle("PATCH", ELEMENTS + "/Info.build_volume.x_dimension/$value", {}, b'{"a": 1}')[0] == 400
+    assert repository.handle("DELETE", "/shells", {})[0] == 405
+
+
+def test_server_answers_over_http():
+    """Test a keep-alive connection against the asyncio server."""
+    async def scenario():
+        server = AASServer(_repository(), port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        responses = []
+        for path in ("/shells", "/submodels"):
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            responses.append((head.split(b" ")[1], await reader.readexactly(length)))
+        writer.close()
+        await server.close()
+        return responses
+
+    (shells_status, shells), (submodels_status, submodels) = asyncio.run(scenario())
+    assert shells_status == submodels_status == b"200"
+    assert b'"id": "https://acplt.org/PBF-LB-M_AAS/SN-001"' in shells
+    assert b'"value": "EOS"' in submodels
+
+
+def test_server_rejects_invalid_content_length():
+    """Test that a non-numeric or negative Content-Length is answered with 400."""
+    async def scenario():
+        server = AASServer(_repository(), port=0)
+        await server.start()
+        statuses = []
+        for length in ("abc", "-5"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(f"GET /shells HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+            statuses.append((await reader.readuntil(b"\r\n\r\n")).split(b" ")[1])
+            writer.close()
+        await server.close()
+        return statuses
+
+    assert asyncio.run(scenario()) == [b"400", b"400"]
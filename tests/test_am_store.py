@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from am_fleet import build_machine, build_machine_pair
+from am_json import environment_json
+from am_machine import ValueCoercionError
+from am_store import FleetStore, store_fleet
+
+ROWS = [{"serial_number": f"SN-{n:03d}", "Info.manufacturer_brand": "EOS"} for n in range(20)]
+
+
+def test_store_fleet_and_random_access(tmp_path):
+    """Test lookup by AAS ID and serial number and that documents come back unchanged."""
+    with FleetStore(str(tmp_path / "fleet.db")) as store:
+        assert store_fleet(ROWS, store, workers=1) == 20
+        assert len(store) == 20 and "SN-007" in store and "SN-999" not in store
+
+        expected = environment_json(*build_machine_pair(ROWS[7]))
+        assert store.environment("SN-007") == expected
+        assert store.environment("https://acplt.org/PBF-LB-M_AAS/SN-007") == expected
+        assert store.values("SN-007")["Info.manufacturer_brand"] == "EOS"
+        assert store.submodel("SN-007").id == "https://acplt.org/PBF-LB-M_Submodel/SN-007"
+        with pytest.raises(KeyError):
+            store.get("SN-999")
+
+
+def test_shared_serial_number_is_not_resolved_to_one_machine(tmp_path):
+    """Test that a serial number of several machines is refused while their AAS IDs still work."""
+    with FleetStore(str(tmp_path / "fleet.db")) as store:
+        store.put(*build_machine_pair(ROWS[0]))
+        store.put(*build_machine_pair(ROWS[0], "urn:other:aas", "urn:other:sm"))
+        assert len(store) == 2 and "SN-000" in store
+        with pytest.raises(ValueError, match="more than one machine"):
+            store.get("SN-000")
+        assert store.values("urn:other:aas/SN-000")["Info.serial_number"] == "SN-000"
+        store.delete("urn:other:aas/SN-000")
+        assert store.values("SN-000")["Info.manufacturer_brand"] == "EOS"
+
+
+def test_update_rewrites_one_machine(tmp_path):
+    """Test that updating one machine leaves the others untouched and survives reopening."""
+    path = str(tmp_path / "fleet.db")
+    with FleetStore(path) as store:
+        store_fleet(ROWS[:3], store, workers=1, direct=True)
+        before = store.get("SN-002")
+        merged = store.update_values("SN-001", {"Info.build_volume.x_dimension": "250"})
+        assert merged["Info.build_volume.x_dimension"] == 250.0
+        with pytest.raises(ValueCoercionError):
+            store.update_values("SN-001", {"Info.exposure_unit_count": "two"})
+
+    with FleetStore(path) as store:
+        assert store.values("SN-001")["Info.build_volume.x_dimension"] == 250.0
+        assert store.get("SN-002") == before
+        document = json.loads(store.environment("SN-001"))
+        assert document["submodels"][0]["id"] == "https://acplt.org/PBF-LB-M_Submodel/SN-001"
+
+
+def test_delete_and_compact(tmp_path):
+    """Test that compaction reclaims the space of deleted machines."""
+    with FleetStore(str(tmp_path / "fleet.db")) as store:
+        store_fleet(ROWS, store, workers=1, direct=True)
+        store.compact()
+        full_size = store.file_size()
+        for serial_number in store.serial_numbers()[:10]:
+            store.delete(serial_number)
+        store.compact()
+        assert len(store) == 10
+        assert store.file_size() < full_size
+
+
+def test_deduplicated_store_shares_collections(tmp_path):
+    """Test that identical collections are stored once and documents still come back byte for byte."""
+    with FleetStore(str(tmp_path / "fleet.db"), deduplicate=True) as store:
+        store_fleet(ROWS, store, workers=1, direct=True)
+        assert store.environment("SN-007") == environment_json(*build_machine_pair(ROWS[7]))
+        savings = store.deduplication()
+        assert savings["collection_references"] == 60 and savings["distinct_collections"] == 3
+        assert savings["bytes_saved"] > 0 and savings["dedup_ratio"] > 1.5
+        assert savings["document_bytes"] == sum(len(document.encode()) for key in store for document in store.get(key))
+
+        store.update_values("SN-001", {"PLC.software_version": "4.2"})
+        assert store.values("SN-001")["PLC.software_version"] == "4.2"
+        assert store.values("SN-002").get("PLC.software_version") is None
+        assert store.deduplication()["distinct_collections"] == 4
+        store.delete("SN-001")
+        store.compact()
+        assert store._connection.execute("SELECT COUNT(*) FROM collections").fetchone()[0] == 3
+
+
+def test_write_paths_store_identical_bytes(tmp_path):
+    """Test that put_objects, put and put_many store a machine the same way, so collections are shared."""
+    with FleetStore(str(tmp_path / "fleet.db"), deduplicate=True) as store:
+        store.put_objects(*build_machine(ROWS[0]))
+        store.put(*build_machine_pair(ROWS[1], ensure_ascii=True))
+        store_fleet(ROWS[2:3], store, workers=1, direct=True)
+        assert store.get("SN-001") == build_machine_pair(ROWS[1])
+        assert store._connection.execute("SELECT COUNT(*) FROM collections").fetchone()[0] == 3
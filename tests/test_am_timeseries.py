@@ -0,0 +1,52 @@
+import json
+
+import numpy as np
+from basyx.aas.adapter.json import AASFromJsonDecoder
+from am_timeseries import RingBuffer, MachineTimeSeries, downsample, process_signals
+
+
+def test_ring_buffer_keeps_newest_samples_in_fixed_memory():
+    """Test wrap-around of single and batch appends, the dropped count and the fixed size."""
+    buffer = RingBuffer(5)
+    nbytes = buffer.nbytes
+    for i in range(7):
+        buffer.append(i, i * 10)
+    times, values = buffer.arrays()
+    assert times.tolist() == [2, 3, 4, 5, 6] and values.tolist() == [20, 30, 40, 50, 60]
+    buffer.extend(np.arange(7, 10), np.arange(70, 100, 10))
+    assert buffer.arrays()[0].tolist() == [5, 6, 7, 8, 9]
+    buffer.extend(np.arange(10, 22), np.arange(12))
+    assert buffer.arrays()[1].tolist() == [7, 8, 9, 10, 11]
+    assert (len(buffer), buffer.dropped, buffer.nbytes) == (5, 17, nbytes)
+
+
+def test_downsample_per_window_statistics():
+    """Test min/max/mean/count per aligned window, also for unordered samples."""
+    times = np.array([12.0, 10.0, 10.5, 11.9, 15.2])
+    values = np.array([3.0, 1.0, 5.0, 2.0, 7.0])
+    statistics = downsample(times, values, 2.0)
+    assert statistics["start"].tolist() == [10.0, 12.0, 14.0]
+    assert statistics["min"].tolist() == [1.0, 3.0, 7.0]
+    assert statistics["max"].tolist() == [5.0, 3.0, 7.0]
+    assert statistics["mean"].tolist() == [8.0 / 3, 3.0, 7.0]
+    assert statistics["count"].tolist() == [3, 1, 1]
+    assert downsample(np.empty(0), np.empty(0), 1.0)["start"].tolist() == []
+
+
+def test_time_series_submodel_is_valid_aas_json():
+    """Test the downsampled Time Series submodel of a multi-laser machine through the basyx decoder."""
+    series = MachineTimeSeries("urn:sm:1", process_signals(exposure_units=2), capacity=100)
+    assert list(series.signals) == ["Exposure_unit.laser_power", "Exposure_unit_2.laser_power",
+                                    "Atmosphere.oxygen_level", "Atmosphere.gas_flow"]
+    series.record_many("Exposure_unit_2.laser_power", 1.7e9 + np.arange(10.0), np.arange(10.0) + 400)
+    series.record("Atmosphere.oxygen_level", 1.7e9 + 7, 150)
+
+    submodel = json.loads(json.dumps(series.submodel_json(5.0)), cls=AASFromJsonDecoder)
+    assert submodel.id == "urn:sm:1/TimeSeries"
+    segment = submodel.get_referable(["Segments", "InternalSegment"])
+    assert segment.get_referable("RecordCount").value == 2
+    record = segment.get_referable(["Records", "Record1"])
+    assert record.get_referable("Time").value.isoformat() == "2023-11-14T22:13:25+00:00"
+    assert record.get_referable("Exposure_unit_2_laser_power_mean").value == 407.0
+    assert record.get_referable("Atmosphere_oxygen_level_max").value == 150.0
+    assert "Exposure_unit_laser_power_min" not in [element.id_short for element in record.value]
@@ -0,0 +1,146 @@
+import asyncio
+import socket
+import time
+
+import pytest
+import am_upload
+from am_fleet import build_fleet
+from am_server import AASRepository, AASServer
+from am_upload import AASRepositoryClient, UploadError, upload_fleet
+
+ROWS = [{"serial_number": f"SN-{n:03d}", "Info.manufacturer_brand": "EOS"} for n in range(12)]
+
+
+class FlakyRepository(AASRepository):
+    """Stand-in repository answering every other request with 503."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def handle(self, method, target, headers, body=b""):
+        self.calls += 1
+        if self.calls % 2:
+            return 503, {}, b""
+        return super().handle(method, target, headers, body)
+
+
+def _run(repository, scenario):
+    async def run():
+        server = AASServer(repository, port=0)
+        await server.start()
+        try:
+            return await scenario(f"http://127.0.0.1:{server.port}")
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+
+def test_upload_fleet_creates_then_updates():
+    """Test upsert semantics: POST for new machines, PUT on the second upload."""
+    repository = AASRepository()
+
+    async def scenario(url):
+        first = await upload_fleet(ROWS, url, concurrency=4, workers=1, direct=True)
+        second = await upload_fleet(ROWS, url, concurrency=4, workers=1)
+        return first, second
+
+    first, second = _run(repository, scenario)
+    assert first == {"created": 12, "updated": 0}
+    assert second == {"created": 0, "updated": 12}
+    assert len(repository.submodel_ids) == 12
+    index = repository.index("https://acplt.org/PBF-LB-M_Submodel/SN-011")
+    assert index.get_value("Info.manufacturer_brand") == "EOS"
+
+
+def test_client_retries_unavailable_repository():
+    """Test that 503 answers are retried with backoff."""
+    repository = FlakyRepository()
+
+    async def scenario(url):
+        async with AASRepositoryClient(url, concurrency=2, backoff=0.001) as client:
+            counts = await upload_fleet(ROWS[:2], url, concurrency=2, workers=1, direct=True)
+            status, _ = await client.request("GET", "/shells")
+            return counts, status
+
+    counts, status = _run(repository, scenario)
+    assert counts == {"created": 2, "updated": 0}
+    assert status == 200
+
+
+def test_client_gives_up_after_retries():
+    """Test that persistent failures raise UploadError."""
+    class Unavailable(AASRepository):
+        def handle(self, method, target, headers, body=b""):
+            return 503, {}, b""
+
+    async def scenario(url):
+        async with AASRepositoryClient(url, retries=1, backoff=0.001) as client:
+            await client.upsert("shells", "urn:x", b"{}")
+
+    with pytest.raises(UploadError) as excinfo:
+        _run(Unavailable(), scenario)
+    assert excinfo.value.status == 503
+
+
+def test_client_retries_refused_connections():
+    """Test that refused connects are retried with backoff and then raise UploadError."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]  # closed again once the block ends
+
+    async def scenario():
+        async with AASRepositoryClient(f"http://127.0.0.1:{port}", retries=2, backoff=0.001) as client:
+            try:
+                await client.request("GET", "/shells")
+            finally:
+                attempts.append(client.requests)
+
+    attempts = []
+    with pytest.raises(UploadError):
+        asyncio.run(scenario())
+    assert attempts == [3]
+
+
+def test_client_does_not_repeat_sent_posts():
+    """Test that a dropped connection is retried for PUT but not for a POST that may have been applied."""
+    async def drop(reader, writer):
+        received.append((await reader.readuntil(b"\r\n\r\n")).split(b" ")[0])
+        writer.close()
+
+    async def scenario():
+        server = await asyncio.start_server(drop, "127.0.0.1", 0)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        try:
+            async with AASRepositoryClient(url, retries=2, backoff=0.001) as client:
+                for method in ("PUT", "POST"):
+                    with pytest.raises(UploadError):
+                        await client.request(method, "/shells", b"{}")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    received = []
+    asyncio.run(scenario())
+    assert received == [b"PUT"] * 3 + [b"POST"]
+
+
+def test_upload_fleet_reports_the_upload_error(monkeypatch):
+    """Test that a failing upload surfaces as UploadError while the next machine is still being built."""
+    class Unavailable(AASRepository):
+        def handle(self, method, target, headers, body=b""):
+            return 503, {}, b""
+
+    def slow_build_fleet(rows, **kwargs):
+        for n, pair in enumerate(build_fleet(rows, **kwargs)):
+            if n:
+                time.sleep(0.2)  # still inside next() when the first upload fails
+            yield pair
+
+    monkeypatch.setattr(am_upload, "build_fleet", slow_build_fleet)
+
+    async def scenario(url):
+        await upload_fleet(ROWS, url, concurrency=1, retries=0, workers=1)
+
+    with pytest.raises(UploadError):
+        _run(Unavailable(), scenario)
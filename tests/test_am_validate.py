@@ -0,0 +1,84 @@
+import pytest
+from am_machine import ValueCoercionError, compile_specification, machine_specification
+from am_fleet import coerce_inventory
+from am_validate import Compare, FleetValidator, RequiredWhen, ValidationError, validate_machines
+
+
+def test_ranges_are_compiled_from_element_specs():
+    """Test that minimum/maximum of the element specs reach the compiled nodes and the checks."""
+    node = compile_specification()["Info.build_volume.x_dimension"]
+    assert (node.minimum, node.maximum, node.unit) == (0, None, "mm")
+    report = validate_machines([{"Info.build_volume.x_dimension": "-5", "Info.exposure_unit_count": 0}])
+    assert [(v.path, v.rule, v.message) for v in report.violations] == [
+        ("Info.build_volume.x_dimension", "range", "below minimum 0 mm"),
+        ("Info.exposure_unit_count", "range", "below minimum 1"),
+    ]
+
+
+def test_cross_field_rules_apply_per_scope_and_exposure_unit():
+    """Test comparison and conditional rules, also for the later units of a multi-laser machine."""
+    rows = [
+        {"Exposure_unit.beam_focus_diameter_min": 80, "Exposure_unit.beam_focus_diameter_max": "70",
+         "Info.build_volume.type": "Cylindrical"},
+        {"Info.exposure_unit_count": 3, "Exposure_unit_3.laser_powers": 500,
+         "Exposure_unit_3.laser_source_rated_power": 400, "Exposure_unit.laser_powers": 300},
+        {"Info.build_volume.type": "cylindrical", "Info.build_volume.diameter": 250,
+         "Exposure_unit.laser_powers": 400, "Exposure_unit.laser_source_rated_power": 400},
+        {"Info.remote_control": "maybe"},
+    ]
+    report = FleetValidator().validate(rows)
+    assert [(v.row, v.path, v.rule) for v in report.violations] == [
+        (0, "Exposure_unit.beam_focus_diameter_min", "beam_focus_diameter_min <= beam_focus_diameter_max"),
+        (0, "Info.build_volume.diameter", "diameter required when type == 'cylindrical'"),
+        (1, "Exposure_unit_3.laser_powers", "laser_powers <= laser_source_rated_power"),
+        (3, "Info.remote_control", "type"),
+    ]
+    assert report.invalid_rows() == [0, 1, 3]
+    assert report.counts()["type"] == 1
+    assert report.rows[2]["Info.build_volume.diameter"] == 250.0
+    assert report.to_dict()["invalid_machines"] == 3
+
+
+def test_rules_must_refer_to_properties():
+    """Test that rules are checked against the specification when compiled."""
+    validator = FleetValidator(rules=[Compare("ExposureUnit", "laser_powers", "<=", "no_such_property")])
+    with pytest.raises(ValueError, match="no_such_property"):
+        validator.validate([{}])
+    assert FleetValidator(rules=[RequiredWhen("NoSuchScope", "a", "b", 1)]).validate([{}]).valid
+
+
+def test_inventory_is_rejected_with_a_validation_report():
+    """Test that fleet builds refuse inventories breaking a cross-field rule."""
+    with pytest.raises(ValueCoercionError) as excinfo:
+        coerce_inventory([{"serial_number": "SN-1", "Exposure_unit.laser_powers": "500",
+                           "Exposure_unit.laser_source_rated_power": "400"}])
+    assert isinstance(excinfo.value, ValidationError)
+    assert excinfo.value.report.counts() == {"laser_powers <= laser_source_rated_power": 1}
+
+
+def test_exposure_unit_count_is_bounded_before_grouping():
+    """Test that an absurd unit count is a range violation and never builds its specification."""
+    report = validate_machines([{"Info.exposure_unit_count": 1000000},
+                                {"Exposure_unit_99.laser_powers": 100.0},
+                                {"Info.exposure_unit_count": 2}])
+    assert [(v.row, v.path, v.rule) for v in report.violations] == [
+        (0, "Info.exposure_unit_count", "range"),
+        (1, "Exposure_unit_99.laser_powers", "type"),
+    ]
+    assert report.violations[0].message == "above maximum 64"
+    with pytest.raises(ValueError, match="at most 64"):
+        machine_specification(65)
+
+
+def test_duplicate_serial_numbers_are_violations():
+    """Test that machines sharing a serial number, and so their IDs, are reported after the first."""
+    rows = [{"serial_number": "SN-1"}, {"serial_number": "SN-2"},
+            {"serial_number": "SN-1", "Info.exposure_unit_count": 2}, {"Info.serial_number": "SN-1"}]
+    with pytest.raises(ValidationError) as excinfo:
+        coerce_inventory(rows)
+    violations = excinfo.value.report.violations
+    assert [(v.row, v.path, v.value, v.rule, v.message) for v in violations] == [
+        (2, "Info.serial_number", "SN-1", "unique", "same as row 0"),
+        (3, "Info.serial_number", "SN-1", "unique", "same as row 0"),
+    ]
+    assert FleetValidator(unique=()).validate([{"Info.serial_number": "SN-1"}] * 2).valid
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+from am_profile import parse_importtime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def _imported_modules(*args):
+    """Run a fresh interpreter with ``-X importtime``; returns the names of the imported modules."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return {name for name, _, _ in parse_importtime(result.stderr)}
+
+
+def _basyx_modules(modules):
+    return {name for name in modules if name.split(".")[0] == "basyx"}
+
+
+def test_specification_modules_do_not_import_basyx():
+    """Test that importing the specification and the JSON emitter/loader leaves basyx unloaded."""
+    modules = _imported_modules("-c", "import am_machine, am_json")
+    assert "am_machine" in modules and not _basyx_modules(modules)
+
+
+def test_spec_only_cli_path_does_not_import_basyx(tmp_path):
+    """Test that --stats --direct runs without basyx and only the builder path loads it."""
+    modules = _imported_modules("am_machine.py", "--stats", "--direct", "-o", str(tmp_path / "direct.json"))
+    assert not _basyx_modules(modules)
+    modules = _imported_modules("am_machine.py", "--stats", "-o", str(tmp_path / "built.json"))
+    assert "basyx.aas.model" in modules
+    assert (tmp_path / "direct.json").read_text() == (tmp_path / "built.json").read_text()
+
+
+def test_object_model_is_imported_on_first_access():
+    """Test that builder names stay importable from am_machine and load basyx lazily."""
+    script = ("import sys, am_machine; assert 'basyx.aas.model' not in sys.modules; "
+              "from am_machine import PBFLBMSubmodelBuilder; import am_model; "
+              "assert PBFLBMSubmodelBuilder is am_model.PBFLBMSubmodelBuilder and 'basyx.aas.model' in sys.modules")
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True)
+
@@ -0,0 +1,70 @@
+import pytest
+from basyx.aas import model
+from am_machine import (
+    PBFLBMSubmodelBuilder, ValueCoercionError, coerce_column, coerce_table, coerce_values, property_specs
+)
+
+
+def test_property_specs_maps_dotted_paths():
+    """Test that every property of the specification is addressable by its dotted path."""
+    specs = property_specs()
+    assert len(specs) == 41
+    assert specs["Info.build_volume.x_dimension"].unit == "mm"
+    assert "Info.build_volume" not in specs
+    assert property_specs() is specs
+
+
+@pytest.mark.parametrize("value_type, raw, expected", [
+    (model.datatypes.Double, ["400", 250, 1.5, None, " 2E3 "], [400.0, 250.0, 1.5, None, 2000.0]),
+    (model.datatypes.Integer, ["4", 8, 12.0], [4, 8, 12]),
+    (model.datatypes.Boolean, ["true", "0", True, 1], [True, False, True, True]),
+    (model.datatypes.String, ["EOS", 290], ["EOS", "290"]),
+])
+def test_coerce_column_valid_values(value_type, raw, expected):
+    """Test that whole columns are coerced to the XSD value types."""
+    coerced, errors = coerce_column(raw, value_type)
+    assert coerced == expected
+    assert errors == []
+
+
+def test_coerce_column_collects_every_error():
+    """Test that invalid entries are reported by index instead of stopping at the first."""
+    coerced, errors = coerce_column(["4", "four", 2.5, True, 7], model.datatypes.Integer)
+    assert coerced == [4, None, None, None, 7]
+    assert [index for index, _ in errors] == [1, 2, 3]
+    assert isinstance(coerced[0], model.datatypes.Integer)
+
+
+def test_coerce_table_reports_row_and_path():
+    """Test the single report for a table of machines."""
+    rows = [
+        {"Info.exposure_unit_count": "2", "Info.remote_control": "yes"},
+        {"Info.unknown": 1, "Exposure_unit.laser_powers": "x"},
+    ]
+    coerced, issues = coerce_table(rows)
+
+    assert coerced[0] == {"Info.exposure_unit_count": 2, "Info.remote_control": None}
+    assert [(issue.row, issue.path) for issue in issues] == [
+        (0, "Info.remote_control"), (1, "Exposure_unit.laser_powers"), (1, "Info.unknown")]
+    assert "row 1: Info.unknown" in str(issues[2])
+
+
+def test_set_values_is_all_or_nothing():
+    """Test that no value is applied when any value of the batch is invalid."""
+    builder = PBFLBMSubmodelBuilder()
+    _, submodel = builder.build_aas_and_submodel()
+
+    with pytest.raises(ValueCoercionError) as excinfo:
+        builder.set_values(submodel, {"Info.manufacturer_brand": "EOS", "Info.exposure_unit_count": "many",
+                                      "Info.remote_control": "perhaps"})
+    assert len(excinfo.value.issues) == 2
+    assert submodel.get_referable(["Info", "manufacturer_brand"]).value is None
+
+    builder.set_values(submodel, {"Info.manufacturer_brand": "EOS", "Info.exposure_unit_count": "4"})
+    assert submodel.get_referable(["Info", "exposure_unit_count"]).value == 4
+
+
+def test_coerce_values_has_no_row_numbers():
+    """Test that single-machine issues are reported without row numbers."""
+    _, issues = coerce_values({"Info.remote_control": "maybe"})
+    assert [str(issue) for issue in issues] == ["Info.remote_control = 'maybe': expected true/false/1/0"]